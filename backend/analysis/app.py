@@ -8,7 +8,7 @@ import os
 import sys
 import logging
 from datetime import datetime
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from dotenv import load_dotenv
 
 # Add current directory to path for imports
@@ -122,10 +122,10 @@ def terraform_parse_file():
             return jsonify({'error': 'file_path must be an absolute path'}), 400
         
         parser = TerraformParser()
-        result = parser.parse_file(file_path)
+        config = parser.parse_file_config(file_path)
         
         logger.info(f"Parsed Terraform file: {file_path}")
-        return jsonify(result), 200
+        return Response(config.serialize(), status=200, mimetype='application/json')
         
     except TerraformParserError as e:
         logger.error(f"Terraform parsing error: {str(e)}")
@@ -160,10 +160,10 @@ def terraform_parse_directory():
             return jsonify({'error': 'directory_path must be an absolute path'}), 400
         
         parser = TerraformParser()
-        result = parser.parse_directory(directory_path)
+        config = parser.parse_directory_config(directory_path)
         
         logger.info(f"Parsed Terraform directory: {directory_path}")
-        return jsonify(result), 200
+        return Response(config.serialize(), status=200, mimetype='application/json')
         
     except TerraformParserError as e:
         logger.error(f"Terraform parsing error: {str(e)}")
@@ -6,13 +6,102 @@ Supports service-level, component-level, and code-level DFDs with trust boundari
 """
 
 import re
-from typing import List, Dict, Optional, Set, Any
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Any, Tuple
 from models.dfd import (
     DFD, DFDNode, DFDEdge, NodeType, TrustBoundary, 
     DataClassification, TrustBoundaryGroup, DFDGenerationResult
 )
 
 
+# Keyword fallbacks for resource types missing from RESOURCE_TYPE_MAPPING,
+# checked in order; the first group with a substring match wins
+_NODE_TYPE_KEYWORDS = (
+    (('database', 'sql', 'db'), NodeType.DATABASE),
+    (('storage', 'bucket'), NodeType.STORAGE),
+    (('compute', 'instance', 'vm'), NodeType.COMPUTE),
+    (('function', 'lambda'), NodeType.FUNCTION),
+    (('cache', 'redis'), NodeType.CACHE),
+    (('queue', 'pubsub', 'sqs'), NodeType.QUEUE),
+    (('api', 'gateway'), NodeType.API),
+    (('network', 'vpc'), NodeType.NETWORK),
+    (('firewall', 'security_group'), NodeType.FIREWALL),
+    (('load_balancer', 'lb', 'elb'), NodeType.LOAD_BALANCER),
+)
+
+
+@lru_cache(maxsize=1024)
+def _fuzzy_node_type(resource_type: str) -> NodeType:
+    """
+    Infer a node type from keywords in a lowercased resource type
+    
+    Terraform configs repeat a small set of resource types, so results are
+    cached per type string.
+    """
+    for keywords, node_type in _NODE_TYPE_KEYWORDS:
+        if any(keyword in resource_type for keyword in keywords):
+            return node_type
+    return NodeType.SERVICE  # Default
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """Return value if it is a dict, else an empty one"""
+    return value if isinstance(value, dict) else {}
+
+
+@dataclass(slots=True, frozen=True)
+class ResourceRecord:
+    """
+    Flattened view of a parsed resource dict
+    
+    The generator inspects the same handful of nested properties for every
+    resource; they are pulled out once here instead of through chains of
+    ``.get(..., {})`` calls in each inference step.
+    """
+    node_id: str
+    label: str
+    resource_type: Optional[str]
+    type_lower: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+    publicly_accessible: bool = False
+    associate_public_ip: bool = False
+    encrypted: bool = False
+    storage_encrypted: bool = False
+    ipv4_enabled: bool = False
+    authorized_networks: Tuple[Any, ...] = ()
+    acl: Any = ''
+    ingress: Tuple[Any, ...] = ()
+    database_ref: Any = None
+    bucket_ref: Any = None
+    
+    @classmethod
+    def from_dict(cls, resource: Dict[str, Any], node_id: str) -> 'ResourceRecord':
+        """Build a record from a resource dict and its DFD node ID"""
+        props = resource.get('properties', {})
+        ip_config = _as_dict(_as_dict(props.get('settings')).get('ip_configuration'))
+        ingress = props.get('ingress', [])
+        
+        return cls(
+            node_id=node_id,
+            label=resource.get('name', resource.get('full_name', node_id)),
+            resource_type=resource.get('resource_type'),
+            type_lower=resource.get('resource_type', '').lower(),
+            properties=props,
+            publicly_accessible=props.get('publicly_accessible', False),
+            associate_public_ip=props.get('associate_public_ip_address', False),
+            encrypted=props.get('encrypted', False),
+            storage_encrypted=props.get('storage_encrypted', False),
+            ipv4_enabled=ip_config.get('ipv4_enabled', False),
+            authorized_networks=tuple(ip_config.get('authorized_networks', [])),
+            acl=props.get('acl', ''),
+            ingress=tuple(ingress) if isinstance(ingress, list) else (ingress,),
+            database_ref=props.get('database_url') or props.get('db_instance'),
+            bucket_ref=props.get('bucket') or props.get('storage_account')
+        )
+
+
 class DFDGenerator:
     """Generate Data Flow Diagrams from infrastructure resources"""
     
@@ -62,6 +151,16 @@ class DFDGenerator:
         'azurerm_network_security_group': NodeType.FIREWALL,
     }
     
+    # Trust boundary group names and descriptions
+    BOUNDARY_NAMES = {boundary: f"{boundary.value.title()} Zone" for boundary in TrustBoundary}
+    BOUNDARY_DESCRIPTIONS = {
+        TrustBoundary.INTERNET: "Publicly accessible from the internet",
+        TrustBoundary.DMZ: "Demilitarized zone with limited external access",
+        TrustBoundary.INTERNAL: "Internal network, not directly accessible",
+        TrustBoundary.PRIVATE: "Private network with restricted access",
+        TrustBoundary.RESTRICTED: "Highly restricted, sensitive data zone"
+    }
+    
     def __init__(self):
         self.node_counter = 0
         self.edge_counter = 0
@@ -76,88 +175,52 @@ class DFDGenerator:
         self.node_counter += 1
         return f"node_{self.node_counter}"
     
-    def _infer_node_type(self, resource: Dict[str, Any]) -> NodeType:
+    def _infer_node_type(self, record: ResourceRecord) -> NodeType:
         """Infer node type from resource type"""
-        resource_type = resource.get('resource_type', '').lower()
+        resource_type = record.type_lower
         
         # Try exact match first
         if resource_type in self.RESOURCE_TYPE_MAPPING:
             return self.RESOURCE_TYPE_MAPPING[resource_type]
         
         # Fuzzy match based on keywords
-        if 'database' in resource_type or 'sql' in resource_type or 'db' in resource_type:
-            return NodeType.DATABASE
-        if 'storage' in resource_type or 'bucket' in resource_type:
-            return NodeType.STORAGE
-        if 'compute' in resource_type or 'instance' in resource_type or 'vm' in resource_type:
-            return NodeType.COMPUTE
-        if 'function' in resource_type or 'lambda' in resource_type:
-            return NodeType.FUNCTION
-        if 'cache' in resource_type or 'redis' in resource_type:
-            return NodeType.CACHE
-        if 'queue' in resource_type or 'pubsub' in resource_type or 'sqs' in resource_type:
-            return NodeType.QUEUE
-        if 'api' in resource_type or 'gateway' in resource_type:
-            return NodeType.API
-        if 'network' in resource_type or 'vpc' in resource_type:
-            return NodeType.NETWORK
-        if 'firewall' in resource_type or 'security_group' in resource_type:
-            return NodeType.FIREWALL
-        if 'load_balancer' in resource_type or 'lb' in resource_type or 'elb' in resource_type:
-            return NodeType.LOAD_BALANCER
-        
-        return NodeType.SERVICE  # Default
+        return _fuzzy_node_type(resource_type)
     
-    def _infer_trust_boundary(self, resource: Dict[str, Any]) -> TrustBoundary:
+    def _infer_trust_boundary(self, record: ResourceRecord) -> TrustBoundary:
         """Infer trust boundary from resource properties"""
-        props = resource.get('properties', {})
-        resource_type = resource.get('resource_type', '').lower()
-        
-        # Check for public accessibility
-        publicly_accessible = props.get('publicly_accessible', False)
-        associate_public_ip = props.get('associate_public_ip_address', False)
+        resource_type = record.type_lower
         
         # Check for public network access
         if 'sql' in resource_type or 'database' in resource_type:
-            settings = props.get('settings', {})
-            ip_config = settings.get('ip_configuration', {})
-            ipv4_enabled = ip_config.get('ipv4_enabled', False)
-            authorized_networks = ip_config.get('authorized_networks', [])
-            
             # Check if allows internet access
-            if ipv4_enabled:
-                for network in authorized_networks:
+            if record.ipv4_enabled:
+                for network in record.authorized_networks:
                     if isinstance(network, dict) and network.get('value') == '0.0.0.0/0':
                         return TrustBoundary.INTERNET
                 # IPv4 enabled but restricted networks - if encrypted, still private
-                if props.get('encrypted', False):
+                if record.encrypted:
                     return TrustBoundary.PRIVATE
                 return TrustBoundary.DMZ
         
         # Check S3 buckets
         if 'bucket' in resource_type or 'storage' in resource_type:
-            acl = props.get('acl', '')
-            if 'public' in acl:
+            if 'public' in record.acl:
                 return TrustBoundary.INTERNET
         
         # Check compute instances
-        if publicly_accessible or associate_public_ip:
+        if record.publicly_accessible or record.associate_public_ip:
             return TrustBoundary.DMZ
         
         # Check security groups / firewall rules
         if 'security_group' in resource_type or 'firewall' in resource_type:
-            ingress = props.get('ingress', [])
-            if not isinstance(ingress, list):
-                ingress = [ingress]
-            
-            for rule in ingress:
+            for rule in record.ingress:
                 cidr_blocks = rule.get('cidr_blocks', [])
                 if '0.0.0.0/0' in cidr_blocks or '::/0' in cidr_blocks:
                     return TrustBoundary.DMZ
         
         # Check for database-specific properties
         if 'database' in resource_type or 'sql' in resource_type:
-            if props.get('storage_encrypted', False) or props.get('encrypted', False):
+            if record.storage_encrypted or record.encrypted:
                 return TrustBoundary.RESTRICTED
             return TrustBoundary.PRIVATE
         
@@ -191,34 +254,32 @@ class DFDGenerator:
         
         return DataClassification.INTERNAL
     
-    def _detect_data_flows(self, resources: List[Dict[str, Any]], nodes: Dict[str, DFDNode]) -> List[DFDEdge]:
+    def _detect_data_flows(self, records: List[ResourceRecord], nodes: Dict[str, DFDNode]) -> List[DFDEdge]:
         """Detect data flows between resources"""
         edges = []
         
-        for resource in resources:
-            node_id = self._generate_node_id(resource)
+        for record in records:
+            node_id = record.node_id
             if node_id not in nodes:
                 continue
             
             source_node = nodes[node_id]
-            props = resource.get('properties', {})
             
             # Detect API to Database connections
             if source_node.type in [NodeType.SERVICE, NodeType.API, NodeType.COMPUTE]:
                 for other_id, other_node in nodes.items():
                     if other_node.type == NodeType.DATABASE:
                         # Check if database is referenced
-                        db_ref = props.get('database_url') or props.get('db_instance')
-                        if db_ref or self._could_connect(source_node, other_node):
+                        if record.database_ref or self._could_connect(source_node, other_node):
                             edge = DFDEdge(
                                 source=node_id,
                                 target=other_id,
                                 label="queries",
                                 protocol="SQL",
-                                encrypted=other_node.properties.get('encrypted', False)
-                            )
-                            edge.data_classification = self._infer_data_classification(
-                                "queries", source_node, other_node
+                                encrypted=other_node.properties.get('encrypted', False),
+                                data_classification=self._infer_data_classification(
+                                    "queries", source_node, other_node
+                                )
                             )
                             edges.append(edge)
             
@@ -227,17 +288,16 @@ class DFDGenerator:
                 for other_id, other_node in nodes.items():
                     if other_node.type == NodeType.STORAGE:
                         # Check for storage references
-                        bucket_ref = props.get('bucket') or props.get('storage_account')
-                        if bucket_ref or self._could_connect(source_node, other_node):
+                        if record.bucket_ref or self._could_connect(source_node, other_node):
                             edge = DFDEdge(
                                 source=node_id,
                                 target=other_id,
                                 label="read/write",
                                 protocol="HTTPS",
-                                encrypted=True
-                            )
-                            edge.data_classification = self._infer_data_classification(
-                                "read/write", source_node, other_node
+                                encrypted=True,
+                                data_classification=self._infer_data_classification(
+                                    "read/write", source_node, other_node
+                                )
                             )
                             edges.append(edge)
             
@@ -250,9 +310,9 @@ class DFDGenerator:
                             target=other_id,
                             label="cache operations",
                             protocol="Redis",
-                            encrypted=False
+                            encrypted=False,
+                            data_classification=DataClassification.INTERNAL
                         )
-                        edge.data_classification = DataClassification.INTERNAL
                         edges.append(edge)
             
             # Detect load balancer to service
@@ -265,9 +325,9 @@ class DFDGenerator:
                             label="HTTP requests",
                             protocol="HTTPS",
                             port=443,
-                            encrypted=True
+                            encrypted=True,
+                            data_classification=DataClassification.PUBLIC
                         )
-                        edge.data_classification = DataClassification.PUBLIC
                         edges.append(edge)
         
         # Add external user/admin nodes
@@ -294,9 +354,9 @@ class DFDGenerator:
                             label="HTTP requests",
                             protocol="HTTPS",
                             port=443,
-                            encrypted=True
+                            encrypted=True,
+                            data_classification=DataClassification.PUBLIC
                         )
-                        edge.data_classification = DataClassification.PUBLIC
                         edges.append(edge)
         
         return edges
@@ -317,35 +377,25 @@ class DFDGenerator:
     
     def _group_by_trust_boundaries(self, nodes: List[DFDNode]) -> List[TrustBoundaryGroup]:
         """Group nodes by trust boundary"""
-        boundaries = {}
-        
+        node_ids = defaultdict(list)
         for node in nodes:
-            if not node.trust_boundary:
-                continue
-            
-            boundary = node.trust_boundary
-            if boundary not in boundaries:
-                boundaries[boundary] = TrustBoundaryGroup(
-                    boundary=boundary,
-                    name=f"{boundary.value.title()} Zone",
-                    node_ids=[],
-                    description=self._get_boundary_description(boundary)
-                )
-            
-            boundaries[boundary].node_ids.append(node.id)
-        
-        return list(boundaries.values())
+            if node.trust_boundary:
+                node_ids[node.trust_boundary].append(node.id)
+        
+        # Groups follow the order in which boundaries first appear
+        return [
+            TrustBoundaryGroup(
+                boundary=boundary,
+                name=self.BOUNDARY_NAMES[boundary],
+                node_ids=ids,
+                description=self.BOUNDARY_DESCRIPTIONS.get(boundary, "")
+            )
+            for boundary, ids in node_ids.items()
+        ]
     
     def _get_boundary_description(self, boundary: TrustBoundary) -> str:
         """Get description for trust boundary"""
-        descriptions = {
-            TrustBoundary.INTERNET: "Publicly accessible from the internet",
-            TrustBoundary.DMZ: "Demilitarized zone with limited external access",
-            TrustBoundary.INTERNAL: "Internal network, not directly accessible",
-            TrustBoundary.PRIVATE: "Private network with restricted access",
-            TrustBoundary.RESTRICTED: "Highly restricted, sensitive data zone"
-        }
-        return descriptions.get(boundary, "")
+        return self.BOUNDARY_DESCRIPTIONS.get(boundary, "")
     
     def generate_service_level_dfd(self, resources: List[Dict[str, Any]]) -> DFD:
         """
@@ -367,30 +417,29 @@ class DFDGenerator:
             elif first_resource_type.startswith('azurerm_'):
                 cloud_provider = 'azure'
         
+        # Flatten each resource once; node IDs are assigned here
+        records = [
+            ResourceRecord.from_dict(resource, self._generate_node_id(resource))
+            for resource in resources
+        ]
+        
         # Create nodes for each resource
-        for resource in resources:
-            node_id = self._generate_node_id(resource)
-            node_type = self._infer_node_type(resource)
-            trust_boundary = self._infer_trust_boundary(resource)
-            
-            # Generate label
-            label = resource.get('name', resource.get('full_name', node_id))
-            
+        for record in records:
             node = DFDNode(
-                id=node_id,
-                label=label,
-                type=node_type,
+                id=record.node_id,
+                label=record.label,
+                type=self._infer_node_type(record),
                 cloud_provider=cloud_provider,
-                trust_boundary=trust_boundary,
-                resource_type=resource.get('resource_type'),
-                properties=resource.get('properties', {})
+                trust_boundary=self._infer_trust_boundary(record),
+                resource_type=record.resource_type,
+                properties=record.properties
             )
             
-            nodes_dict[node_id] = node
-            dfd.nodes.append(node)
+            nodes_dict[record.node_id] = node
+            dfd.add_node(node)
         
         # Detect data flows
-        edges = self._detect_data_flows(resources, nodes_dict)
+        edges = self._detect_data_flows(records, nodes_dict)
         dfd.edges = edges
         
         # Group by trust boundaries
@@ -456,12 +505,15 @@ class DFDGenerator:
                     data_classification=DataClassification.INTERNAL
                 ))
                 
-                # Redirect existing edges
+                # Redirect existing edges (edges are immutable, so rebuild them)
+                redirected = []
                 for edge in dfd.edges:
                     if edge.target == node.id:
-                        edge.target = api_node.id
+                        edge = replace(edge, target=api_node.id)
                     if edge.source == node.id:
-                        edge.source = logic_node.id
+                        edge = replace(edge, source=logic_node.id)
+                    redirected.append(edge)
+                dfd.edges = redirected
         
         # Add new nodes and edges
         dfd.nodes.extend(new_nodes)
@@ -504,7 +556,7 @@ class DFDGenerator:
                     properties=flow
                 )
                 nodes_dict[node_id] = node
-                dfd.nodes.append(node)
+                dfd.add_node(node)
             
             source_node = nodes_dict[node_id]
             
@@ -519,7 +571,7 @@ class DFDGenerator:
                         trust_boundary=TrustBoundary.INTERNAL
                     )
                     nodes_dict[called_id] = called_node
-                    dfd.nodes.append(called_node)
+                    dfd.add_node(called_node)
                 
                 # Create edge
                 edge = DFDEdge(
@@ -529,7 +581,7 @@ class DFDGenerator:
                     protocol="Internal",
                     data_classification=DataClassification.INTERNAL
                 )
-                dfd.edges.append(edge)
+                dfd.add_edge(edge, dedupe=True)
             
             # Create nodes for external APIs
             for ext_api in flow.get('external_apis', []):
@@ -542,7 +594,7 @@ class DFDGenerator:
                         trust_boundary=TrustBoundary.INTERNET
                     )
                     nodes_dict[ext_id] = ext_node
-                    dfd.nodes.append(ext_node)
+                    dfd.add_node(ext_node)
                 
                 # Create edge
                 edge = DFDEdge(
@@ -553,7 +605,7 @@ class DFDGenerator:
                     encrypted=True,
                     data_classification=DataClassification.PUBLIC
                 )
-                dfd.edges.append(edge)
+                dfd.add_edge(edge, dedupe=True)
             
             # Create nodes for data access
             for db in flow.get('data_access', []):
@@ -566,7 +618,7 @@ class DFDGenerator:
                         trust_boundary=TrustBoundary.RESTRICTED
                     )
                     nodes_dict[db_id] = db_node
-                    dfd.nodes.append(db_node)
+                    dfd.add_node(db_node)
                 
                 # Create edge
                 edge = DFDEdge(
@@ -576,7 +628,7 @@ class DFDGenerator:
                     protocol="SQL",
                     data_classification=DataClassification.CONFIDENTIAL
                 )
-                dfd.edges.append(edge)
+                dfd.add_edge(edge, dedupe=True)
         
         # Group by trust boundaries
         dfd.trust_boundaries = self._group_by_trust_boundaries(dfd.nodes)
@@ -594,24 +646,23 @@ class DFDGenerator:
                            code_flows: Optional[List[Dict[str, Any]]] = None) -> DFDGenerationResult:
         """
         Generate all three levels of DFDs
+        
+        Levels are built lazily: each one is generated the first time it is
+        read from the result (or when the result is serialized). Errors from
+        a level's generator are raised on that first access, and the
+        'total_nodes'/'total_edges' metadata is only added by to_dict().
         """
         result = DFDGenerationResult()
         
-        # Generate service-level DFD
-        result.service_level = self.generate_service_level_dfd(resources)
+        result.service_level = lambda: self.generate_service_level_dfd(resources)
+        result.component_level = lambda: self.generate_component_level_dfd(resources)
         
-        # Generate component-level DFD
-        result.component_level = self.generate_component_level_dfd(resources)
-        
-        # Generate code-level DFD if code flows provided
+        # Code-level DFD only if code flows provided
         if code_flows:
-            result.code_level = self.generate_code_level_dfd(code_flows)
+            result.code_level = lambda: self.generate_code_level_dfd(code_flows)
         
-        # Add metadata
         result.metadata = {
-            'levels_generated': ['service', 'component'] + (['code'] if code_flows else []),
-            'total_nodes': len(result.get_all_nodes()),
-            'total_edges': len(result.get_all_edges())
+            'levels_generated': ['service', 'component'] + (['code'] if code_flows else [])
         }
         
         return result
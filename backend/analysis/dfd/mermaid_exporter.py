@@ -5,10 +5,16 @@ Exports DFD structures to Mermaid diagram syntax for visualization.
 Supports flowcharts with trust boundaries and data classification colors.
 """
 
-from typing import Dict, List, Any
+import io
+import weakref
+from typing import Dict, List, Any, Tuple
 from models.dfd import DFD, DFDNode, DFDEdge, NodeType, TrustBoundary, DataClassification
 
 
+# Characters that are not valid in Mermaid node IDs
+_ID_TRANSLATION = str.maketrans({'.': '_', ':': '_', '-': '_'})
+
+
 class MermaidExporter:
     """Export DFD to Mermaid diagram syntax"""
     
@@ -22,9 +28,9 @@ class MermaidExporter:
         NodeType.FUNCTION: ('[[', ']]'),     # Subroutine
         NodeType.CACHE: ('[/', '\\]'),       # Trapezoid
         NodeType.QUEUE: ('[/', '\\]'),       # Trapezoid
-        NodeType.EXTERNAL: (['(((', ')))'])[0:2],  # Circle
-        NodeType.USER: (['(((', ')))'])[0:2],      # Circle
-        NodeType.ADMIN: (['(((', ')))'])[0:2],     # Circle
+        NodeType.EXTERNAL: ('(((', ')))'),   # Circle
+        NodeType.USER: ('(((', ')))'),       # Circle
+        NodeType.ADMIN: ('(((', ')))'),      # Circle
         NodeType.NETWORK: ('[', ']'),        # Rectangle
         NodeType.FIREWALL: ('[', ']'),       # Rectangle
         NodeType.VPC: ('[', ']'),            # Rectangle
@@ -52,15 +58,24 @@ class MermaidExporter:
     }
     
     def __init__(self):
-        self.node_id_map = {}
+        # Raw node ID -> sanitized Mermaid ID; every node and edge endpoint
+        # is sanitized on each export, so results are kept per exporter
+        self.node_id_map: Dict[str, str] = {}
+        # (id(dfd), include_trust_boundaries) -> (dfd weakref, revision key, mermaid)
+        self._mermaid_cache: Dict[Tuple[int, bool], Tuple[weakref.ref, tuple, str]] = {}
     
     def _sanitize_id(self, node_id: str) -> str:
         """Sanitize node ID for Mermaid"""
+        sanitized = self.node_id_map.get(node_id)
+        if sanitized is not None:
+            return sanitized
+        
         # Replace invalid characters
-        sanitized = node_id.replace('.', '_').replace(':', '_').replace('-', '_')
+        sanitized = node_id.translate(_ID_TRANSLATION)
         # Ensure starts with letter
         if not sanitized[0].isalpha():
             sanitized = 'n_' + sanitized
+        self.node_id_map[node_id] = sanitized
         return sanitized
     
     def _format_node(self, node: DFDNode) -> str:
@@ -147,44 +162,62 @@ class MermaidExporter:
         Returns:
             Mermaid diagram syntax as string
         """
-        lines = []
-        
-        # Diagram type and direction
-        lines.append('flowchart TB')
-        lines.append('')
+        key = (id(dfd), include_trust_boundaries)
+        revision = dfd.revision_key()
+        cached = self._mermaid_cache.get(key)
+        if cached is not None and cached[0]() is dfd and cached[1] == revision:
+            return cached[2]
+        
+        mermaid = self._render_mermaid(dfd, include_trust_boundaries)
+        # Drop the entry once the DFD is collected so its id can't be reused
+        cache = self._mermaid_cache
+        ref = weakref.ref(dfd, lambda _ref: cache.pop(key, None))
+        cache[key] = (ref, revision, mermaid)
+        return mermaid
+    
+    def _render_mermaid(self, dfd: DFD, include_trust_boundaries: bool) -> str:
+        """Build Mermaid flowchart syntax for export_to_mermaid"""
+        buf = io.StringIO()
+        write = buf.write
         
-        # Add title as comment
-        lines.append(f'%% {dfd.level.title()} Level DFD')
-        lines.append(f'%% Total Nodes: {len(dfd.nodes)}, Total Edges: {len(dfd.edges)}')
-        lines.append('')
+        # Diagram type and direction, title as comment
+        write('flowchart TB\n\n')
+        write(f'%% {dfd.level.title()} Level DFD\n')
+        write(f'%% Total Nodes: {len(dfd.nodes)}, Total Edges: {len(dfd.edges)}\n\n')
         
         # Generate subgraphs for trust boundaries
         if include_trust_boundaries and dfd.trust_boundaries:
-            lines.extend(self._generate_subgraphs(dfd))
+            for line in self._generate_subgraphs(dfd):
+                write(line)
+                write('\n')
         else:
             # Add nodes without subgraphs
             for node in dfd.nodes:
-                lines.append(self._format_node(node))
-            lines.append('')
+                write(self._format_node(node))
+                write('\n')
+            write('\n')
         
         # Add edges
         for i, edge in enumerate(dfd.edges):
-            lines.append(self._format_edge(edge, i))
-        lines.append('')
+            write(self._format_edge(edge, i))
+            write('\n')
+        write('\n')
         
         # Apply styles
         styles = self._apply_styles(dfd)
         if styles:
-            lines.append('%% Styles')
-            lines.extend(styles)
-            lines.append('')
+            write('%% Styles\n')
+            for style in styles:
+                write(style)
+                write('\n')
+            write('\n')
         
         # Add legend as comments
-        lines.append('%% Legend:')
-        lines.append('%% 🔒 = Encrypted connection')
-        lines.append(f'%% Trust Boundaries: {", ".join([b.boundary.value for b in dfd.trust_boundaries])}')
+        write('%% Legend:\n')
+        write('%% 🔒 = Encrypted connection\n')
+        write(f'%% Trust Boundaries: {", ".join([b.boundary.value for b in dfd.trust_boundaries])}')
         
-        return '\n'.join(lines)
+        return buf.getvalue()
     
     def export_to_mermaid_with_data_classification(self, dfd: DFD) -> str:
         """
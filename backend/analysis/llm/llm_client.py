@@ -2,14 +2,14 @@
 LLM Client
 
 Unified client for interacting with Claude and OpenAI APIs with fallback,
-retry logic, and request queuing.
+retry logic, request queuing, and streaming.
 """
 
 import os
 import time
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 from enum import Enum
 import anthropic
 import openai
@@ -53,6 +53,7 @@ class LLMClient:
     - OpenAI GPT-4o (fallback)
     - Retry logic with exponential backoff
     - Request queuing
+    - Streaming responses chunk by chunk
     - Request/response logging
     """
     
@@ -268,6 +269,252 @@ class LLMClient:
         finally:
             self.active_requests -= 1
     
+    def call_claude_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+        model: str = "claude-3-5-sonnet-20241022"
+    ) -> Iterator[str]:
+        """
+        Stream a Claude response as text chunks
+        
+        Chunks are yielded as they arrive, so callers can show output after
+        the first token instead of after the whole generation. Streams are
+        not retried, since chunks may already have been consumed.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            model: Claude model to use
+        
+        Yields:
+            Text chunks of the response
+        
+        Raises:
+            LLMError: If API call fails
+        """
+        if not self.claude_client:
+            raise LLMError("Claude API key not configured")
+        
+        start_time = time.time()
+        self.active_requests += 1
+        self.request_count += 1
+        
+        try:
+            logger.info(f"Streaming from Claude API (model: {model})")
+            
+            chunks = []
+            with self.claude_client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt if system_prompt else None,
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+                
+                usage = stream.get_final_message().usage
+            
+            elapsed = time.time() - start_time
+            
+            # Log request
+            if self.enable_logging:
+                self._log_request(
+                    provider=LLMProvider.CLAUDE.value,
+                    model=model,
+                    prompt=prompt,
+                    response="".join(chunks),
+                    elapsed=elapsed,
+                    tokens=usage.input_tokens + usage.output_tokens
+                )
+            
+            logger.info(f"Claude API stream completed in {elapsed:.2f}s")
+            
+        except anthropic.RateLimitError as e:
+            logger.warning(f"Claude rate limit exceeded: {e}")
+            raise RateLimitError(f"Claude rate limit: {e}")
+        
+        except anthropic.APITimeoutError as e:
+            logger.warning(f"Claude API timeout: {e}")
+            raise TimeoutError(f"Claude timeout: {e}")
+        
+        except Exception as e:
+            logger.error(f"Claude API error: {e}")
+            raise LLMError(f"Claude error: {e}")
+        
+        finally:
+            self.active_requests -= 1
+    
+    def call_openai_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+        model: str = "gpt-4o"
+    ) -> Iterator[str]:
+        """
+        Stream an OpenAI response as text chunks
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            model: OpenAI model to use
+        
+        Yields:
+            Text chunks of the response
+        
+        Raises:
+            LLMError: If API call fails
+        """
+        if not self.openai_client:
+            raise LLMError("OpenAI API key not configured")
+        
+        start_time = time.time()
+        self.active_requests += 1
+        self.request_count += 1
+        
+        try:
+            logger.info(f"Streaming from OpenAI API (model: {model})")
+            
+            # Build messages
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            
+            # Usage arrives on a final chunk without choices
+            stream = self.openai_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            
+            chunks = []
+            tokens = 0
+            for chunk in stream:
+                if chunk.usage:
+                    tokens = chunk.usage.total_tokens
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text = chunk.choices[0].delta.content
+                    chunks.append(text)
+                    yield text
+            
+            elapsed = time.time() - start_time
+            
+            # Log request
+            if self.enable_logging:
+                self._log_request(
+                    provider=LLMProvider.OPENAI.value,
+                    model=model,
+                    prompt=prompt,
+                    response="".join(chunks),
+                    elapsed=elapsed,
+                    tokens=tokens
+                )
+            
+            logger.info(f"OpenAI API stream completed in {elapsed:.2f}s")
+            
+        except openai.RateLimitError as e:
+            logger.warning(f"OpenAI rate limit exceeded: {e}")
+            raise RateLimitError(f"OpenAI rate limit: {e}")
+        
+        except openai.APITimeoutError as e:
+            logger.warning(f"OpenAI API timeout: {e}")
+            raise TimeoutError(f"OpenAI timeout: {e}")
+        
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise LLMError(f"OpenAI error: {e}")
+        
+        finally:
+            self.active_requests -= 1
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+        provider: Optional[LLMProvider] = None,
+        enable_fallback: bool = True
+    ) -> Iterator[str]:
+        """
+        Stream generated text with automatic fallback
+        
+        Falls back to the secondary provider only if the primary fails
+        before yielding anything; a failure mid-stream is raised, since the
+        caller has already consumed part of the primary's response.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            provider: LLM provider to use (defaults to default_provider)
+            enable_fallback: Enable fallback to alternative provider
+        
+        Yields:
+            Text chunks of the response
+        
+        Raises:
+            LLMError: If all providers fail
+        """
+        target_provider = provider or self.default_provider
+        fallback_provider = (
+            LLMProvider.OPENAI if target_provider == LLMProvider.CLAUDE 
+            else LLMProvider.CLAUDE
+        )
+        streams = {
+            LLMProvider.CLAUDE: self.call_claude_stream,
+            LLMProvider.OPENAI: self.call_openai_stream
+        }
+        
+        started = False
+        try:
+            for text in streams[target_provider](
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ):
+                started = True
+                yield text
+            return
+        
+        except LLMError as e:
+            if started or not enable_fallback:
+                raise
+            
+            logger.warning(f"Primary provider {target_provider.value} failed: {e}")
+            logger.info(f"Falling back to {fallback_provider.value}")
+            primary_error = e
+        
+        try:
+            yield from streams[fallback_provider](
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        
+        except LLMError as fallback_error:
+            logger.error(f"Fallback provider also failed: {fallback_error}")
+            raise LLMError(
+                f"All providers failed. Primary: {primary_error}, Fallback: {fallback_error}"
+            )
+    
     def generate(
         self,
         prompt: str,
@@ -5,8 +5,14 @@ Generate threat descriptions, remediations, and compliance explanations
 using LLM integration.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from llm.llm_client import LLMClient
 from llm.prompt_templates import PromptTemplates, get_system_prompt
 from utils.cache import get_cache, ResponseCache
@@ -14,6 +20,116 @@ from utils.cache import get_cache, ResponseCache
 logger = logging.getLogger(__name__)
 
 
+# Generation parameters per content kind: (max_tokens, temperature)
+GENERATION_PARAMS: Dict[str, Tuple[int, float]] = {
+    'threat_description': (500, 0.7),
+    'remediation': (1500, 0.5),
+    'compliance': (1000, 0.6),
+    'attack_scenario': (1200, 0.7),
+    'risk_assessment': (1000, 0.6),
+}
+
+
+def _sorted_items(mapping: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Items of a prompt input dict in key order
+    
+    Prompts list dict inputs line by line, and the prompt text is the cache
+    key, so rendering them in key order lets equal dicts built in different
+    orders share one cached response.
+    """
+    return tuple(sorted(mapping.items(), key=lambda item: str(item[0])))
+
+
+def _rendered_items(mapping: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Items of a prompt input dict as the text the prompt shows for them
+    
+    Used as a memo key, so it compares what gets rendered rather than the
+    values: True, 1 and 1.0 are equal in Python but print differently.
+    """
+    return tuple((str(key), str(value)) for key, value in _sorted_items(mapping))
+
+
+@lru_cache(maxsize=1024)
+def _remediation_prompt(
+    threat_name: str,
+    threat_description: str,
+    cloud_provider: str,
+    service_type: str,
+    resource_name: str,
+    config_items: Tuple[Tuple[str, str], ...]
+) -> str:
+    """
+    Render a remediation prompt, memoized on its inputs
+    
+    The same threat is typically remediated for many resources and asked
+    for repeatedly, so identical inputs skip formatting entirely.
+    config_items is the config as sorted, rendered (key, value) pairs.
+    """
+    return PromptTemplates.remediation(
+        threat_name=threat_name,
+        threat_description=threat_description,
+        cloud_provider=cloud_provider,
+        service_type=service_type,
+        resource_name=resource_name,
+        current_config=dict(config_items)
+    )
+
+
+@dataclass
+class PrewarmedResult:
+    """
+    Responses resolved ahead of time by ThreatGenerator.prefetch
+    
+    Holds cache hits found in the bulk lookup and futures for misses that
+    are being generated in the background, keyed by (prompt, system_prompt).
+    Each response is handed out once; repeats are served by the cache, which
+    the background generations populate.
+    """
+    hits: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    pending: Dict[Tuple[str, str], Future] = field(default_factory=dict)
+    
+    @property
+    def exhausted(self) -> bool:
+        """Whether every prefetched response has been handed out"""
+        return not self.hits and not self.pending
+    
+    def get(
+        self,
+        prompt: str,
+        system_prompt: str,
+        timeout: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Take a prewarmed response, waiting for it if still being generated
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            timeout: Seconds to wait for a background generation
+        
+        Returns:
+            Response or None if the prompt was not prefetched, or its
+            background generation failed or did not finish in time
+        """
+        key = (prompt, system_prompt)
+        
+        response = self.hits.pop(key, None)
+        if response is not None:
+            return response
+        
+        future = self.pending.pop(key, None)
+        if future is None:
+            return None
+        
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Prefetched generation unavailable, generating inline: {e!r}")
+            return None
+
+
 class ThreatGenerator:
     """
     Generate threat-related content using LLMs
@@ -24,8 +140,16 @@ class ThreatGenerator:
     - Compliance explanations
     - Attack scenarios
     - Risk assessments
+    - Bulk prefetching of a planned workload
     """
     
+    # Worker threads used to generate prefetch misses in the background
+    PREFETCH_WORKERS = 4
+    
+    # Seconds a caller waits on a generation started by someone else (a
+    # prefetch worker or a concurrent caller) before calling the LLM itself
+    GENERATION_TIMEOUT = 120.0
+    
     def __init__(
         self,
         llm_client: Optional[LLMClient] = None,
@@ -43,6 +167,341 @@ class ThreatGenerator:
         self.llm_client = llm_client or LLMClient()
         self.cache = cache or get_cache() if enable_cache else None
         self.enable_cache = enable_cache
+        self.prewarmed: Optional[PrewarmedResult] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Generations currently in flight, keyed by (prompt, system_prompt)
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._inflight_lock = threading.Lock()
+    
+    def _get_cached(self, prompt: str, system_prompt: str) -> Optional[str]:
+        """
+        Get response from prefetched results, falling back to the cache
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+        
+        Returns:
+            Cached response or None
+        """
+        prewarmed = self.prewarmed
+        if prewarmed:
+            response = prewarmed.get(prompt, system_prompt, timeout=self.GENERATION_TIMEOUT)
+            if prewarmed.exhausted:
+                # Workload consumed; later calls go to the cache directly
+                self.prewarmed = None
+            if response is not None:
+                return response
+        
+        return self.cache.get(prompt, system_prompt)
+    
+    def _build_threat_description_prompt(
+        self,
+        config: Dict[str, Any],
+        threat_rule: Dict[str, Any]
+    ) -> str:
+        """Render threat description prompt"""
+        return PromptTemplates.threat_description(
+            service_type=config.get('resource_type', 'Unknown Service'),
+            service_name=config.get('name', config.get('id', 'Unknown')),
+            properties=dict(_sorted_items(config.get('properties', {}))),
+            threat_name=threat_rule.get('name', 'Unknown Threat'),
+            threat_category=threat_rule.get('category', 'Security Risk')
+        )
+    
+    def _build_remediation_prompt(
+        self,
+        threat: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> str:
+        """Render remediation prompt"""
+        args = (
+            threat.get('name', 'Unknown Threat'),
+            threat.get('description', ''),
+            context.get('cloud_provider', 'Unknown').upper(),
+            context.get('service_type', 'Unknown Service'),
+            context.get('resource_name', 'Unknown Resource'),
+            _rendered_items(context.get('current_config', {}))
+        )
+        
+        return _remediation_prompt(*args)
+    
+    def _resolve_control(
+        self,
+        threat: Dict[str, Any],
+        framework: str,
+        control_id: Optional[str],
+        control_description: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Resolve compliance control from explicit arguments or threat mappings
+        
+        Returns:
+            Tuple of (control_id, control_description)
+        """
+        # If control_id not provided, try to extract from threat compliance mappings
+        if not control_id:
+            compliance_mappings = threat.get('compliance_mappings', [])
+            for mapping in compliance_mappings:
+                if mapping.get('framework', '').upper() == framework.upper():
+                    control_id = mapping.get('control_id')
+                    control_description = mapping.get('description')
+                    break
+        
+        if not control_id:
+            control_id = "General Security Controls"
+        
+        return control_id, control_description
+    
+    def _build_compliance_prompt(
+        self,
+        threat: Dict[str, Any],
+        framework: str,
+        control_id: str,
+        control_description: Optional[str]
+    ) -> str:
+        """Render compliance explanation prompt"""
+        return PromptTemplates.compliance_explanation(
+            threat_name=threat.get('name', 'Unknown Threat'),
+            threat_description=threat.get('description', ''),
+            compliance_framework=framework,
+            control_id=control_id,
+            control_description=control_description
+        )
+    
+    def _build_attack_scenario_prompt(
+        self,
+        threat: Dict[str, Any],
+        service_info: Dict[str, Any]
+    ) -> str:
+        """Render attack scenario prompt"""
+        return PromptTemplates.attack_scenario(
+            threat_name=threat.get('name', 'Unknown Threat'),
+            service_type=service_info.get('service_type', 'Unknown Service'),
+            vulnerability_details=dict(_sorted_items(service_info.get('vulnerability_details', {})))
+        )
+    
+    def _build_risk_assessment_prompt(
+        self,
+        threat: Dict[str, Any],
+        business_context: Dict[str, Any]
+    ) -> str:
+        """Render risk assessment prompt"""
+        return PromptTemplates.risk_assessment(
+            threat_name=threat.get('name', 'Unknown Threat'),
+            severity=threat.get('severity', 'Unknown'),
+            likelihood=threat.get('likelihood', 'Unknown'),
+            business_context=dict(_sorted_items(business_context))
+        )
+    
+    def _build_prompt(self, kind: str, item: Dict[str, Any]) -> str:
+        """
+        Render the prompt for one prefetch workload item
+        
+        Args:
+            kind: Content kind (key of GENERATION_PARAMS)
+            item: Keyword arguments of the matching generate_* method
+        
+        Returns:
+            Rendered user prompt
+        """
+        threat = item.get('threat', {})
+        
+        if kind == 'threat_description':
+            return self._build_threat_description_prompt(
+                item.get('config', {}), item.get('threat_rule', threat)
+            )
+        if kind == 'remediation':
+            return self._build_remediation_prompt(threat, item.get('context', {}))
+        if kind == 'compliance':
+            framework = item.get('framework', '')
+            control_id, control_description = self._resolve_control(
+                threat, framework,
+                item.get('control_id'), item.get('control_description')
+            )
+            return self._build_compliance_prompt(
+                threat, framework, control_id, control_description
+            )
+        if kind == 'attack_scenario':
+            return self._build_attack_scenario_prompt(threat, item.get('service_info', {}))
+        if kind == 'risk_assessment':
+            return self._build_risk_assessment_prompt(threat, item.get('business_context', {}))
+        
+        raise ValueError(f"Unknown generation kind: {kind}")
+    
+    def _generate_coalesced(
+        self,
+        prompt: str,
+        system_prompt: str,
+        kind: str,
+        store: bool = True
+    ) -> str:
+        """
+        Call the LLM once per distinct prompt across concurrent callers
+        
+        The first caller for a (prompt, system_prompt) pair issues the request
+        and publishes it as a Future; callers arriving while it is in flight
+        wait on that Future instead of sending a duplicate request. The
+        response is cached before the in-flight entry is dropped, so a late
+        caller either joins the flight or finds the cached response.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            kind: Content kind (key of GENERATION_PARAMS)
+            store: Read and populate the response cache
+        
+        Returns:
+            Generated response
+        
+        Raises:
+            Exception: Whatever the LLM call raised, for every waiting caller
+        """
+        key = (prompt, system_prompt)
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is None:
+                # A flight may have finished between the caller's cache miss
+                # and taking the lock. peek, since that miss was already counted.
+                if store and self.cache:
+                    cached = self.cache.peek(prompt, system_prompt)
+                    if cached is not None:
+                        return cached
+                
+                future = Future()
+                self._inflight[key] = future
+                leader = True
+            else:
+                leader = False
+        
+        if not leader:
+            logger.debug(f"Joining in-flight {kind} generation")
+            try:
+                return future.result(timeout=self.GENERATION_TIMEOUT)
+            except FutureTimeoutError:
+                logger.warning(f"In-flight {kind} generation timed out, calling the LLM directly")
+                return self._call_llm(prompt, system_prompt, kind)
+        
+        try:
+            response = self._call_llm(prompt, system_prompt, kind)
+            
+            if store and self.cache:
+                self.cache.set(prompt, response, system_prompt)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def _call_llm(self, prompt: str, system_prompt: str, kind: str) -> str:
+        """Generate a response with the parameters for its content kind"""
+        max_tokens, temperature = GENERATION_PARAMS[kind]
+        
+        return self.llm_client.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+    
+    def _generate_and_cache(self, prompt: str, system_prompt: str, kind: str) -> str:
+        """Generate a response in the background and store it in the cache"""
+        return self._generate_coalesced(prompt, system_prompt, kind)
+    
+    def prefetch(
+        self,
+        threats: List[Dict[str, Any]],
+        kinds: List[str],
+        generate_missing: bool = True
+    ) -> PrewarmedResult:
+        """
+        Pre-warm responses for a planned workload
+        
+        Renders every prompt up front, looks them all up in the cache in a
+        single batch and, optionally, starts generating the misses in
+        background threads. Subsequent generate_* calls for the same inputs
+        are served from the returned result without another cache or LLM
+        round-trip.
+        
+        Args:
+            threats: Workload items, each holding the keyword arguments of the
+                generate_* methods ('config', 'threat_rule', 'threat',
+                'context', 'framework', 'service_info', 'business_context')
+            kinds: Content kinds to prefetch for every item
+                (threat_description, remediation, compliance,
+                attack_scenario, risk_assessment)
+            generate_missing: Start generating cache misses in the background
+        
+        Returns:
+            PrewarmedResult consulted by the generate_* methods until each
+            of its responses has been taken once, or close() is called.
+            Empty when caching is disabled, since generate_* calls would
+            never consult it.
+        """
+        if not (self.enable_cache and self.cache):
+            logger.info("Response caching disabled, skipping prefetch")
+            return PrewarmedResult()
+        
+        requests: List[Tuple[Tuple[str, str], str]] = []
+        seen = set()
+        
+        for kind in kinds:
+            system_prompt = get_system_prompt(kind)
+            for item in threats:
+                request = (self._build_prompt(kind, item), system_prompt)
+                if request not in seen:
+                    seen.add(request)
+                    requests.append((request, kind))
+        
+        result = PrewarmedResult()
+        result.hits = self.cache.mget([request for request, _ in requests])
+        
+        if generate_missing:
+            misses = [(request, kind) for request, kind in requests if request not in result.hits]
+            
+            if misses and self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.PREFETCH_WORKERS,
+                    thread_name_prefix='threat-prefetch'
+                )
+            
+            for (prompt, system_prompt), kind in misses:
+                result.pending[(prompt, system_prompt)] = self._executor.submit(
+                    self._generate_and_cache, prompt, system_prompt, kind
+                )
+        
+        logger.info(
+            f"Prefetched {len(requests)} prompts: {len(result.hits)} cached, "
+            f"{len(result.pending)} generating"
+        )
+        
+        self.prewarmed = result
+        return result
+    
+    def close(self):
+        """
+        Drop prefetched results and stop the prefetch workers
+        
+        Generations not yet started are cancelled; running ones finish in
+        the background.
+        """
+        self.prewarmed = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def __enter__(self) -> 'ThreatGenerator':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def generate_threat_description(
         self,
@@ -72,28 +531,17 @@ class ThreatGenerator:
         Returns:
             Generated threat description
         """
-        # Extract relevant information
-        service_type = config.get('resource_type', 'Unknown Service')
-        service_name = config.get('name', config.get('id', 'Unknown'))
-        properties = config.get('properties', {})
         threat_name = threat_rule.get('name', 'Unknown Threat')
-        threat_category = threat_rule.get('category', 'Security Risk')
         
         # Generate prompt
-        prompt = PromptTemplates.threat_description(
-            service_type=service_type,
-            service_name=service_name,
-            properties=properties,
-            threat_name=threat_name,
-            threat_category=threat_category
-        )
+        prompt = self._build_threat_description_prompt(config, threat_rule)
         
         system_prompt = get_system_prompt('threat_description')
         
         # Check cache
         if use_cache and self.enable_cache and self.cache:
-            cached = self.cache.get(prompt, system_prompt)
-            if cached:
+            cached = self._get_cached(prompt, system_prompt)
+            if cached is not None:
                 logger.info(f"Using cached threat description for {threat_name}")
                 return cached
         
@@ -101,18 +549,12 @@ class ThreatGenerator:
         logger.info(f"Generating threat description for {threat_name}")
         
         try:
-            response = self.llm_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=500,
-                temperature=0.7
+            return self._generate_coalesced(
+                prompt,
+                system_prompt,
+                'threat_description',
+                store=use_cache and self.enable_cache
             )
-            
-            # Cache response
-            if use_cache and self.enable_cache and self.cache:
-                self.cache.set(prompt, response, system_prompt)
-            
-            return response
         
         except Exception as e:
             logger.error(f"Failed to generate threat description: {e}")
@@ -148,29 +590,17 @@ class ThreatGenerator:
             Generated remediation instructions
         """
         threat_name = threat.get('name', 'Unknown Threat')
-        threat_description = threat.get('description', '')
-        
         cloud_provider = context.get('cloud_provider', 'Unknown').upper()
-        service_type = context.get('service_type', 'Unknown Service')
-        resource_name = context.get('resource_name', 'Unknown Resource')
-        current_config = context.get('current_config', {})
         
         # Generate prompt
-        prompt = PromptTemplates.remediation(
-            threat_name=threat_name,
-            threat_description=threat_description,
-            cloud_provider=cloud_provider,
-            service_type=service_type,
-            resource_name=resource_name,
-            current_config=current_config
-        )
+        prompt = self._build_remediation_prompt(threat, context)
         
         system_prompt = get_system_prompt('remediation')
         
         # Check cache
         if use_cache and self.enable_cache and self.cache:
-            cached = self.cache.get(prompt, system_prompt)
-            if cached:
+            cached = self._get_cached(prompt, system_prompt)
+            if cached is not None:
                 logger.info(f"Using cached remediation for {threat_name}")
                 return cached
         
@@ -178,23 +608,75 @@ class ThreatGenerator:
         logger.info(f"Generating remediation for {threat_name} on {cloud_provider}")
         
         try:
-            response = self.llm_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1500,
-                temperature=0.5
+            return self._generate_coalesced(
+                prompt,
+                system_prompt,
+                'remediation',
+                store=use_cache and self.enable_cache
             )
-            
-            # Cache response
-            if use_cache and self.enable_cache and self.cache:
-                self.cache.set(prompt, response, system_prompt)
-            
-            return response
         
         except Exception as e:
             logger.error(f"Failed to generate remediation: {e}")
             return f"Error generating remediation: {str(e)}"
     
+    def generate_remediation_stream(
+        self,
+        threat: Dict[str, Any],
+        context: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Iterator[str]:
+        """
+        Stream remediation instructions as they are generated
+        
+        Remediations are the longest responses, so streaming lets a UI show
+        them from the first token. A cached response is yielded whole; a
+        generated one is cached once the stream completes.
+        
+        Args:
+            threat: Threat information (see generate_remediation)
+            context: Cloud and resource context (see generate_remediation)
+            use_cache: Use cached response if available
+        
+        Yields:
+            Chunks of the remediation instructions
+        """
+        threat_name = threat.get('name', 'Unknown Threat')
+        
+        prompt = self._build_remediation_prompt(threat, context)
+        system_prompt = get_system_prompt('remediation')
+        
+        # Check cache
+        if use_cache and self.enable_cache and self.cache:
+            cached = self._get_cached(prompt, system_prompt)
+            if cached is not None:
+                logger.info(f"Using cached remediation for {threat_name}")
+                yield cached
+                return
+        
+        logger.info(f"Streaming remediation for {threat_name}")
+        
+        max_tokens, temperature = GENERATION_PARAMS['remediation']
+        chunks = []
+        
+        try:
+            for text in self.llm_client.generate_stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ):
+                chunks.append(text)
+                yield text
+        
+        except Exception as e:
+            logger.error(f"Failed to stream remediation: {e}")
+            yield f"Error generating remediation: {str(e)}"
+            return
+        
+        # Cache the complete response
+        if use_cache and self.enable_cache and self.cache:
+            self.cache.set(prompt, "".join(chunks), system_prompt)
+    
     def generate_compliance_explanation(
         self,
         threat: Dict[str, Any],
@@ -221,36 +703,21 @@ class ThreatGenerator:
         Returns:
             Generated compliance explanation
         """
-        threat_name = threat.get('name', 'Unknown Threat')
-        threat_description = threat.get('description', '')
-        
-        # If control_id not provided, try to extract from threat compliance mappings
-        if not control_id:
-            compliance_mappings = threat.get('compliance_mappings', [])
-            for mapping in compliance_mappings:
-                if mapping.get('framework', '').upper() == framework.upper():
-                    control_id = mapping.get('control_id')
-                    control_description = mapping.get('description')
-                    break
-        
-        if not control_id:
-            control_id = "General Security Controls"
+        control_id, control_description = self._resolve_control(
+            threat, framework, control_id, control_description
+        )
         
         # Generate prompt
-        prompt = PromptTemplates.compliance_explanation(
-            threat_name=threat_name,
-            threat_description=threat_description,
-            compliance_framework=framework,
-            control_id=control_id,
-            control_description=control_description
+        prompt = self._build_compliance_prompt(
+            threat, framework, control_id, control_description
         )
         
         system_prompt = get_system_prompt('compliance')
         
         # Check cache
         if use_cache and self.enable_cache and self.cache:
-            cached = self.cache.get(prompt, system_prompt)
-            if cached:
+            cached = self._get_cached(prompt, system_prompt)
+            if cached is not None:
                 logger.info(f"Using cached compliance explanation for {framework} {control_id}")
                 return cached
         
@@ -258,18 +725,12 @@ class ThreatGenerator:
         logger.info(f"Generating compliance explanation for {framework} {control_id}")
         
         try:
-            response = self.llm_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1000,
-                temperature=0.6
+            return self._generate_coalesced(
+                prompt,
+                system_prompt,
+                'compliance',
+                store=use_cache and self.enable_cache
             )
-            
-            # Cache response
-            if use_cache and self.enable_cache and self.cache:
-                self.cache.set(prompt, response, system_prompt)
-            
-            return response
         
         except Exception as e:
             logger.error(f"Failed to generate compliance explanation: {e}")
@@ -293,22 +754,16 @@ class ThreatGenerator:
             Generated attack scenario
         """
         threat_name = threat.get('name', 'Unknown Threat')
-        service_type = service_info.get('service_type', 'Unknown Service')
-        vulnerability_details = service_info.get('vulnerability_details', {})
         
         # Generate prompt
-        prompt = PromptTemplates.attack_scenario(
-            threat_name=threat_name,
-            service_type=service_type,
-            vulnerability_details=vulnerability_details
-        )
+        prompt = self._build_attack_scenario_prompt(threat, service_info)
         
         system_prompt = get_system_prompt('attack_scenario')
         
         # Check cache
         if use_cache and self.enable_cache and self.cache:
-            cached = self.cache.get(prompt, system_prompt)
-            if cached:
+            cached = self._get_cached(prompt, system_prompt)
+            if cached is not None:
                 logger.info(f"Using cached attack scenario for {threat_name}")
                 return cached
         
@@ -316,18 +771,12 @@ class ThreatGenerator:
         logger.info(f"Generating attack scenario for {threat_name}")
         
         try:
-            response = self.llm_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1200,
-                temperature=0.7
+            return self._generate_coalesced(
+                prompt,
+                system_prompt,
+                'attack_scenario',
+                store=use_cache and self.enable_cache
             )
-            
-            # Cache response
-            if use_cache and self.enable_cache and self.cache:
-                self.cache.set(prompt, response, system_prompt)
-            
-            return response
         
         except Exception as e:
             logger.error(f"Failed to generate attack scenario: {e}")
@@ -351,23 +800,16 @@ class ThreatGenerator:
             Generated risk assessment
         """
         threat_name = threat.get('name', 'Unknown Threat')
-        severity = threat.get('severity', 'Unknown')
-        likelihood = threat.get('likelihood', 'Unknown')
         
         # Generate prompt
-        prompt = PromptTemplates.risk_assessment(
-            threat_name=threat_name,
-            severity=severity,
-            likelihood=likelihood,
-            business_context=business_context
-        )
+        prompt = self._build_risk_assessment_prompt(threat, business_context)
         
         system_prompt = get_system_prompt('risk_assessment')
         
         # Check cache
         if use_cache and self.enable_cache and self.cache:
-            cached = self.cache.get(prompt, system_prompt)
-            if cached:
+            cached = self._get_cached(prompt, system_prompt)
+            if cached is not None:
                 logger.info(f"Using cached risk assessment for {threat_name}")
                 return cached
         
@@ -375,23 +817,89 @@ class ThreatGenerator:
         logger.info(f"Generating risk assessment for {threat_name}")
         
         try:
-            response = self.llm_client.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1000,
-                temperature=0.6
+            return self._generate_coalesced(
+                prompt,
+                system_prompt,
+                'risk_assessment',
+                store=use_cache and self.enable_cache
             )
-            
-            # Cache response
-            if use_cache and self.enable_cache and self.cache:
-                self.cache.set(prompt, response, system_prompt)
-            
-            return response
         
         except Exception as e:
             logger.error(f"Failed to generate risk assessment: {e}")
             return f"Error generating risk assessment: {str(e)}"
     
+    async def generate_threat_description_async(
+        self,
+        config: Dict[str, Any],
+        threat_rule: Dict[str, Any],
+        use_cache: bool = True
+    ) -> str:
+        """
+        Async variant of generate_threat_description
+        
+        The blocking LLM call runs in a worker thread so several generations
+        can be awaited concurrently.
+        """
+        return await asyncio.to_thread(
+            self.generate_threat_description, config, threat_rule, use_cache
+        )
+    
+    async def generate_remediation_async(
+        self,
+        threat: Dict[str, Any],
+        context: Dict[str, Any],
+        use_cache: bool = True
+    ) -> str:
+        """Async variant of generate_remediation"""
+        return await asyncio.to_thread(self.generate_remediation, threat, context, use_cache)
+    
+    async def generate_compliance_explanation_async(
+        self,
+        threat: Dict[str, Any],
+        framework: str,
+        control_id: Optional[str] = None,
+        control_description: Optional[str] = None,
+        use_cache: bool = True
+    ) -> str:
+        """Async variant of generate_compliance_explanation"""
+        return await asyncio.to_thread(
+            self.generate_compliance_explanation,
+            threat, framework, control_id, control_description, use_cache
+        )
+    
+    async def generate_all_async(
+        self,
+        config: Dict[str, Any],
+        threat_rule: Dict[str, Any],
+        threat: Dict[str, Any],
+        context: Dict[str, Any],
+        framework: str,
+        use_cache: bool = True
+    ) -> Tuple[str, str, str]:
+        """
+        Generate description, remediation and compliance text concurrently
+        
+        The three LLM round-trips are independent, so end-to-end latency is
+        that of the slowest call rather than their sum.
+        
+        Args:
+            config: Infrastructure configuration (see generate_threat_description)
+            threat_rule: Threat rule (see generate_threat_description)
+            threat: Threat information (see generate_remediation)
+            context: Remediation context (see generate_remediation)
+            framework: Compliance framework (see generate_compliance_explanation)
+            use_cache: Use cached responses if available
+        
+        Returns:
+            Tuple of (description, remediation, compliance explanation)
+        """
+        description, remediation, compliance = await asyncio.gather(
+            self.generate_threat_description_async(config, threat_rule, use_cache),
+            self.generate_remediation_async(threat, context, use_cache),
+            self.generate_compliance_explanation_async(threat, framework, use_cache=use_cache)
+        )
+        return description, remediation, compliance
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get generator statistics
@@ -0,0 +1,269 @@
+"""
+Aggregate Models
+Result containers built from many Terraform resources or matched threats
+
+Kept separate from the value models so code that only needs Resource or
+Condition does not import the serialization and export dependencies.
+Both classes are also importable from models.terraform / models.threat.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Any
+
+import orjson
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for Arrow/Parquet export
+    pa = None
+    pq = None
+
+from models.terraform import Resource, Variable, Output, Provider, DataSource, Module
+from models.threat import MatchedThreat, Severity
+
+
+# Timezone-aware replacement for the deprecated datetime.utcnow
+_now = partial(datetime.now, timezone.utc)
+
+
+@dataclass(slots=True)
+class ResourceTable:
+    """
+    Column-oriented view of resources for bulk scans
+    
+    Each attribute is one column; row i across all columns describes the
+    i-th resource. Scans that only need one or two fields (type, provider)
+    walk a single list instead of touching every Resource object.
+    """
+    resource_type: List[str] = field(default_factory=list)
+    name: List[str] = field(default_factory=list)
+    provider: List[Optional[str]] = field(default_factory=list)
+    cloud_provider: List[Optional[str]] = field(default_factory=list)
+    properties: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.resource_type)
+    
+    @staticmethod
+    def from_resources(resources: List[Resource]) -> 'ResourceTable':
+        """Build columns from a list of resources"""
+        return ResourceTable(
+            resource_type=[r.resource_type for r in resources],
+            name=[r.name for r in resources],
+            provider=[r.provider for r in resources],
+            cloud_provider=[r.cloud_provider for r in resources],
+            properties=[r.properties for r in resources]
+        )
+    
+    def select(self, resource_types: Iterable[str]) -> List[int]:
+        """Return row indices whose resource type is in resource_types"""
+        wanted = set(resource_types)
+        return [i for i, resource_type in enumerate(self.resource_type) if resource_type in wanted]
+    
+    def count_by_provider(self) -> Dict[str, int]:
+        """Count rows by cloud provider"""
+        return dict(Counter(provider or 'other' for provider in self.cloud_provider))
+
+
+@dataclass(slots=True)
+class TerraformConfiguration:
+    """Complete Terraform configuration"""
+    resources: List[Resource] = field(default_factory=list)
+    data_sources: List[DataSource] = field(default_factory=list)
+    variables: List[Variable] = field(default_factory=list)
+    outputs: List[Output] = field(default_factory=list)
+    providers: List[Provider] = field(default_factory=list)
+    modules: List[Module] = field(default_factory=list)
+    terraform_version: Optional[str] = None
+    backend_config: Optional[Dict[str, Any]] = None
+    parsed_at: datetime = field(default_factory=_now)
+    source_files: List[str] = field(default_factory=list)
+    parsing_errors: List[str] = field(default_factory=list)  # Files skipped by a directory parse
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization
+        
+        'parsing_errors' is only present when a directory parse skipped files.
+        """
+        result = {
+            'resources': list(map(Resource.to_dict, self.resources)),
+            'data_sources': list(map(DataSource.to_dict, self.data_sources)),
+            'variables': list(map(Variable.to_dict, self.variables)),
+            'outputs': list(map(Output.to_dict, self.outputs)),
+            'providers': list(map(Provider.to_dict, self.providers)),
+            'modules': list(map(Module.to_dict, self.modules)),
+            'terraform_version': self.terraform_version,
+            'backend_config': self.backend_config,
+            'parsed_at': self.parsed_at.isoformat(),
+            'source_files': self.source_files,
+            'statistics': {
+                'total_resources': len(self.resources),
+                'total_data_sources': len(self.data_sources),
+                'total_variables': len(self.variables),
+                'total_outputs': len(self.outputs),
+                'total_providers': len(self.providers),
+                'total_modules': len(self.modules),
+                'providers_by_type': self._count_by_provider()
+            }
+        }
+        if self.parsing_errors:
+            result['parsing_errors'] = list(self.parsing_errors)
+        return result
+    
+    def as_table(self) -> ResourceTable:
+        """Return a column-oriented view of the resources"""
+        return ResourceTable.from_resources(self.resources)
+    
+    def to_arrow(self) -> 'pa.Table':
+        """
+        Export resources as an Arrow table
+        
+        Columns: resource_type, name, cloud_provider, provider, location,
+        line_number and properties (JSON-encoded string). Requires the
+        optional pyarrow package.
+        
+        Returns:
+            pyarrow.Table with one row per resource
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Arrow export (pip install pyarrow)")
+        
+        table = self.as_table()
+        
+        return pa.table({
+            'resource_type': pa.array(table.resource_type, type=pa.string()),
+            'name': pa.array(table.name, type=pa.string()),
+            'cloud_provider': pa.array(table.cloud_provider, type=pa.string()),
+            'provider': pa.array(table.provider, type=pa.string()),
+            'location': pa.array([r.location for r in self.resources], type=pa.string()),
+            'line_number': pa.array([r.line_number for r in self.resources], type=pa.int64()),
+            'properties': pa.array(
+                [
+                    orjson.dumps(properties, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+                    for properties in table.properties
+                ],
+                type=pa.string()
+            )
+        })
+    
+    def to_parquet(self, path: str) -> None:
+        """
+        Write resources to a ZSTD-compressed Parquet file
+        
+        Args:
+            path: Output file path
+        """
+        pq.write_table(self.to_arrow(), path, compression='zstd')
+    
+    def serialize(self) -> bytes:
+        """
+        Serialize to JSON bytes
+        
+        Produces the same document as to_dict(), encoded with orjson rather
+        than the stdlib json encoder.
+        
+        Returns:
+            UTF-8 encoded JSON
+        """
+        return orjson.dumps(
+            self.to_dict(),
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS
+        )
+    
+    def _count_by_provider(self) -> Dict[str, int]:
+        """Count resources by cloud provider"""
+        return dict(Counter(resource.cloud_provider or 'other' for resource in self.resources))
+
+
+# Sort key reading MatchedThreat.risk_score
+_risk_score_key = attrgetter('risk_score')
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values orjson does not handle natively (e.g. sets in resource properties)"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+@dataclass(slots=True)
+class ThreatMatchResult:
+    """
+    Result of threat matching operation
+    """
+    matched_threats: List[MatchedThreat] = field(default_factory=list)
+    total_resources_scanned: int = 0
+    total_threats_checked: int = 0
+    execution_time_ms: float = 0.0
+    
+    # Statistics
+    by_severity: Dict[str, int] = field(default_factory=dict)
+    by_category: Dict[str, int] = field(default_factory=dict)
+    by_resource_type: Dict[str, int] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization
+        
+        Matches reference their threat by 'threat_id'; each distinct threat
+        is serialized once under 'threats'.
+        """
+        unique_threats = {mt.threat.id: mt.threat for mt in self.matched_threats}
+        
+        return {
+            'matched_threats': list(map(MatchedThreat.to_dict, self.matched_threats)),
+            'threats': {threat_id: threat.to_dict() for threat_id, threat in unique_threats.items()},
+            'total_matched': len(self.matched_threats),
+            'total_resources_scanned': self.total_resources_scanned,
+            'total_threats_checked': self.total_threats_checked,
+            'execution_time_ms': self.execution_time_ms,
+            'statistics': {
+                'by_severity': self.by_severity,
+                'by_category': self.by_category,
+                'by_resource_type': self.by_resource_type
+            }
+        }
+    
+    def recompute_statistics(self) -> None:
+        """Rebuild by_severity, by_category and by_resource_type from matched_threats"""
+        threats = [mt.threat for mt in self.matched_threats]
+        self.by_severity = dict(Counter(threat.severity.value for threat in threats))
+        self.by_category = dict(Counter(map(attrgetter('category'), threats)))
+        self.by_resource_type = dict(Counter(map(attrgetter('resource_type'), self.matched_threats)))
+    
+    def serialize(self) -> bytes:
+        """
+        Serialize to JSON bytes
+        
+        Produces the same document as to_dict(), encoded with orjson rather
+        than the stdlib json encoder.
+        
+        Returns:
+            UTF-8 encoded JSON
+        """
+        return orjson.dumps(
+            self.to_dict(),
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS
+        )
+    
+    def get_critical_threats(self) -> List[MatchedThreat]:
+        """Get only critical severity threats"""
+        return [mt for mt in self.matched_threats if mt.threat.severity == Severity.CRITICAL]
+    
+    def get_high_risk_threats(self, threshold: float = 5.0) -> List[MatchedThreat]:
+        """Get threats with risk score above threshold"""
+        return [mt for mt in self.matched_threats if mt.risk_score >= threshold]
+    
+    def sort_by_risk(self) -> None:
+        """Sort matched threats by risk score (descending)"""
+        self.matched_threats.sort(key=_risk_score_key, reverse=True)
@@ -10,6 +10,10 @@ from typing import List, Dict, Optional, Set, Any
 from enum import Enum
 
 
+# Sentinel for node IDs missing from a DFD (None is a valid trust boundary)
+_UNKNOWN = object()
+
+
 class NodeType(Enum):
     """Types of nodes in a DFD"""
     SERVICE = "service"
@@ -31,50 +35,51 @@ class NodeType(Enum):
 
 
 class TrustBoundary(Enum):
-    """Trust boundaries in the system"""
-    INTERNET = "internet"
-    DMZ = "dmz"
-    INTERNAL = "internal"
-    RESTRICTED = "restricted"
-    PRIVATE = "private"
+    """
+    Trust boundaries in the system
     
-    @property
-    def security_level(self) -> int:
-        """Return numeric security level for comparison"""
-        levels = {
-            'internet': 0,
-            'dmz': 1,
-            'internal': 2,
-            'private': 3,
-            'restricted': 4
-        }
-        return levels.get(self.value, 0)
+    Each member carries its numeric security level as a plain attribute;
+    .value stays the lowercase label used in JSON output.
+    """
+    INTERNET = ("internet", 0)
+    DMZ = ("dmz", 1)
+    INTERNAL = ("internal", 2)
+    RESTRICTED = ("restricted", 4)
+    PRIVATE = ("private", 3)
+    
+    security_level: int  # Numeric security level for comparison
+    
+    def __new__(cls, label: str, security_level: int):
+        member = object.__new__(cls)
+        member._value_ = label
+        member.security_level = security_level
+        return member
 
 
 class DataClassification(Enum):
-    """Data sensitivity classification"""
-    PUBLIC = "public"
-    INTERNAL = "internal"
-    CONFIDENTIAL = "confidential"
-    RESTRICTED = "restricted"
-    PII = "pii"
-    PHI = "phi"
+    """
+    Data sensitivity classification
     
-    @property
-    def sensitivity_level(self) -> int:
-        """Return numeric sensitivity level"""
-        levels = {
-            'public': 0,
-            'internal': 1,
-            'confidential': 2,
-            'pii': 3,
-            'phi': 3,
-            'restricted': 4
-        }
-        return levels.get(self.value, 0)
+    Each member carries its numeric sensitivity level as a plain attribute;
+    .value stays the lowercase label used in JSON output.
+    """
+    PUBLIC = ("public", 0)
+    INTERNAL = ("internal", 1)
+    CONFIDENTIAL = ("confidential", 2)
+    RESTRICTED = ("restricted", 4)
+    PII = ("pii", 3)
+    PHI = ("phi", 3)
+    
+    sensitivity_level: int  # Numeric sensitivity level
+    
+    def __new__(cls, label: str, sensitivity_level: int):
+        member = object.__new__(cls)
+        member._value_ = label
+        member.sensitivity_level = sensitivity_level
+        return member
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DFDNode:
     """A node in a Data Flow Diagram"""
     id: str
@@ -86,6 +91,15 @@ class DFDNode:
     properties: Dict[str, Any] = field(default_factory=dict)
     tags: List[str] = field(default_factory=list)
     
+    # Nodes are identified by ID; the hash is computed once at construction
+    _hash: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash(self.id))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
@@ -100,7 +114,7 @@ class DFDNode:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DFDEdge:
     """An edge (data flow) in a Data Flow Diagram"""
     source: str
@@ -113,6 +127,15 @@ class DFDEdge:
     bidirectional: bool = False
     properties: Dict[str, Any] = field(default_factory=dict)
     
+    # Edges are identified by endpoints and label; hashed once at construction
+    _hash: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash((self.source, self.target, self.label)))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
@@ -151,6 +174,10 @@ class TrustBoundaryGroup:
         }
 
 
+# DFD fields whose reassignment bumps the revision
+_REVISED_FIELDS = frozenset({'level', 'nodes', 'edges', 'trust_boundaries'})
+
+
 @dataclass
 class DFD:
     """Complete Data Flow Diagram"""
@@ -159,13 +186,124 @@ class DFD:
     edges: List[DFDEdge] = field(default_factory=list)
     trust_boundaries: List[TrustBoundaryGroup] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _index: Dict[str, DFDNode] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed_nodes: Optional[List[DFDNode]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _edge_set: Set[DFDEdge] = field(default_factory=set, init=False, repr=False, compare=False)
+    _hashed_edges: Optional[List[DFDEdge]] = field(default=None, init=False, repr=False, compare=False)
+    _hashed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _cross_boundary_cache: Optional[List[DFDEdge]] = field(default=None, init=False, repr=False, compare=False)
+    _stats_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _cache_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _revision: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Reassigning a content field starts a new revision, so memoized
+        # results never outlive the list they were computed from
+        object.__setattr__(self, name, value)
+        if name in _REVISED_FIELDS:
+            object.__setattr__(self, '_revision', getattr(self, '_revision', 0) + 1)
+    
+    def add_node(self, node: DFDNode) -> None:
+        """Append a node and index it by ID"""
+        self.nodes.append(node)
+        self._revision += 1
+        self._sync_index()
+    
+    def add_edge(self, edge: DFDEdge, dedupe: bool = False) -> bool:
+        """
+        Append an edge
+        
+        Args:
+            edge: The edge to add
+            dedupe: Skip the edge if an equal one is already present
+        
+        Returns:
+            True if the edge was appended
+        """
+        if dedupe and self.has_edge(edge):
+            return False
+        self.edges.append(edge)
+        self._revision += 1
+        return True
+    
+    def has_edge(self, edge: DFDEdge) -> bool:
+        """Check whether an equal edge is already in the DFD"""
+        return edge in self._sync_edge_set()
+    
+    def invalidate_caches(self) -> None:
+        """
+        Drop memoized lookups, statistics and exports
+        
+        add_node/add_edge, reassigning ``level``/``nodes``/``edges``/
+        ``trust_boundaries`` and appending to those lists are detected
+        automatically; call this after swapping or removing an element of
+        one of those lists in place.
+        """
+        self._indexed_nodes = None
+        self._hashed_edges = None
+        self._revision += 1
+    
+    def revision_key(self) -> tuple:
+        """
+        Token that changes whenever the DFD's contents change
+        
+        Used to key memoized results here and in exporters. The revision
+        counter covers every tracked mutation; the lengths catch direct
+        appends to the lists.
+        """
+        return (
+            self._revision,
+            len(self.nodes), len(self.edges), len(self.trust_boundaries)
+        )
+    
+    def _check_caches(self) -> None:
+        """Invalidate memoized results if the DFD changed"""
+        key = self.revision_key()
+        if key != self._cache_key:
+            self._cross_boundary_cache = None
+            self._stats_cache = None
+            self._cache_key = key
+    
+    def _sync_index(self) -> Dict[str, DFDNode]:
+        """
+        Bring the node ID index up to date with ``nodes``
+        
+        Nodes appended to the list directly are indexed incrementally; a
+        replaced or shrunk list triggers a full rebuild. The first node
+        with a given ID wins, matching a front-to-back scan.
+        """
+        nodes = self.nodes
+        if nodes is not self._indexed_nodes or len(nodes) < self._indexed_count:
+            self._index = {}
+            self._indexed_nodes = nodes
+            self._indexed_count = 0
+        
+        if self._indexed_count < len(nodes):
+            index = self._index
+            for node in nodes[self._indexed_count:]:
+                index.setdefault(node.id, node)
+            self._indexed_count = len(nodes)
+        
+        return self._index
+    
+    def _sync_edge_set(self) -> Set[DFDEdge]:
+        """Bring the edge membership set up to date with ``edges``"""
+        edges = self.edges
+        if edges is not self._hashed_edges or len(edges) < self._hashed_count:
+            self._edge_set = set()
+            self._hashed_edges = edges
+            self._hashed_count = 0
+        
+        if self._hashed_count < len(edges):
+            self._edge_set.update(edges[self._hashed_count:])
+            self._hashed_count = len(edges)
+        
+        return self._edge_set
     
     def get_node_by_id(self, node_id: str) -> Optional[DFDNode]:
         """Get node by ID"""
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        return self._sync_index().get(node_id)
     
     def get_edges_for_node(self, node_id: str) -> List[DFDEdge]:
         """Get all edges connected to a node"""
@@ -184,24 +322,33 @@ class DFD:
     
     def get_cross_boundary_edges(self) -> List[DFDEdge]:
         """Get all edges that cross trust boundaries"""
+        self._check_caches()
+        if self._cross_boundary_cache is not None:
+            return list(self._cross_boundary_cache)
+        
+        # Resolve each node's boundary once; edges then compare enum members
+        # by identity. Edges with an unknown endpoint never cross.
+        boundary_of = {node_id: node.trust_boundary for node_id, node in self._sync_index().items()}
         cross_boundary = []
         for edge in self.edges:
-            source_node = self.get_node_by_id(edge.source)
-            target_node = self.get_node_by_id(edge.target)
+            source_boundary = boundary_of.get(edge.source, _UNKNOWN)
+            target_boundary = boundary_of.get(edge.target, _UNKNOWN)
             
-            if (source_node and target_node and 
-                source_node.trust_boundary != target_node.trust_boundary):
+            if (source_boundary is not _UNKNOWN and target_boundary is not _UNKNOWN and
+                source_boundary is not target_boundary):
                 edge.properties['crosses_boundary'] = True
                 cross_boundary.append(edge)
         
-        return cross_boundary
+        self._cross_boundary_cache = cross_boundary
+        return list(cross_boundary)
     
     def get_external_connections(self) -> List[DFDEdge]:
         """Get all edges connecting to external systems"""
+        index = self._sync_index()
         external = []
         for edge in self.edges:
-            source_node = self.get_node_by_id(edge.source)
-            target_node = self.get_node_by_id(edge.target)
+            source_node = index.get(edge.source)
+            target_node = index.get(edge.target)
             
             if (source_node and source_node.type == NodeType.EXTERNAL) or \
                (target_node and target_node.type == NodeType.EXTERNAL):
@@ -211,6 +358,10 @@ class DFD:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get DFD statistics"""
+        self._check_caches()
+        if self._stats_cache is not None:
+            return dict(self._stats_cache)
+        
         node_types = {}
         for node in self.nodes:
             node_type = node.type.value
@@ -228,7 +379,7 @@ class DFD:
                 classification = edge.data_classification.value
                 data_classifications[classification] = data_classifications.get(classification, 0) + 1
         
-        return {
+        self._stats_cache = {
             'level': self.level,
             'total_nodes': len(self.nodes),
             'total_edges': len(self.edges),
@@ -239,6 +390,7 @@ class DFD:
             'external_connections': len(self.get_external_connections()),
             'encrypted_flows': len([e for e in self.edges if e.encrypted])
         }
+        return dict(self._stats_cache)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -252,21 +404,58 @@ class DFD:
         }
 
 
+class _LazyLevel:
+    """
+    DFD layer attribute that accepts either a DFD or a zero-argument builder
+    
+    A builder is called on first read and replaced by the DFD it returns,
+    so layers nobody looks at are never generated.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.attr = f'_{name}'
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return None  # Dataclass field default
+        value = obj.__dict__.get(self.attr)
+        if callable(value):
+            value = value()
+            obj.__dict__[self.attr] = value
+        return value
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr] = value
+
+
 @dataclass
 class DFDGenerationResult:
-    """Result of DFD generation including all layers"""
-    service_level: Optional[DFD] = None
-    component_level: Optional[DFD] = None
-    code_level: Optional[DFD] = None
+    """
+    Result of DFD generation including all layers
+    
+    Each layer may be assigned a builder callable instead of a DFD; it is
+    generated on first access. Exceptions raised while building a layer
+    therefore surface from that first attribute read (or from to_dict()),
+    not from the code that created the result. Node and edge totals are
+    likewise not stored in metadata; to_dict() adds them, and callers
+    that need them earlier can use get_all_nodes() and get_all_edges().
+    """
+    service_level: Optional[DFD] = _LazyLevel()
+    component_level: Optional[DFD] = _LazyLevel()
+    code_level: Optional[DFD] = _LazyLevel()
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """Convert to dictionary, generating any pending layers"""
         return {
             'service_level': self.service_level.to_dict() if self.service_level else None,
             'component_level': self.component_level.to_dict() if self.component_level else None,
             'code_level': self.code_level.to_dict() if self.code_level else None,
-            'metadata': self.metadata
+            'metadata': {
+                **self.metadata,
+                'total_nodes': len(self.get_all_nodes()),
+                'total_edges': len(self.get_all_edges())
+            }
         }
     
     def get_all_nodes(self) -> List[DFDNode]:
@@ -3,12 +3,23 @@ Terraform Configuration Models
 Data classes for Terraform resources, variables, and providers
 """
 
+from __future__ import annotations
+
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+
+# Resource type prefix -> cloud provider
+_PROVIDER_PREFIXES = (
+    ('google_', 'gcp'),
+    ('aws_', 'aws'),
+    ('azurerm_', 'azure'),
+    ('alicloud_', 'alibaba')
+)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Resource:
     """Terraform resource definition"""
     resource_type: str  # e.g., "google_sql_database_instance", "aws_s3_bucket"
@@ -16,26 +27,27 @@ class Resource:
     properties: Dict[str, Any] = field(default_factory=dict)
     location: Optional[str] = None  # File path where defined
     line_number: Optional[int] = None
-    depends_on: List[str] = field(default_factory=list)
+    depends_on: Tuple[str, ...] = ()
     provider: Optional[str] = None  # Provider name (aws, google, azurerm)
     
-    @property
-    def full_name(self) -> str:
-        """Return fully qualified resource name"""
-        return f"{self.resource_type}.{self.name}"
+    # Derived from resource_type/name once at construction; read on every to_dict()
+    full_name: str = field(init=False, repr=False, compare=False)
+    cloud_provider: Optional[str] = field(init=False, repr=False, compare=False)
     
-    @property
-    def cloud_provider(self) -> Optional[str]:
-        """Extract cloud provider from resource type"""
-        if self.resource_type.startswith('google_'):
-            return 'gcp'
-        elif self.resource_type.startswith('aws_'):
-            return 'aws'
-        elif self.resource_type.startswith('azurerm_'):
-            return 'azure'
-        elif self.resource_type.startswith('alicloud_'):
-            return 'alibaba'
-        return None
+    def __post_init__(self):
+        # Frozen dataclass: derived fields are set through object.__setattr__.
+        # Type and provider strings repeat across thousands of resources, so
+        # they are interned to share one object per distinct value.
+        object.__setattr__(self, 'resource_type', sys.intern(self.resource_type))
+        if self.provider is not None:
+            object.__setattr__(self, 'provider', sys.intern(self.provider))
+        object.__setattr__(self, 'depends_on', tuple(self.depends_on))
+        object.__setattr__(self, 'full_name', f"{self.resource_type}.{self.name}")
+        object.__setattr__(self, 'cloud_provider', next(
+            (provider for prefix, provider in _PROVIDER_PREFIXES
+             if self.resource_type.startswith(prefix)),
+            None
+        ))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -46,13 +58,13 @@ class Resource:
             'properties': self.properties,
             'location': self.location,
             'line_number': self.line_number,
-            'depends_on': self.depends_on,
+            'depends_on': list(self.depends_on),
             'provider': self.provider,
             'cloud_provider': self.cloud_provider
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Variable:
     """Terraform variable definition"""
     name: str
@@ -78,7 +90,7 @@ class Variable:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Output:
     """Terraform output definition"""
     name: str
@@ -100,7 +112,7 @@ class Output:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Provider:
     """Terraform provider configuration"""
     name: str  # aws, google, azurerm, etc.
@@ -111,12 +123,13 @@ class Provider:
     location: Optional[str] = None
     line_number: Optional[int] = None
     
-    @property
-    def full_name(self) -> str:
-        """Return provider name with alias if present"""
-        if self.alias:
-            return f"{self.name}.{self.alias}"
-        return self.name
+    # Provider name with alias if present
+    full_name: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(
+            self, 'full_name', f"{self.name}.{self.alias}" if self.alias else self.name
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -132,7 +145,7 @@ class Provider:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataSource:
     """Terraform data source definition"""
     data_type: str  # e.g., "aws_ami", "google_compute_image"
@@ -142,10 +155,11 @@ class DataSource:
     line_number: Optional[int] = None
     provider: Optional[str] = None
     
-    @property
-    def full_name(self) -> str:
-        """Return fully qualified data source name"""
-        return f"data.{self.data_type}.{self.name}"
+    # Fully qualified data source name
+    full_name: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'full_name', f"data.{self.data_type}.{self.name}")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -160,7 +174,7 @@ class DataSource:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Module:
     """Terraform module reference"""
     name: str
@@ -182,48 +196,9 @@ class Module:
         }
 
 
-@dataclass
-class TerraformConfiguration:
-    """Complete Terraform configuration"""
-    resources: List[Resource] = field(default_factory=list)
-    data_sources: List[DataSource] = field(default_factory=list)
-    variables: List[Variable] = field(default_factory=list)
-    outputs: List[Output] = field(default_factory=list)
-    providers: List[Provider] = field(default_factory=list)
-    modules: List[Module] = field(default_factory=list)
-    terraform_version: Optional[str] = None
-    backend_config: Optional[Dict[str, Any]] = None
-    parsed_at: datetime = field(default_factory=datetime.utcnow)
-    source_files: List[str] = field(default_factory=list)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'resources': [r.to_dict() for r in self.resources],
-            'data_sources': [d.to_dict() for d in self.data_sources],
-            'variables': [v.to_dict() for v in self.variables],
-            'outputs': [o.to_dict() for o in self.outputs],
-            'providers': [p.to_dict() for p in self.providers],
-            'modules': [m.to_dict() for m in self.modules],
-            'terraform_version': self.terraform_version,
-            'backend_config': self.backend_config,
-            'parsed_at': self.parsed_at.isoformat(),
-            'source_files': self.source_files,
-            'statistics': {
-                'total_resources': len(self.resources),
-                'total_data_sources': len(self.data_sources),
-                'total_variables': len(self.variables),
-                'total_outputs': len(self.outputs),
-                'total_providers': len(self.providers),
-                'total_modules': len(self.modules),
-                'providers_by_type': self._count_by_provider()
-            }
-        }
-    
-    def _count_by_provider(self) -> Dict[str, int]:
-        """Count resources by cloud provider"""
-        counts = {}
-        for resource in self.resources:
-            provider = resource.cloud_provider or 'other'
-            counts[provider] = counts.get(provider, 0) + 1
-        return counts
+def __getattr__(name: str) -> Any:
+    """Expose aggregates from models._aggregates, imported on first use"""
+    if name in ('ResourceTable', 'TerraformConfiguration'):
+        from models import _aggregates
+        return getattr(_aggregates, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
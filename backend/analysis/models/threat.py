@@ -3,50 +3,71 @@ Threat Models for Security Analysis
 Data classes for threat definitions, conditions, and matched threats
 """
 
+from __future__ import annotations
+
+import logging
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+
+logger = logging.getLogger(__name__)
+
+# Timezone-aware replacement for the deprecated datetime.utcnow
+_now = partial(datetime.now, timezone.utc)
+
+
+@lru_cache(maxsize=32)
+def _isoformat(timestamp: datetime) -> str:
+    """ISO-format a timestamp; matches from one run share a timestamp"""
+    return timestamp.isoformat()
 
 
 class Severity(Enum):
-    """Threat severity levels"""
-    CRITICAL = "critical"
-    HIGH = "high"
-    MEDIUM = "medium"
-    LOW = "low"
-    INFO = "info"
+    """
+    Threat severity levels
     
-    @property
-    def score(self) -> int:
-        """Return numeric score for severity"""
-        return {
-            "critical": 10,
-            "high": 7,
-            "medium": 5,
-            "low": 3,
-            "info": 1
-        }[self.value]
+    Each member carries its numeric score as a plain attribute; .value
+    stays the lowercase label used in threat files and JSON output.
+    """
+    CRITICAL = ("critical", 10)
+    HIGH = ("high", 7)
+    MEDIUM = ("medium", 5)
+    LOW = ("low", 3)
+    INFO = ("info", 1)
+    
+    score: int  # Numeric score for severity
+    
+    def __new__(cls, label: str, score: int):
+        member = object.__new__(cls)
+        member._value_ = label
+        member.score = score
+        return member
 
 
 class Likelihood(Enum):
-    """Threat likelihood levels"""
-    CERTAIN = "certain"
-    LIKELY = "likely"
-    POSSIBLE = "possible"
-    UNLIKELY = "unlikely"
-    RARE = "rare"
+    """
+    Threat likelihood levels
     
-    @property
-    def score(self) -> float:
-        """Return numeric score for likelihood"""
-        return {
-            "certain": 1.0,
-            "likely": 0.8,
-            "possible": 0.5,
-            "unlikely": 0.3,
-            "rare": 0.1
-        }[self.value]
+    Each member carries its numeric score as a plain attribute; .value
+    stays the lowercase label used in threat files and JSON output.
+    """
+    CERTAIN = ("certain", 1.0)
+    LIKELY = ("likely", 0.8)
+    POSSIBLE = ("possible", 0.5)
+    UNLIKELY = ("unlikely", 0.3)
+    RARE = ("rare", 0.1)
+    
+    score: float  # Numeric score for likelihood
+    
+    def __new__(cls, label: str, score: float):
+        member = object.__new__(cls)
+        member._value_ = label
+        member.score = score
+        return member
 
 
 class ConditionOperator(Enum):
@@ -66,7 +87,259 @@ class ConditionOperator(Enum):
     LTE = "<="
 
 
-@dataclass
+# Operator implementations
+
+def _op_equals(field_value: Any, expected_value: Any) -> bool:
+    """Check if field equals expected value"""
+    return field_value == expected_value
+
+
+def _op_not_equals(field_value: Any, expected_value: Any) -> bool:
+    """Check if field does not equal expected value"""
+    return field_value != expected_value
+
+
+def _op_in(field_value: Any, expected_value: Any) -> bool:
+    """Check if field value is in expected list"""
+    if not isinstance(expected_value, (list, tuple, set)):
+        return False
+    return field_value in expected_value
+
+
+def _op_not_in(field_value: Any, expected_value: Any) -> bool:
+    """Check if field value is not in expected list"""
+    if not isinstance(expected_value, (list, tuple, set)):
+        return True
+    return field_value not in expected_value
+
+
+def _dict_contains(data: Dict, expected: Any) -> bool:
+    """Check if dict contains expected key-value pairs"""
+    if not isinstance(expected, dict):
+        return False
+    
+    for key, value in expected.items():
+        if key not in data:
+            return False
+        if isinstance(value, dict) and isinstance(data[key], dict):
+            if not _dict_contains(data[key], value):
+                return False
+        elif data[key] != value:
+            return False
+    
+    return True
+
+
+def _op_contains(field_value: Any, expected_value: Any) -> bool:
+    """
+    Check if field contains expected value
+    
+    - For lists: check if expected value is in list
+    - For dicts: check if expected key-value pair exists
+    - For strings: check if substring exists
+    """
+    if field_value is None:
+        return False
+    
+    if isinstance(field_value, (list, tuple)):
+        # Check if any item in list matches expected value
+        if isinstance(expected_value, dict):
+            # Check if any dict in list contains the key-value pairs
+            return any(
+                _dict_contains(item, expected_value)
+                for item in field_value
+                if isinstance(item, dict)
+            )
+        else:
+            return expected_value in field_value
+    
+    elif isinstance(field_value, dict):
+        return _dict_contains(field_value, expected_value)
+    
+    elif isinstance(field_value, str):
+        return str(expected_value) in field_value
+    
+    return False
+
+
+def _op_not_contains(field_value: Any, expected_value: Any) -> bool:
+    """Check if field does not contain expected value"""
+    return not _op_contains(field_value, expected_value)
+
+
+def _op_regex(field_value: Any, pattern: str) -> bool:
+    """Check if field matches regex pattern"""
+    if field_value is None:
+        return False
+    
+    try:
+        field_str = str(field_value)
+        return bool(re.match(pattern, field_str))
+    except re.error as e:
+        logger.error(f"Invalid regex pattern '{pattern}': {e}")
+        return False
+
+
+def _op_exists(field_value: Any, _: Any) -> bool:
+    """Check if field exists (not None)"""
+    return field_value is not None
+
+
+def _op_not_exists(field_value: Any, _: Any) -> bool:
+    """Check if field does not exist (is None)"""
+    return field_value is None
+
+
+def _op_greater_than(field_value: Any, expected_value: Any) -> bool:
+    """Check if field is greater than expected value"""
+    try:
+        return float(field_value) > float(expected_value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _op_less_than(field_value: Any, expected_value: Any) -> bool:
+    """Check if field is less than expected value"""
+    try:
+        return float(field_value) < float(expected_value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _op_greater_equal(field_value: Any, expected_value: Any) -> bool:
+    """Check if field is greater than or equal to expected value"""
+    try:
+        return float(field_value) >= float(expected_value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _op_less_equal(field_value: Any, expected_value: Any) -> bool:
+    """Check if field is less than or equal to expected value"""
+    try:
+        return float(field_value) <= float(expected_value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _never(field_value: Any, expected_value: Any) -> bool:
+    """Evaluator for conditions that can never match"""
+    return False
+
+
+def _compile_regex(pattern: str) -> Callable[[Any, Any], bool]:
+    """
+    Build a regex evaluator with the pattern compiled once
+    
+    Args:
+        pattern: Regular expression from the condition value
+    
+    Returns:
+        Evaluator matching str(field_value) against the compiled pattern
+    """
+    try:
+        compiled = re.compile(pattern)
+    except (re.error, TypeError) as e:
+        logger.error(f"Invalid regex pattern '{pattern}': {e}")
+        return _never
+    
+    def _eval(field_value: Any, _: Any) -> bool:
+        if field_value is None:
+            return False
+        return compiled.match(str(field_value)) is not None
+    
+    return _eval
+
+
+def _compile_membership(values: Any, negate: bool) -> Callable[[Any, Any], bool]:
+    """
+    Build an in/not_in evaluator with the expected values frozen into a set
+    
+    Args:
+        values: Expected values from the condition
+        negate: True for not_in
+    
+    Returns:
+        Evaluator doing an O(1) set lookup, or the generic operator when the
+        values are not a list or contain unhashable items
+    """
+    generic = _op_not_in if negate else _op_in
+    
+    if not isinstance(values, (list, tuple, set)):
+        return generic
+    
+    try:
+        members = frozenset(values)
+    except TypeError:
+        return generic
+    
+    def _eval(field_value: Any, expected_value: Any) -> bool:
+        try:
+            found = field_value in members
+        except TypeError:
+            # Unhashable field values (lists, dicts) fall back to equality scan
+            found = field_value in expected_value
+        return not found if negate else found
+    
+    return _eval
+
+
+# Operator string -> implementation, resolved once per Condition. This is
+# the only operator table: register custom operators here before threats
+# are loaded, since existing Conditions keep the evaluator they resolved.
+CONDITION_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ConditionOperator.EQUALS.value: _op_equals,
+    ConditionOperator.NOT_EQUALS.value: _op_not_equals,
+    ConditionOperator.IN.value: _op_in,
+    ConditionOperator.NOT_IN.value: _op_not_in,
+    ConditionOperator.CONTAINS.value: _op_contains,
+    ConditionOperator.NOT_CONTAINS.value: _op_not_contains,
+    ConditionOperator.REGEX.value: _op_regex,
+    ConditionOperator.EXISTS.value: _op_exists,
+    ConditionOperator.NOT_EXISTS.value: _op_not_exists,
+    ConditionOperator.GT.value: _op_greater_than,
+    ConditionOperator.LT.value: _op_less_than,
+    ConditionOperator.GTE.value: _op_greater_equal,
+    ConditionOperator.LTE.value: _op_less_equal
+}
+
+
+def resolve_field_path(data: Any, keys: Tuple[str, ...]) -> Any:
+    """
+    Get value from nested dictionaries/lists following pre-split path keys
+    
+    Args:
+        data: Resource dictionary to search
+        keys: Path components (e.g. ("properties", "settings", "tier"))
+    
+    Returns:
+        Value at path, or None if not found
+    """
+    current = data
+    
+    for key in keys:
+        if isinstance(current, dict):
+            current = current.get(key)
+            if current is None:
+                return None
+        elif isinstance(current, list):
+            # Handle list indexing
+            try:
+                current = current[int(key)]
+            except (ValueError, IndexError):
+                return None
+        else:
+            return None
+    
+    return current
+
+
+def _no_match(resource: Dict[str, Any]) -> bool:
+    """Predicate for condition trees that can never match"""
+    return False
+
+
+@dataclass(slots=True, frozen=True)
 class Condition:
     """
     Condition for threat matching
@@ -81,6 +354,20 @@ class Condition:
     operator: str  # Comparison operator
     value: Any  # Expected value
     
+    # Operator implementation, or None for unknown operators
+    _eval: Optional[Callable[[Any, Any], bool]] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.operator == ConditionOperator.REGEX.value:
+            evaluator = _compile_regex(self.value)
+        elif self.operator == ConditionOperator.IN.value:
+            evaluator = _compile_membership(self.value, negate=False)
+        elif self.operator == ConditionOperator.NOT_IN.value:
+            evaluator = _compile_membership(self.value, negate=True)
+        else:
+            evaluator = CONDITION_OPERATORS.get(self.operator)
+        object.__setattr__(self, '_eval', evaluator)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
@@ -89,17 +376,36 @@ class Condition:
             'value': self.value
         }
     
+    def compile(self) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Build a predicate evaluating this condition against a resource
+        
+        The field path is split once here instead of on every evaluation.
+        Evaluation errors count as a non-match.
+        """
+        evaluator = self._eval
+        if evaluator is None:
+            return _no_match
+        
+        keys = tuple(self.field.split('.'))
+        expected = self.value
+        
+        def _match(resource: Dict[str, Any]) -> bool:
+            try:
+                return bool(evaluator(resolve_field_path(resource, keys), expected))
+            except Exception:
+                return False
+        
+        return _match
+    
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Condition':
         """Create from dictionary"""
-        return Condition(
-            field=data['field'],
-            operator=data['operator'],
-            value=data['value']
-        )
+        # Positional arguments skip keyword matching in the generated __init__
+        return Condition(data['field'], data['operator'], data['value'])
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LogicGroup:
     """
     Logical group of conditions (AND/OR)
@@ -121,51 +427,124 @@ class LogicGroup:
             'groups': [g.to_dict() for g in self.groups]
         }
     
+    def compile(self) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Build a predicate evaluating the whole group against a resource
+        
+        Conditions and nested groups are compiled once into a flat tuple of
+        predicates; evaluation short-circuits like and/or.
+        """
+        checks = tuple(
+            [condition.compile() for condition in self.conditions] +
+            [group.compile() for group in self.groups]
+        )
+        
+        # Empty groups and unknown logic operators never match
+        if not checks or self.logic not in ('and', 'or'):
+            return _no_match
+        
+        if len(checks) == 1:
+            return checks[0]
+        
+        if self.logic == 'and':
+            def _match_all(resource: Dict[str, Any]) -> bool:
+                for check in checks:
+                    if not check(resource):
+                        return False
+                return True
+            return _match_all
+        
+        def _match_any(resource: Dict[str, Any]) -> bool:
+            for check in checks:
+                if check(resource):
+                    return True
+            return False
+        return _match_any
+    
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'LogicGroup':
-        """Create from dictionary"""
-        return LogicGroup(
-            logic=data['logic'],
-            conditions=[Condition.from_dict(c) for c in data.get('conditions', [])],
-            groups=[LogicGroup.from_dict(g) for g in data.get('groups', [])]
-        )
+        """
+        Create from dictionary
+        
+        Walks nested groups with an explicit stack (post-order) instead of
+        recursing, so each group is constructed once its sub-groups exist.
+        """
+        built: Dict[int, LogicGroup] = {}
+        stack = [(data, False)]
+        
+        while stack:
+            raw, children_built = stack.pop()
+            raw_groups = raw.get('groups') or ()
+            
+            if not children_built:
+                stack.append((raw, True))
+                stack.extend((group, False) for group in raw_groups)
+                continue
+            
+            built[id(raw)] = LogicGroup(
+                logic=raw['logic'],
+                conditions=[
+                    Condition(c['field'], c['operator'], c['value'])
+                    for c in raw.get('conditions') or ()
+                ],
+                groups=[built[id(group)] for group in raw_groups]
+            )
+        
+        return built[id(data)]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Mitigation:
     """Mitigation recommendation for a threat"""
     description: str
     effort: str  # 'low', 'medium', 'high'
     impact: str  # 'low', 'medium', 'high'
-    steps: List[str] = field(default_factory=list)
+    steps: Tuple[str, ...] = ()
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
+    # Dictionary form, built once; value objects never change after construction
+    _dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'steps', tuple(self.steps))
+        object.__setattr__(self, '_dict', {
             'description': self.description,
             'effort': self.effort,
             'impact': self.impact,
-            'steps': self.steps
-        }
+            'steps': list(self.steps)
+        })
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (shared, treat as read-only)"""
+        return self._dict
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ComplianceMapping:
     """Compliance framework mapping"""
     framework: str  # e.g., "NIST", "CIS", "GDPR"
     control_id: str  # e.g., "AC-3", "5.1"
     description: str
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
+    # Dictionary form, built once; value objects never change after construction
+    _dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, '_dict', {
             'framework': self.framework,
             'control_id': self.control_id,
             'description': self.description
-        }
+        })
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (shared, treat as read-only)"""
+        return self._dict
+
+
+# Threat fields risk_score is derived from
+_RISK_FIELDS = frozenset({'severity', 'likelihood'})
 
 
-@dataclass
+@dataclass(slots=True)
 class Threat:
     """
     Threat definition loaded from threat database
@@ -178,58 +557,108 @@ class Threat:
     category: str  # e.g., "Data Exposure", "Access Control"
     
     # Resource matching
-    resource_types: List[str] = field(default_factory=list)  # e.g., ["google_sql_database_instance"]
-    cloud_providers: List[str] = field(default_factory=list)  # e.g., ["gcp", "aws"]
+    resource_types: Tuple[str, ...] = ()  # e.g., ["google_sql_database_instance"]
+    cloud_providers: Tuple[str, ...] = ()  # e.g., ["gcp", "aws"]
     
     # Conditions for matching
     condition_logic: Optional[LogicGroup] = None
     
     # Threat details
-    attack_vectors: List[str] = field(default_factory=list)
+    attack_vectors: Tuple[str, ...] = ()
     exploitability: str = "medium"  # 'low', 'medium', 'high'
     business_impact: str = "medium"
     
     # Remediation
     mitigations: List[Mitigation] = field(default_factory=list)
-    references: List[str] = field(default_factory=list)
+    references: Tuple[str, ...] = ()
     compliance_mappings: List[ComplianceMapping] = field(default_factory=list)
     
     # Metadata
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     
-    @property
-    def risk_score(self) -> float:
-        """Calculate risk score (severity * likelihood)"""
-        return self.severity.score * self.likelihood.score
+    # Risk score (severity * likelihood), kept in sync by __setattr__
+    risk_score: float = field(init=False, repr=False, compare=False)
+    
+    # Compiled condition predicate, built by compile()
+    _matcher: Optional[Callable[[Dict[str, Any]], bool]] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    
+    # Memoized to_dict() output, dropped whenever a field is reassigned
+    _dict: Optional[Dict[str, Any]] = field(init=False, default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Matching keys are interned so they share storage (and compare by
+        # identity first) with the interned Resource.resource_type values
+        self.category = sys.intern(self.category)
+        self.resource_types = tuple(map(sys.intern, self.resource_types))
+        self.cloud_providers = tuple(map(sys.intern, self.cloud_providers))
+        self.attack_vectors = tuple(self.attack_vectors)
+        self.references = tuple(self.references)
+        self.tags = tuple(map(sys.intern, self.tags))
+        self.risk_score = self.severity.score * self.likelihood.score
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name[0] == '_' or name == 'risk_score':
+            return
+        
+        # Keep the derived risk score and serialized form current
+        object.__setattr__(self, '_dict', None)
+        if name in _RISK_FIELDS and hasattr(self, 'risk_score'):
+            object.__setattr__(self, 'risk_score', self.severity.score * self.likelihood.score)
+    
+    def compile(self) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Compile condition_logic into a single predicate over resource dicts
+        
+        Threats are loaded once and checked against every resource, so the
+        condition tree is turned into closures up front instead of being
+        re-walked per (threat, resource) pair.
+        
+        Returns:
+            Predicate returning True if the resource matches the threat
+        """
+        self._matcher = self.condition_logic.compile() if self.condition_logic else _no_match
+        return self._matcher
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
+        """
+        Convert to dictionary for JSON serialization
+        
+        The tuple-backed string fields are returned as lists. The dictionary
+        is built once and shared between calls; treat it as read-only.
+        """
+        if self._dict is not None:
+            return self._dict
+        
+        self._dict = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'severity': self.severity.value,
             'likelihood': self.likelihood.value,
             'category': self.category,
-            'resource_types': self.resource_types,
-            'cloud_providers': self.cloud_providers,
+            'resource_types': list(self.resource_types),
+            'cloud_providers': list(self.cloud_providers),
             'condition_logic': self.condition_logic.to_dict() if self.condition_logic else None,
-            'attack_vectors': self.attack_vectors,
+            'attack_vectors': list(self.attack_vectors),
             'exploitability': self.exploitability,
             'business_impact': self.business_impact,
-            'mitigations': [m.to_dict() for m in self.mitigations],
-            'references': self.references,
-            'compliance_mappings': [c.to_dict() for c in self.compliance_mappings],
-            'tags': self.tags,
+            'mitigations': [m._dict for m in self.mitigations],
+            'references': list(self.references),
+            'compliance_mappings': [c._dict for c in self.compliance_mappings],
+            'tags': list(self.tags),
             'risk_score': self.risk_score,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
+        return self._dict
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchedThreat:
     """
     A threat that has been matched to a specific resource
@@ -244,7 +673,7 @@ class MatchedThreat:
     confidence: float = 1.0  # 0.0 to 1.0
     
     # Context
-    matched_at: datetime = field(default_factory=datetime.utcnow)
+    matched_at: datetime = field(default_factory=_now)
     location: Optional[str] = None  # File path where resource is defined
     
     @property
@@ -255,58 +684,23 @@ class MatchedThreat:
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
-            'threat': self.threat.to_dict(),
+            'threat_id': self.threat.id,
             'resource_id': self.resource_id,
             'resource_type': self.resource_type,
             'resource_properties': self.resource_properties,
             'matched_conditions': self.matched_conditions,
             'confidence': self.confidence,
             'risk_score': self.risk_score,
-            'matched_at': self.matched_at.isoformat(),
+            'matched_at': _isoformat(self.matched_at),
             'location': self.location,
             'severity': self.threat.severity.value,
             'category': self.threat.category
         }
 
 
-@dataclass
-class ThreatMatchResult:
-    """
-    Result of threat matching operation
-    """
-    matched_threats: List[MatchedThreat] = field(default_factory=list)
-    total_resources_scanned: int = 0
-    total_threats_checked: int = 0
-    execution_time_ms: float = 0.0
-    
-    # Statistics
-    by_severity: Dict[str, int] = field(default_factory=dict)
-    by_category: Dict[str, int] = field(default_factory=dict)
-    by_resource_type: Dict[str, int] = field(default_factory=dict)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'matched_threats': [mt.to_dict() for mt in self.matched_threats],
-            'total_matched': len(self.matched_threats),
-            'total_resources_scanned': self.total_resources_scanned,
-            'total_threats_checked': self.total_threats_checked,
-            'execution_time_ms': self.execution_time_ms,
-            'statistics': {
-                'by_severity': self.by_severity,
-                'by_category': self.by_category,
-                'by_resource_type': self.by_resource_type
-            }
-        }
-    
-    def get_critical_threats(self) -> List[MatchedThreat]:
-        """Get only critical severity threats"""
-        return [mt for mt in self.matched_threats if mt.threat.severity == Severity.CRITICAL]
-    
-    def get_high_risk_threats(self, threshold: float = 5.0) -> List[MatchedThreat]:
-        """Get threats with risk score above threshold"""
-        return [mt for mt in self.matched_threats if mt.risk_score >= threshold]
-    
-    def sort_by_risk(self) -> None:
-        """Sort matched threats by risk score (descending)"""
-        self.matched_threats.sort(key=lambda mt: mt.risk_score, reverse=True)
+def __getattr__(name: str) -> Any:
+    """Expose aggregates from models._aggregates, imported on first use"""
+    if name == 'ThreatMatchResult':
+        from models import _aggregates
+        return _aggregates.ThreatMatchResult
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
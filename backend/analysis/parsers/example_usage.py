@@ -5,29 +5,32 @@ Demonstrates parsing Terraform configurations and extracting security informatio
 """
 
 import os
+import re
 import json
+import tempfile
 import sys
+from collections import Counter
+from functools import lru_cache, wraps
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from parsers.terraform_parser import TerraformParser, TerraformParserError
 
+# Section header rule
+_BAR = "=" * 80
 
-def print_section(title: str):
-    """Print a formatted section header"""
-    print("\n" + "=" * 80)
-    print(f" {title}")
-    print("=" * 80 + "\n")
+# Variable names that usually hold secrets
+_SENSITIVE_RE = re.compile(r'password|secret|token|key|credential', re.IGNORECASE)
 
+# TerraformParser keeps no per-parse state, so all examples share one instance
+_PARSER = TerraformParser()
 
-def example_parse_file():
-    """Example: Parse a single Terraform file"""
-    print_section("Example 1: Parse a Single File")
-    
-    # Create a sample Terraform file
-    sample_tf = """
+
+# Sample configurations used by the examples
+SAMPLE_SINGLE_FILE = """
 resource "aws_s3_bucket" "data_bucket" {
   bucket = "my-company-data-bucket"
   
@@ -58,45 +61,8 @@ variable "database_password" {
   sensitive   = true
 }
 """
-    
-    # Write to temp file
-    temp_file = "/tmp/example.tf"
-    with open(temp_file, 'w') as f:
-        f.write(sample_tf)
-    
-    # Parse the file
-    parser = TerraformParser()
-    try:
-        config = parser.parse_file(temp_file)
-        
-        print(f"✓ Successfully parsed {temp_file}")
-        print(f"\nResources found: {len(config['resources'])}")
-        for resource in config['resources']:
-            print(f"  - {resource['full_name']} ({resource['cloud_provider']})")
-        
-        print(f"\nVariables found: {len(config['variables'])}")
-        for var in config['variables']:
-            sensitive_mark = " [SENSITIVE]" if var['sensitive'] else ""
-            print(f"  - {var['name']}: {var['type']}{sensitive_mark}")
-        
-        print(f"\nStatistics:")
-        stats = config['statistics']
-        print(f"  Total resources: {stats['total_resources']}")
-        print(f"  Total variables: {stats['total_variables']}")
-        
-    except TerraformParserError as e:
-        print(f"✗ Parsing failed: {e}")
-    finally:
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-
 
-def example_parse_gcp_resources():
-    """Example: Parse GCP resources"""
-    print_section("Example 2: Parse GCP Infrastructure")
-    
-    sample_tf = """
+SAMPLE_GCP = """
 resource "google_sql_database_instance" "master" {
   name             = "master-instance"
   database_version = "POSTGRES_14"
@@ -149,46 +115,9 @@ provider "google" {
   region  = "us-central1"
 }
 """
-    
-    temp_file = "/tmp/gcp.tf"
-    with open(temp_file, 'w') as f:
-        f.write(sample_tf)
-    
-    parser = TerraformParser()
-    try:
-        config = parser.parse_file(temp_file)
-        
-        print(f"✓ Parsed GCP infrastructure")
-        print(f"\nResources:")
-        for resource in config['resources']:
-            print(f"\n  {resource['full_name']}")
-            print(f"    Type: {resource['resource_type']}")
-            print(f"    Cloud: {resource['cloud_provider']}")
-            print(f"    Properties: {list(resource['properties'].keys())}")
-        
-        print(f"\nProviders:")
-        for provider in config['providers']:
-            print(f"  {provider['name']}")
-            print(f"    Region: {provider.get('region', 'N/A')}")
-            
-    except TerraformParserError as e:
-        print(f"✗ Parsing failed: {e}")
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-
-
-def example_parse_directory():
-    """Example: Parse a directory of Terraform files"""
-    print_section("Example 3: Parse Directory")
-    
-    # Create a temporary directory with multiple files
-    temp_dir = "/tmp/terraform_example"
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # main.tf
-    with open(f"{temp_dir}/main.tf", 'w') as f:
-        f.write("""
+
+SAMPLE_DIRECTORY_FILES = {
+    "main.tf": """
 resource "aws_instance" "web" {
   ami           = "ami-12345"
   instance_type = "t3.micro"
@@ -197,11 +126,8 @@ resource "aws_instance" "web" {
     Name = "Web Server"
   }
 }
-""")
-    
-    # variables.tf
-    with open(f"{temp_dir}/variables.tf", 'w') as f:
-        f.write("""
+""",
+    "variables.tf": """
 variable "region" {
   type    = string
   default = "us-west-2"
@@ -211,11 +137,8 @@ variable "instance_count" {
   type    = number
   default = 1
 }
-""")
-    
-    # providers.tf
-    with open(f"{temp_dir}/providers.tf", 'w') as f:
-        f.write("""
+""",
+    "providers.tf": """
 terraform {
   required_version = ">= 1.0"
 }
@@ -223,40 +146,10 @@ terraform {
 provider "aws" {
   region = var.region
 }
-""")
-    
-    parser = TerraformParser()
-    try:
-        config = parser.parse_directory(temp_dir)
-        
-        print(f"✓ Parsed directory: {temp_dir}")
-        print(f"\nFiles processed: {len(config['source_files'])}")
-        for file in config['source_files']:
-            print(f"  - {os.path.basename(file)}")
-        
-        print(f"\nSummary:")
-        stats = config['statistics']
-        print(f"  Resources: {stats['total_resources']}")
-        print(f"  Variables: {stats['total_variables']}")
-        print(f"  Providers: {stats['total_providers']}")
-        
-        if config.get('terraform_version'):
-            print(f"\nTerraform version required: {config['terraform_version']}")
-        
-    except TerraformParserError as e:
-        print(f"✗ Parsing failed: {e}")
-    finally:
-        # Cleanup
-        import shutil
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-
+""",
+}
 
-def example_multi_cloud():
-    """Example: Parse multi-cloud infrastructure"""
-    print_section("Example 4: Multi-Cloud Infrastructure")
-    
-    sample_tf = """
+SAMPLE_MULTI_CLOUD = """
 # AWS Resources
 resource "aws_s3_bucket" "data" {
   bucket = "data-bucket"
@@ -298,43 +191,8 @@ resource "azurerm_storage_account" "logs" {
   account_replication_type = "LRS"
 }
 """
-    
-    temp_file = "/tmp/multicloud.tf"
-    with open(temp_file, 'w') as f:
-        f.write(sample_tf)
-    
-    parser = TerraformParser()
-    try:
-        config = parser.parse_file(temp_file)
-        
-        print(f"✓ Parsed multi-cloud infrastructure")
-        
-        stats = config['statistics']
-        print(f"\nCloud Provider Distribution:")
-        for provider, count in stats['providers_by_type'].items():
-            print(f"  {provider.upper()}: {count} resources")
-        
-        print(f"\nResources by Type:")
-        resource_types = {}
-        for resource in config['resources']:
-            rt = resource['resource_type'].split('_')[0]
-            resource_types[rt] = resource_types.get(rt, 0) + 1
-        
-        for rt, count in sorted(resource_types.items()):
-            print(f"  {rt}: {count}")
-        
-    except TerraformParserError as e:
-        print(f"✗ Parsing failed: {e}")
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
 
-
-def example_security_analysis():
-    """Example: Identify security issues"""
-    print_section("Example 5: Security Analysis")
-    
-    sample_tf = """
+SAMPLE_SECURITY = """
 # Public S3 bucket (Security Risk!)
 resource "aws_s3_bucket" "public_data" {
   bucket = "public-data-bucket"
@@ -384,81 +242,242 @@ variable "secret_token" {
   type = string
 }
 """
+
+
+@lru_cache(maxsize=128)
+def parse_sample(sample_tf: str) -> Dict[str, Any]:
+    """Parse an inline sample once; repeated runs reuse the result (read-only)"""
+    return _PARSER.parse_string(sample_tf)
+
+
+def print_section(title: str):
+    """Print a formatted section header"""
+    print(f"\n{_BAR}\n {title}\n{_BAR}\n")
+
+
+def write_lines(lines: List[str]):
+    """Write collected output lines with a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def catch_parse_error(func: Callable) -> Callable:
+    """Report parse failures of an example instead of aborting the run"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except TerraformParserError as e:
+            print(f"✗ Parsing failed: {e}")
+    return wrapper
+
+
+def classify_resources(resources: List[Dict[str, Any]]) -> Tuple[list, list, list]:
+    """
+    Split parsed resources into buckets, security groups and databases
     
-    temp_file = "/tmp/security.tf"
-    with open(temp_file, 'w') as f:
-        f.write(sample_tf)
+    Each resource type is classified once, so configurations with many
+    resources of the same type only pay for the substring checks once.
+    """
+    buckets, security_groups, databases = [], [], []
+    categories: Dict[str, Tuple[list, ...]] = {}
     
-    parser = TerraformParser()
-    try:
-        config = parser.parse_file(temp_file)
-        
-        print(f"✓ Analyzing security configuration")
-        
-        # Check for public resources
-        print(f"\n🔍 Security Findings:\n")
-        
-        issues_found = 0
+    for resource in resources:
+        resource_type = resource['resource_type']
+        targets = categories.get(resource_type)
+        if targets is None:
+            targets = []
+            if 'bucket' in resource_type:
+                targets.append(buckets)
+            if 'security_group' in resource_type:
+                targets.append(security_groups)
+            if 'database' in resource_type or 'db_instance' in resource_type:
+                targets.append(databases)
+            targets = categories[resource_type] = tuple(targets)
         
-        # Check S3 buckets
-        for resource in config['resources']:
-            if 'bucket' in resource['resource_type']:
-                if resource['properties'].get('acl') in ['public-read', 'public-read-write']:
-                    issues_found += 1
-                    print(f"  ⚠️  HIGH: {resource['full_name']}")
-                    print(f"      Public S3 bucket with ACL: {resource['properties']['acl']}")
-                    print()
-        
-        # Check security groups
-        for resource in config['resources']:
-            if 'security_group' in resource['resource_type']:
-                ingress_rules = resource['properties'].get('ingress', [])
-                if not isinstance(ingress_rules, list):
-                    ingress_rules = [ingress_rules]
-                
-                for rule in ingress_rules:
-                    if '0.0.0.0/0' in rule.get('cidr_blocks', []):
-                        issues_found += 1
-                        port = rule.get('from_port')
-                        print(f"  ⚠️  HIGH: {resource['full_name']}")
-                        print(f"      Security group allows port {port} from 0.0.0.0/0")
-                        print()
-        
-        # Check databases
-        for resource in config['resources']:
-            if 'database' in resource['resource_type'] or 'db_instance' in resource['resource_type']:
-                if not resource['properties'].get('storage_encrypted', False):
-                    issues_found += 1
-                    print(f"  ⚠️  HIGH: {resource['full_name']}")
-                    print(f"      Database does not have encryption enabled")
-                    print()
-                
-                if resource['properties'].get('publicly_accessible', False):
-                    issues_found += 1
-                    print(f"  ⚠️  CRITICAL: {resource['full_name']}")
-                    print(f"      Database is publicly accessible")
-                    print()
-        
-        # Check sensitive variables
-        print(f"\n🔐 Sensitive Variables:\n")
-        sensitive_patterns = ['password', 'secret', 'token', 'key', 'credential']
-        for var in config['variables']:
-            if any(pattern in var['name'].lower() for pattern in sensitive_patterns):
-                if not var['sensitive']:
-                    issues_found += 1
-                    print(f"  ⚠️  MEDIUM: Variable '{var['name']}'")
-                    print(f"      Should be marked as sensitive = true")
-                    print()
+        for target in targets:
+            target.append(resource)
+    
+    return buckets, security_groups, databases
+
+
+@catch_parse_error
+def example_parse_file():
+    """Example: Parse a single Terraform file"""
+    print_section("Example 1: Parse a Single File")
+    out = []
+    
+    # Parse the configuration in memory
+    config = parse_sample(SAMPLE_SINGLE_FILE)
+    
+    out.append(f"✓ Successfully parsed sample configuration")
+    out.append(f"\nResources found: {len(config['resources'])}")
+    for resource in config['resources']:
+        out.append(f"  - {resource['full_name']} ({resource['cloud_provider']})")
+    
+    out.append(f"\nVariables found: {len(config['variables'])}")
+    for var in config['variables']:
+        sensitive_mark = " [SENSITIVE]" if var['sensitive'] else ""
+        out.append(f"  - {var['name']}: {var['type']}{sensitive_mark}")
+    
+    out.append(f"\nStatistics:")
+    stats = config['statistics']
+    out.append(f"  Total resources: {stats['total_resources']}")
+    out.append(f"  Total variables: {stats['total_variables']}")
+    
+    write_lines(out)
+
+
+@catch_parse_error
+def example_parse_gcp_resources():
+    """Example: Parse GCP resources"""
+    print_section("Example 2: Parse GCP Infrastructure")
+    out = []
+    
+    config = parse_sample(SAMPLE_GCP)
+    
+    out.append(f"✓ Parsed GCP infrastructure")
+    out.append(f"\nResources:")
+    for resource in config['resources']:
+        out.append(f"\n  {resource['full_name']}")
+        out.append(f"    Type: {resource['resource_type']}")
+        out.append(f"    Cloud: {resource['cloud_provider']}")
+        out.append(f"    Properties: {list(resource['properties'].keys())}")
+    
+    out.append(f"\nProviders:")
+    for provider in config['providers']:
+        out.append(f"  {provider['name']}")
+        out.append(f"    Region: {provider.get('region', 'N/A')}")
+    
+    write_lines(out)
+
+
+@catch_parse_error
+def example_parse_directory(temp_dir: Path):
+    """Example: Parse a directory of Terraform files"""
+    print_section("Example 3: Parse Directory")
+    out = []
+    
+    # Populate the temporary directory with multiple files
+    for file_name, content in SAMPLE_DIRECTORY_FILES.items():
+        (temp_dir / file_name).write_text(content)
+    
+    parser = _PARSER
+    config = parser.parse_directory(temp_dir)
+    
+    out.append(f"✓ Parsed directory: {temp_dir}")
+    out.append(f"\nFiles processed: {len(config['source_files'])}")
+    for file in config['source_files']:
+        out.append(f"  - {os.path.basename(file)}")
+    
+    out.append(f"\nSummary:")
+    stats = config['statistics']
+    out.append(f"  Resources: {stats['total_resources']}")
+    out.append(f"  Variables: {stats['total_variables']}")
+    out.append(f"  Providers: {stats['total_providers']}")
+    
+    if config.get('terraform_version'):
+        out.append(f"\nTerraform version required: {config['terraform_version']}")
+    
+    write_lines(out)
+
+
+@catch_parse_error
+def example_multi_cloud():
+    """Example: Parse multi-cloud infrastructure"""
+    print_section("Example 4: Multi-Cloud Infrastructure")
+    out = []
+    
+    config = parse_sample(SAMPLE_MULTI_CLOUD)
+    
+    out.append(f"✓ Parsed multi-cloud infrastructure")
+    
+    stats = config['statistics']
+    out.append(f"\nCloud Provider Distribution:")
+    for provider, count in stats['providers_by_type'].items():
+        out.append(f"  {provider.upper()}: {count} resources")
+    
+    out.append(f"\nResources by Type:")
+    resource_types = Counter(resource['cloud_provider'] for resource in config['resources'])
+    
+    for rt, count in resource_types.most_common():
+        out.append(f"  {rt}: {count}")
+    
+    write_lines(out)
+
+
+@catch_parse_error
+def example_security_analysis():
+    """Example: Identify security issues"""
+    print_section("Example 5: Security Analysis")
+    out = []
+    
+    config = parse_sample(SAMPLE_SECURITY)
+    
+    out.append(f"✓ Analyzing security configuration")
+    
+    # Check for public resources
+    out.append(f"\n🔍 Security Findings:\n")
+    
+    issues_found = 0
+    
+    buckets, security_groups, databases = classify_resources(config['resources'])
+    
+    # Check S3 buckets
+    for resource in buckets:
+        properties = resource['properties']
+        acl = properties.get('acl')
+        if acl in ('public-read', 'public-read-write'):
+            issues_found += 1
+            out.append(f"  ⚠️  HIGH: {resource['full_name']}")
+            out.append(f"      Public S3 bucket with ACL: {acl}")
+            out.append("")
+    
+    # Check security groups
+    for resource in security_groups:
+        full_name = resource['full_name']
+        ingress_rules = resource['properties'].get('ingress', [])
+        if not isinstance(ingress_rules, list):
+            ingress_rules = [ingress_rules]
         
-        print(f"\n{'=' * 80}")
-        print(f"Total security issues found: {issues_found}")
-        print(f"{'=' * 80}\n")
+        for rule in ingress_rules:
+            if '0.0.0.0/0' in rule.get('cidr_blocks', []):
+                issues_found += 1
+                port = rule.get('from_port')
+                out.append(f"  ⚠️  HIGH: {full_name}")
+                out.append(f"      Security group allows port {port} from 0.0.0.0/0")
+                out.append("")
+    
+    # Check databases
+    for resource in databases:
+        properties = resource['properties']
+        full_name = resource['full_name']
+        if not properties.get('storage_encrypted', False):
+            issues_found += 1
+            out.append(f"  ⚠️  HIGH: {full_name}")
+            out.append(f"      Database does not have encryption enabled")
+            out.append("")
         
-    except TerraformParserError as e:
-        print(f"✗ Parsing failed: {e}")
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        if properties.get('publicly_accessible', False):
+            issues_found += 1
+            out.append(f"  ⚠️  CRITICAL: {full_name}")
+            out.append(f"      Database is publicly accessible")
+            out.append("")
+    
+    # Check sensitive variables
+    out.append(f"\n🔐 Sensitive Variables:\n")
+    for var in config['variables']:
+        if _SENSITIVE_RE.search(var['name']):
+            if not var['sensitive']:
+                issues_found += 1
+                out.append(f"  ⚠️  MEDIUM: Variable '{var['name']}'")
+                out.append(f"      Should be marked as sensitive = true")
+                out.append("")
+    
+    out.append(f"\n{_BAR}")
+    out.append(f"Total security issues found: {issues_found}")
+    out.append(f"{_BAR}\n")
+    
+    write_lines(out)
 
 
 def main():
@@ -474,18 +493,21 @@ def main():
     try:
         example_parse_file()
         example_parse_gcp_resources()
-        example_parse_directory()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            example_parse_directory(Path(temp_dir))
         example_multi_cloud()
         example_security_analysis()
         
         print_section("Summary")
-        print("✓ All examples completed successfully!")
-        print("\nFor more information, see:")
-        print("  - parsers/README.md - Full documentation")
-        print("  - tests/test_terraform_parser.py - Unit tests")
-        print("  - models/terraform.py - Data models")
-        print()
-        
+        write_lines([
+            "✓ All examples completed successfully!",
+            "\nFor more information, see:",
+            "  - parsers/README.md - Full documentation",
+            "  - tests/test_terraform_parser.py - Unit tests",
+            "  - models/terraform.py - Data models",
+            "",
+        ])
+    
     except Exception as e:
         print(f"\n✗ Error running examples: {e}")
         import traceback
@@ -4,9 +4,20 @@ Parse Terraform HCL2 configurations and extract security-relevant information
 """
 
 import os
+import re
 import json
+import atexit
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import multiprocessing
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import replace
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import hcl2
 import lark
@@ -18,12 +29,117 @@ from models.terraform import (
 
 logger = logging.getLogger(__name__)
 
+# Terraform meta-arguments stripped from extracted properties
+_META_ARGS = frozenset({
+    'depends_on', 'provider', 'lifecycle', 'provisioner', 'connection', 'count', 'for_each'
+})
+
+# Flat subset of HCL2 handled without the full grammar: top-level blocks
+# whose bodies only hold `name = literal` attributes (no nesting, lists,
+# maps, references, interpolation, heredocs or comments)
+_FAST_LABEL_COUNTS = {'resource': 2, 'data': 2, 'variable': 1, 'output': 1, 'provider': 1}
+_FAST_BLOCK_RE = re.compile(
+    r'\s*(resource|data|variable|output|provider)((?:[ \t]+"[A-Za-z0-9_-]+")+)[ \t]*\{([^{}]*)\}'
+)
+_FAST_LABEL_RE = re.compile(r'"([A-Za-z0-9_-]+)"')
+_FAST_ATTR_RE = re.compile(r'[ \t]*([A-Za-z_][A-Za-z0-9_-]*)[ \t]*=[ \t]*("[^"\\$%\n]*"|\d+|true|false)[ \t]*')
+_FAST_UNSUPPORTED = ('#', '//', '/*', '<<')
+
+# Parsed configurations keyed by (content digest, location); unchanged
+# files are not parsed again within the process
+_PARSE_CACHE_SIZE = 256
+_parse_cache: "OrderedDict[Tuple[bytes, str], TerraformConfiguration]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+# Worker processes for large directories, started on first use and reused
+# by every later parse_directory call in the process
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
 
 class TerraformParserError(Exception):
     """Custom exception for Terraform parsing errors"""
     pass
 
 
+def _read_source(file_path: Path) -> str:
+    """
+    Read a whole source file with one read call sized from fstat
+    
+    Bypasses the io buffering layers; newlines are normalized the same way
+    text-mode open() does.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    
+    content = data.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _fast_literal(token: str) -> Any:
+    """Convert a literal matched by _FAST_ATTR_RE the way hcl2 does"""
+    if token[0] == '"':
+        return token[1:-1]
+    if token == 'true':
+        return True
+    if token == 'false':
+        return False
+    return int(token)
+
+
+def _try_fast_parse(content: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Parse the flat HCL2 subset without the Lark grammar
+    
+    Returns the same structure as hcl2.loads, or None when the content
+    uses anything outside the subset and needs the full parser.
+    """
+    if any(marker in content for marker in _FAST_UNSUPPORTED):
+        return None
+    
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    pos = 0
+    end = len(content.rstrip())
+    
+    while pos < end:
+        block = _FAST_BLOCK_RE.match(content, pos)
+        if block is None:
+            return None
+        
+        block_type, raw_labels, body = block.groups()
+        labels = _FAST_LABEL_RE.findall(raw_labels)
+        if len(labels) != _FAST_LABEL_COUNTS[block_type]:
+            return None
+        
+        attributes = {}
+        for line in body.split('\n'):
+            if not line.strip():
+                continue
+            attr = _FAST_ATTR_RE.fullmatch(line)
+            if attr is None or attr.group(1) in attributes:
+                return None
+            attributes[attr.group(1)] = _fast_literal(attr.group(2))
+        
+        entry: Any = attributes
+        for label in reversed(labels):
+            entry = {label: entry}
+        result.setdefault(block_type, []).append(entry)
+        pos = block.end()
+    
+    return result
+
+
 class TerraformParser:
     """
     Parse Terraform HCL2 configurations for threat modeling
@@ -36,6 +152,15 @@ class TerraformParser:
     - Module references
     """
     
+    # Directories with more uncached files than this are parsed on the
+    # shared process pool; below it, shipping sources to worker processes
+    # costs more than parsing them here
+    PARALLEL_FILE_THRESHOLD = 32
+    PARALLEL_CHUNKSIZE = 4
+    
+    # Reader threads used to prefetch file contents when parsing serially
+    PREFETCH_WORKERS = 4
+    
     def __init__(self):
         """Initialize the Terraform parser"""
         self.logger = logging.getLogger(__name__)
@@ -54,6 +179,29 @@ class TerraformParser:
         Raises:
             TerraformParserError: If parsing fails
         """
+        return self.parse_file_config(file_path).to_dict()
+    
+    def parse_file_config(self, file_path: str) -> TerraformConfiguration:
+        """
+        Parse a single Terraform file into a configuration object
+        
+        Same as parse_file but skips the dictionary conversion, for callers
+        that work with the models directly and serialize only at the edge.
+        
+        Args:
+            file_path: Path to the .tf file
+            
+        Returns:
+            TerraformConfiguration for the file
+            
+        Raises:
+            TerraformParserError: If parsing fails
+        """
+        file_path, content = self._load_source(file_path)
+        return self._parse_to_config(content, str(file_path))
+    
+    def _load_source(self, file_path: str) -> Tuple[Path, str]:
+        """Validate and read a single Terraform file"""
         file_path = Path(file_path).resolve()
         
         if not file_path.exists():
@@ -68,42 +216,110 @@ class TerraformParser:
         self.logger.info(f"Parsing file: {file_path}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = _read_source(file_path)
+        except (OSError, UnicodeError) as e:
+            raise TerraformParserError(f"Error parsing {file_path}: {str(e)}")
+        
+        return file_path, content
+    
+    def parse_string(self, content: str, source_name: str = '<string>') -> Dict[str, Any]:
+        """
+        Parse Terraform HCL2 content held in memory
+        
+        Args:
+            content: HCL2 source text
+            source_name: Name recorded as the location of extracted blocks
             
-            # Parse HCL2 content
-            hcl_dict = hcl2.loads(content)
+        Returns:
+            Dictionary containing parsed configuration
+            
+        Raises:
+            TerraformParserError: If parsing fails
+        """
+        self.logger.info(f"Parsing string: {source_name}")
+        return self._parse_to_config(content, source_name).to_dict()
+    
+    def _parse_to_config(self, content: str, location: str) -> TerraformConfiguration:
+        """Parse HCL2 source text, reusing the result for unchanged content"""
+        key = _parse_cache_key(content, location)
+        
+        cached = _parse_cache_get(key)
+        if cached is not None:
+            self.logger.debug(f"Parse cache hit: {location}")
+            return cached
+        
+        config = self._build_config(content, location)
+        _parse_cache_put(key, config)
+        return config
+    
+    def _build_config(self, content: str, location: str) -> TerraformConfiguration:
+        """Parse HCL2 source text and extract all configuration components"""
+        try:
+            # Parse HCL2 content, trying the flat-subset fast path first
+            hcl_dict = _try_fast_parse(content)
+            if hcl_dict is None:
+                hcl_dict = hcl2.loads(content)
             
             # Create configuration object
-            config = TerraformConfiguration(source_files=[str(file_path)])
+            config = TerraformConfiguration(source_files=[location])
             
             # Extract all components
-            config.resources = self.extract_resources(hcl_dict, str(file_path))
-            config.data_sources = self.extract_data_sources(hcl_dict, str(file_path))
-            config.variables = self.extract_variables(hcl_dict, str(file_path))
-            config.outputs = self.extract_outputs(hcl_dict, str(file_path))
-            config.providers = self.extract_providers(hcl_dict, str(file_path))
-            config.modules = self.extract_modules(hcl_dict, str(file_path))
+            config.resources = self.extract_resources(hcl_dict, location)
+            config.data_sources = self.extract_data_sources(hcl_dict, location)
+            config.variables = self.extract_variables(hcl_dict, location)
+            config.outputs = self.extract_outputs(hcl_dict, location)
+            config.providers = self.extract_providers(hcl_dict, location)
+            config.modules = self.extract_modules(hcl_dict, location)
             config.terraform_version = self.extract_terraform_version(hcl_dict)
             config.backend_config = self.extract_backend_config(hcl_dict)
             
-            return config.to_dict()
+            return config
             
         except lark.exceptions.LarkError as e:
-            raise TerraformParserError(f"HCL2 parsing error in {file_path}: {str(e)}")
+            raise TerraformParserError(f"HCL2 parsing error in {location}: {str(e)}")
         except Exception as e:
-            raise TerraformParserError(f"Error parsing {file_path}: {str(e)}")
+            raise TerraformParserError(f"Error parsing {location}: {str(e)}")
     
-    def parse_directory(self, dir_path: str) -> Dict[str, Any]:
+    def parse_directory(
+        self, dir_path: str, parallel: bool = True, recursive: bool = False
+    ) -> Dict[str, Any]:
         """
         Parse all Terraform files in a directory
         
         Args:
             dir_path: Path to directory containing .tf files
+            parallel: Parse files on the shared process pool when more than
+                PARALLEL_FILE_THRESHOLD of them are not in the parse cache
+            recursive: Also parse files in subdirectories (e.g. local modules),
+                skipping hidden directories such as .terraform
             
         Returns:
             Dictionary containing merged configuration from all files
             
+        Raises:
+            TerraformParserError: If parsing fails
+        """
+        return self.parse_directory_config(dir_path, parallel, recursive).to_dict()
+    
+    def parse_directory_config(
+        self, dir_path: str, parallel: bool = True, recursive: bool = False
+    ) -> TerraformConfiguration:
+        """
+        Parse all Terraform files in a directory into one configuration object
+        
+        Same as parse_directory but skips the dictionary conversion. Files
+        that fail to parse are skipped and listed in parsing_errors.
+        
+        Args:
+            dir_path: Path to directory containing .tf files
+            parallel: Parse files on the shared process pool when more than
+                PARALLEL_FILE_THRESHOLD of them are not in the parse cache
+            recursive: Also parse files in subdirectories (e.g. local modules),
+                skipping hidden directories such as .terraform
+            
+        Returns:
+            TerraformConfiguration merged from all files
+            
         Raises:
             TerraformParserError: If parsing fails
         """
@@ -117,73 +333,161 @@ class TerraformParser:
         
         self.logger.info(f"Parsing directory: {dir_path}")
         
-        # Find all .tf files
-        tf_files = []
-        for ext in self.supported_extensions:
-            tf_files.extend(dir_path.glob(f"*{ext}"))
+        # Find all .tf files in a single directory scan
+        extensions = tuple(self.supported_extensions)
+        if recursive:
+            tf_files = []
+            for root, dirs, files in os.walk(dir_path):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                tf_files.extend(
+                    os.path.join(root, name) for name in files if name.endswith(extensions)
+                )
+        else:
+            with os.scandir(dir_path) as entries:
+                tf_files = [
+                    entry.path for entry in entries
+                    if entry.name.endswith(extensions) and entry.is_file()
+                ]
         
         if not tf_files:
             self.logger.warning(f"No Terraform files found in {dir_path}")
-            return TerraformConfiguration().to_dict()
+            return TerraformConfiguration()
         
         self.logger.info(f"Found {len(tf_files)} Terraform files")
         
-        # Parse all files and merge configurations
-        merged_config = TerraformConfiguration()
-        errors = []
-        
-        for tf_file in sorted(tf_files):
+        # A single file needs no pool or merge step
+        if len(tf_files) == 1:
             try:
-                file_config = self.parse_file(str(tf_file))
-                
-                # Merge configurations
-                merged_config.resources.extend(
-                    [self._dict_to_resource(r) for r in file_config['resources']]
-                )
-                merged_config.data_sources.extend(
-                    [self._dict_to_data_source(d) for d in file_config['data_sources']]
-                )
-                merged_config.variables.extend(
-                    [self._dict_to_variable(v) for v in file_config['variables']]
-                )
-                merged_config.outputs.extend(
-                    [self._dict_to_output(o) for o in file_config['outputs']]
-                )
-                merged_config.providers.extend(
-                    [self._dict_to_provider(p) for p in file_config['providers']]
-                )
-                merged_config.modules.extend(
-                    [self._dict_to_module(m) for m in file_config['modules']]
-                )
-                merged_config.source_files.append(str(tf_file))
-                
-                # Use first terraform version found
-                if not merged_config.terraform_version and file_config.get('terraform_version'):
-                    merged_config.terraform_version = file_config['terraform_version']
-                
-                # Use first backend config found
-                if not merged_config.backend_config and file_config.get('backend_config'):
-                    merged_config.backend_config = file_config['backend_config']
-                    
+                return self.parse_file_config(tf_files[0])
             except TerraformParserError as e:
-                error_msg = f"Error parsing {tf_file.name}: {str(e)}"
+                error_msg = f"Error parsing {os.path.basename(tf_files[0])}: {str(e)}"
+                self.logger.error(error_msg)
+                return TerraformConfiguration(parsing_errors=[error_msg])
+        
+        # Parse all files, spreading larger directories across CPU cores
+        tf_files = sorted(tf_files)
+        if parallel and len(tf_files) > self.PARALLEL_FILE_THRESHOLD:
+            outcomes = self._parse_files_pooled(tf_files)
+        else:
+            outcomes = self._parse_files_prefetched(tf_files)
+        
+        # Merge configurations in file order
+        merged_config = TerraformConfiguration()
+        errors = merged_config.parsing_errors
+        
+        for tf_file, (file_config, error) in zip(tf_files, outcomes):
+            if error is not None:
+                error_msg = f"Error parsing {os.path.basename(tf_file)}: {str(error)}"
                 self.logger.error(error_msg)
                 errors.append(error_msg)
+                continue
+            
+            merged_config.resources.extend(file_config.resources)
+            merged_config.data_sources.extend(file_config.data_sources)
+            merged_config.variables.extend(file_config.variables)
+            merged_config.outputs.extend(file_config.outputs)
+            merged_config.providers.extend(file_config.providers)
+            merged_config.modules.extend(file_config.modules)
+            merged_config.source_files.append(tf_file)
+            
+            # Use first terraform version found
+            if not merged_config.terraform_version and file_config.terraform_version:
+                merged_config.terraform_version = file_config.terraform_version
+            
+            # Use first backend config found
+            if not merged_config.backend_config and file_config.backend_config:
+                merged_config.backend_config = file_config.backend_config
         
-        result = merged_config.to_dict()
-        if errors:
-            result['parsing_errors'] = errors
+        return merged_config
+    
+    def _try_load_source(
+        self, tf_file: str
+    ) -> Tuple[Optional[Tuple[Path, str]], Optional[TerraformParserError]]:
+        """Load a file, returning the error instead of raising it"""
+        try:
+            return self._load_source(tf_file), None
+        except TerraformParserError as e:
+            return None, e
+    
+    def _parse_files_pooled(
+        self, tf_files: List[str]
+    ) -> List[Tuple[Optional[TerraformConfiguration], Optional[TerraformParserError]]]:
+        """
+        Parse files on the shared process pool, serving unchanged files from
+        the parse cache
         
-        return result
+        Sources are read and looked up here; only cache misses are sent to
+        the workers, and their results are stored in this process's cache.
+        Few misses are parsed in-process instead.
+        """
+        with ThreadPoolExecutor(max_workers=self.PREFETCH_WORKERS) as executor:
+            loaded = list(executor.map(self._try_load_source, tf_files))
+        
+        outcomes = []
+        misses = []
+        for source, error in loaded:
+            if error is None:
+                file_path, content = source
+                location = str(file_path)
+                key = _parse_cache_key(content, location)
+                cached = _parse_cache_get(key)
+                if cached is None:
+                    misses.append((len(outcomes), key, content, location))
+                outcomes.append((cached, None))
+            else:
+                outcomes.append((None, error))
+        
+        results = None
+        if len(misses) > self.PARALLEL_FILE_THRESHOLD:
+            try:
+                results = list(_get_process_pool().map(
+                    _parse_source_outcome,
+                    [content for _, _, content, _ in misses],
+                    [location for _, _, _, location in misses],
+                    chunksize=self.PARALLEL_CHUNKSIZE
+                ))
+            except BrokenProcessPool as e:
+                # A worker died; drop the pool so the next call starts a new one
+                self.logger.warning(f"Parse process pool failed, parsing in-process: {e}")
+                _discard_process_pool()
+        
+        if results is None:
+            results = (
+                _parse_source_outcome(content, location) for _, _, content, location in misses
+            )
+        
+        for (index, key, _, _), (config, error) in zip(misses, results):
+            if error is None:
+                _parse_cache_put(key, config)
+            outcomes[index] = (config, error)
+        
+        return outcomes
+    
+    def _parse_files_prefetched(
+        self, tf_files: List[str]
+    ) -> List[Tuple[Optional[TerraformConfiguration], Optional[TerraformParserError]]]:
+        """Parse files in order on this thread while reader threads load ahead"""
+        outcomes = []
+        with ThreadPoolExecutor(max_workers=self.PREFETCH_WORKERS) as executor:
+            for source, error in executor.map(self._try_load_source, tf_files):
+                if error is None:
+                    file_path, content = source
+                    try:
+                        outcomes.append((self._parse_to_config(content, str(file_path)), None))
+                        continue
+                    except TerraformParserError as e:
+                        error = e
+                outcomes.append((None, error))
+        
+        return outcomes
     
     def extract_resources(self, hcl_dict: Dict, location: str = None) -> List[Resource]:
         """Extract resource blocks from HCL AST"""
-        resources = []
-        
-        resource_blocks = hcl_dict.get('resource', [])
+        resource_blocks = hcl_dict.get('resource')
         if not resource_blocks:
-            return resources
+            return []
         
+        resources = []
         for resource_block in resource_blocks:
             for resource_type, resource_configs in resource_block.items():
                 for resource_name, properties in resource_configs.items():
@@ -205,17 +509,17 @@ class TerraformParser:
                     )
                     resources.append(resource)
         
-        self.logger.debug(f"Extracted {len(resources)} resources")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Extracted {len(resources)} resources")
         return resources
     
     def extract_data_sources(self, hcl_dict: Dict, location: str = None) -> List[DataSource]:
         """Extract data source blocks from HCL AST"""
-        data_sources = []
-        
-        data_blocks = hcl_dict.get('data', [])
+        data_blocks = hcl_dict.get('data')
         if not data_blocks:
-            return data_sources
+            return []
         
+        data_sources = []
         for data_block in data_blocks:
             for data_type, data_configs in data_block.items():
                 for data_name, properties in data_configs.items():
@@ -230,17 +534,17 @@ class TerraformParser:
                     )
                     data_sources.append(data_source)
         
-        self.logger.debug(f"Extracted {len(data_sources)} data sources")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Extracted {len(data_sources)} data sources")
         return data_sources
     
     def extract_variables(self, hcl_dict: Dict, location: str = None) -> List[Variable]:
         """Extract variable definitions from HCL AST"""
-        variables = []
-        
-        variable_blocks = hcl_dict.get('variable', [])
+        variable_blocks = hcl_dict.get('variable')
         if not variable_blocks:
-            return variables
+            return []
         
+        variables = []
         for variable_block in variable_blocks:
             for var_name, var_config in variable_block.items():
                 # Extract validation rules if present
@@ -262,17 +566,17 @@ class TerraformParser:
                 )
                 variables.append(variable)
         
-        self.logger.debug(f"Extracted {len(variables)} variables")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Extracted {len(variables)} variables")
         return variables
     
     def extract_outputs(self, hcl_dict: Dict, location: str = None) -> List[Output]:
         """Extract output definitions from HCL AST"""
-        outputs = []
-        
-        output_blocks = hcl_dict.get('output', [])
+        output_blocks = hcl_dict.get('output')
         if not output_blocks:
-            return outputs
+            return []
         
+        outputs = []
         for output_block in output_blocks:
             for output_name, output_config in output_block.items():
                 output = Output(
@@ -284,17 +588,17 @@ class TerraformParser:
                 )
                 outputs.append(output)
         
-        self.logger.debug(f"Extracted {len(outputs)} outputs")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Extracted {len(outputs)} outputs")
         return outputs
     
     def extract_providers(self, hcl_dict: Dict, location: str = None) -> List[Provider]:
         """Extract provider configurations from HCL AST"""
-        providers = []
-        
-        provider_blocks = hcl_dict.get('provider', [])
+        provider_blocks = hcl_dict.get('provider')
         if not provider_blocks:
-            return providers
+            return []
         
+        providers = []
         for provider_block in provider_blocks:
             for provider_name, provider_configs in provider_block.items():
                 # Handle both single and multiple provider configs
@@ -312,17 +616,17 @@ class TerraformParser:
                     )
                     providers.append(provider)
         
-        self.logger.debug(f"Extracted {len(providers)} providers")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Extracted {len(providers)} providers")
         return providers
     
     def extract_modules(self, hcl_dict: Dict, location: str = None) -> List[Module]:
         """Extract module references from HCL AST"""
-        modules = []
-        
-        module_blocks = hcl_dict.get('module', [])
+        module_blocks = hcl_dict.get('module')
         if not module_blocks:
-            return modules
+            return []
         
+        modules = []
         for module_block in module_blocks:
             for module_name, module_config in module_block.items():
                 # Separate source/version from inputs
@@ -344,7 +648,8 @@ class TerraformParser:
                 )
                 modules.append(module)
         
-        self.logger.debug(f"Extracted {len(modules)} modules")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Extracted {len(modules)} modules")
         return modules
     
     def extract_terraform_version(self, hcl_dict: Dict) -> Optional[str]:
@@ -376,83 +681,128 @@ class TerraformParser:
     def _sanitize_properties(self, properties: Dict) -> Dict:
         """
         Remove meta-arguments and sanitize properties for JSON serialization
+        
+        Walks nested blocks with an explicit stack instead of recursion.
+        Nested dicts without meta-arguments or containers are reused as-is.
         """
-        meta_args = {'depends_on', 'provider', 'lifecycle', 'provisioner', 'connection', 'count', 'for_each'}
         sanitized = {}
+        stack = [(properties, sanitized)]
         
-        for key, value in properties.items():
-            if key not in meta_args:
-                # Handle nested structures
-                if isinstance(value, dict):
-                    sanitized[key] = self._sanitize_properties(value)
-                elif isinstance(value, list):
-                    sanitized[key] = [
-                        self._sanitize_properties(item) if isinstance(item, dict) else item
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if key in _META_ARGS:
+                    continue
+                
+                value_type = type(value)
+                if value_type is dict:
+                    target[key] = self._sanitize_child(value, stack)
+                elif value_type is list:
+                    target[key] = [
+                        self._sanitize_child(item, stack) if type(item) is dict else item
                         for item in value
                     ]
                 else:
-                    sanitized[key] = value
+                    target[key] = value
         
         return sanitized
     
-    # Helper methods to convert dicts back to dataclass instances
-    def _dict_to_resource(self, d: Dict) -> Resource:
-        return Resource(
-            resource_type=d['resource_type'],
-            name=d['name'],
-            properties=d['properties'],
-            location=d.get('location'),
-            depends_on=d.get('depends_on', []),
-            provider=d.get('provider')
-        )
-    
-    def _dict_to_data_source(self, d: Dict) -> DataSource:
-        return DataSource(
-            data_type=d['data_type'],
-            name=d['name'],
-            properties=d['properties'],
-            location=d.get('location'),
-            provider=d.get('provider')
-        )
-    
-    def _dict_to_variable(self, d: Dict) -> Variable:
-        return Variable(
-            name=d['name'],
-            type=d.get('type'),
-            default=d.get('default'),
-            description=d.get('description'),
-            sensitive=d.get('sensitive', False),
-            validation_rules=d.get('validation_rules', []),
-            location=d.get('location')
-        )
-    
-    def _dict_to_output(self, d: Dict) -> Output:
-        return Output(
-            name=d['name'],
-            value=d['value'],
-            description=d.get('description'),
-            sensitive=d.get('sensitive', False),
-            location=d.get('location')
-        )
-    
-    def _dict_to_provider(self, d: Dict) -> Provider:
-        return Provider(
-            name=d['name'],
-            alias=d.get('alias'),
-            version=d.get('version'),
-            region=d.get('region'),
-            configuration=d.get('configuration', {}),
-            location=d.get('location')
-        )
-    
-    def _dict_to_module(self, d: Dict) -> Module:
-        return Module(
-            name=d['name'],
-            source=d['source'],
-            version=d.get('version'),
-            inputs=d.get('inputs', {}),
-            location=d.get('location')
-        )
+    def _sanitize_child(self, value: Dict, stack: List[Tuple[Dict, Dict]]) -> Dict:
+        """Reuse a flat block without meta-arguments, or queue a copy for sanitizing"""
+        if _META_ARGS.isdisjoint(value) and not any(
+            type(v) is dict or type(v) is list for v in value.values()
+        ):
+            return value
+        
+        child = {}
+        stack.append((value, child))
+        return child
+
+
+def _copy_config(config: TerraformConfiguration) -> TerraformConfiguration:
+    """
+    Deep-copy a configuration so cached entries are never shared mutably
+    
+    The models are frozen, but their properties, configuration and inputs
+    dicts are not (and may still be hcl2's own nested dicts), and to_dict()
+    hands them out as-is. Copying on both store and hit keeps callers that
+    edit a result from changing what later parses return.
+    """
+    return replace(deepcopy(config), parsed_at=datetime.now(timezone.utc))
+
+
+def _parse_cache_key(content: str, location: str) -> Tuple[bytes, str]:
+    """Parse cache key: digest of the source text plus its location"""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest(), location
+
+
+def _parse_cache_get(key: Tuple[bytes, str]) -> Optional[TerraformConfiguration]:
+    """Look up a parsed configuration, returning a private copy"""
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is None:
+            return None
+        _parse_cache.move_to_end(key)
+    
+    return _copy_config(cached)
+
+
+def _parse_cache_put(key: Tuple[bytes, str], config: TerraformConfiguration):
+    """Store a private copy of a parsed configuration"""
+    cached = _copy_config(config)
+    
+    with _parse_cache_lock:
+        _parse_cache[key] = cached
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared parsing process pool, starting it on first use"""
+    global _process_pool
+    
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Not fork: the pool is started from request threads, and a child
+            # forked while another thread holds a lock (logging, the parse
+            # cache) would inherit it locked and deadlock
+            start_method = (
+                'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                else 'spawn'
+            )
+            _process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+        return _process_pool
+
+
+def _discard_process_pool():
+    """
+    Shut down the shared process pool
+    
+    Used when the pool breaks, so the next use starts a fresh one, and at
+    interpreter exit.
+    """
+    global _process_pool
+    
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+
+
+atexit.register(_discard_process_pool)
+
+
+def _parse_source_outcome(
+    content: str, location: str
+) -> Tuple[Optional[TerraformConfiguration], Optional[TerraformParserError]]:
+    """Parse source text, returning the error instead of raising it (pool worker)"""
+    try:
+        return TerraformParser()._build_config(content, location), None
+    except TerraformParserError as e:
+        return None, e
 
 
 def parse_terraform_file(file_path: str) -> Dict[str, Any]:
@@ -469,15 +819,19 @@ def parse_terraform_file(file_path: str) -> Dict[str, Any]:
     return parser.parse_file(file_path)
 
 
-def parse_terraform_directory(dir_path: str) -> Dict[str, Any]:
+def parse_terraform_directory(
+    dir_path: str, parallel: bool = True, recursive: bool = False
+) -> Dict[str, Any]:
     """
     Convenience function to parse a directory of Terraform files
     
     Args:
         dir_path: Path to directory containing .tf files
+        parallel: Parse larger directories on a process pool
+        recursive: Also parse files in subdirectories
         
     Returns:
         Merged configuration as dictionary
     """
     parser = TerraformParser()
-    return parser.parse_directory(dir_path)
+    return parser.parse_directory(dir_path, parallel=parallel, recursive=recursive)
@@ -0,0 +1,133 @@
+"""
+Test Fakes
+
+Lightweight stand-ins for the Anthropic and OpenAI SDK clients. They expose
+the same call shape LLMClient uses (client.messages.create and
+client.chat.completions.create) with plain methods and SimpleNamespace
+responses, so tests avoid building Mock attribute chains.
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _split(text: str) -> List[str]:
+    """Split text into word-sized stream chunks that join back to it"""
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + words[-1:]
+
+
+class FakeAnthropic:
+    """Fake Anthropic client returning a fixed message"""
+    
+    def __init__(
+        self,
+        text: str = "",
+        input_tokens: int = 100,
+        output_tokens: int = 50,
+        error: Optional[Exception] = None
+    ):
+        """
+        Initialize fake client
+        
+        Args:
+            text: Text of every returned message
+            input_tokens: Reported prompt token usage
+            output_tokens: Reported completion token usage
+            error: Exception raised by every call instead of responding
+        """
+        self.text = text
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.error = error
+        self.calls: List[Dict[str, Any]] = []
+        self.messages = SimpleNamespace(
+            create=self.messages_create,
+            stream=self.messages_stream
+        )
+    
+    def messages_create(self, **kwargs) -> SimpleNamespace:
+        """Record the call and return a Messages API shaped response"""
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        
+        return self._message()
+    
+    @contextmanager
+    def messages_stream(self, **kwargs) -> Iterator[SimpleNamespace]:
+        """Record the call and open a MessageStream shaped context"""
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        
+        yield SimpleNamespace(
+            text_stream=iter(_split(self.text)),
+            get_final_message=self._message
+        )
+    
+    def _message(self) -> SimpleNamespace:
+        """Build the complete message"""
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=self.text)],
+            usage=SimpleNamespace(
+                input_tokens=self.input_tokens,
+                output_tokens=self.output_tokens
+            )
+        )
+
+
+class FakeOpenAI:
+    """Fake OpenAI client returning a fixed chat completion"""
+    
+    def __init__(
+        self,
+        content: str = "",
+        total_tokens: int = 150,
+        error: Optional[Exception] = None
+    ):
+        """
+        Initialize fake client
+        
+        Args:
+            content: Content of every returned completion
+            total_tokens: Reported total token usage
+            error: Exception raised by every call instead of responding
+        """
+        self.content = content
+        self.total_tokens = total_tokens
+        self.error = error
+        self.calls: List[Dict[str, Any]] = []
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self.chat_completions_create)
+        )
+    
+    def chat_completions_create(self, **kwargs) -> Any:
+        """
+        Record the call and return a Chat Completions shaped response, or
+        an iterator of chunks when stream=True
+        """
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        
+        if kwargs.get('stream'):
+            return self._chunks()
+        
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(total_tokens=self.total_tokens)
+        )
+    
+    def _chunks(self) -> Iterator[SimpleNamespace]:
+        """Yield content deltas, then a usage-only chunk"""
+        for text in _split(self.content):
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text))],
+                usage=None
+            )
+        yield SimpleNamespace(
+            choices=[],
+            usage=SimpleNamespace(total_tokens=self.total_tokens)
+        )
@@ -4,15 +4,55 @@ Tests for DFD Generator
 Comprehensive unit tests for DFD generation, Mermaid export, and trust boundaries.
 """
 
+import json
 import pytest
+from collections import defaultdict, namedtuple
+from dataclasses import FrozenInstanceError, replace
+from functools import lru_cache
+from pathlib import Path
 from models.dfd import (
     DFD, DFDNode, DFDEdge, NodeType, TrustBoundary, 
-    DataClassification, TrustBoundaryGroup
+    DataClassification, TrustBoundaryGroup, DFDGenerationResult
 )
-from dfd.dfd_generator import DFDGenerator
+from dfd.dfd_generator import DFDGenerator, ResourceRecord
 from dfd.mermaid_exporter import MermaidExporter, export_multi_level_mermaid
 
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str):
+    """Load a JSON fixture from tests/fixtures, parsing each file once"""
+    return json.loads((FIXTURES_DIR / f"{name}.json").read_text())
+
+
+# Lookup tables over a DFD's nodes: by NodeType and by lowercased id
+NodeIndex = namedtuple('NodeIndex', ['by_type', 'by_lower_id'])
+
+
+def index_nodes(dfd: DFD) -> NodeIndex:
+    """Index a DFD's nodes in a single pass"""
+    by_type = defaultdict(list)
+    by_lower_id = {}
+    for node in dfd.nodes:
+        by_type[node.type].append(node)
+        by_lower_id[node.id.lower()] = node
+    return NodeIndex(by_type, by_lower_id)
+
+
+@pytest.fixture(scope="session")
+def generator():
+    """Shared DFD generator"""
+    return DFDGenerator()
+
+
+@pytest.fixture(scope="session")
+def exporter():
+    """Shared Mermaid exporter"""
+    return MermaidExporter()
+
+
 class TestDFDModels:
     """Test DFD data models"""
     
@@ -63,7 +103,7 @@ class TestDFDModels:
         """Test DFD node lookup"""
         dfd = DFD(level="service")
         node = DFDNode(id="test_node", label="Test", type=NodeType.SERVICE)
-        dfd.nodes.append(node)
+        dfd.add_node(node)
         
         found = dfd.get_node_by_id("test_node")
         assert found is not None
@@ -72,6 +112,42 @@ class TestDFDModels:
         not_found = dfd.get_node_by_id("nonexistent")
         assert not_found is None
     
+    def test_nodes_and_edges_are_hashable_values(self):
+        """Test DFD nodes and edges are immutable and hashable"""
+        node = DFDNode(id="api", label="API", type=NodeType.API)
+        edge = DFDEdge(source="api", target="db", label="queries")
+        
+        with pytest.raises(FrozenInstanceError):
+            node.label = "Other"
+        
+        assert node in {DFDNode(id="api", label="API", type=NodeType.API)}
+        assert edge in {DFDEdge(source="api", target="db", label="queries")}
+        assert replace(edge, target="cache") != edge
+    
+    def test_dfd_add_edge_dedupe(self):
+        """Test duplicate edges are skipped when requested"""
+        dfd = DFD(level="code")
+        edge = DFDEdge(source="handler", target="db", label="query")
+        
+        assert dfd.add_edge(edge, dedupe=True)
+        assert not dfd.add_edge(DFDEdge(source="handler", target="db", label="query"), dedupe=True)
+        assert dfd.add_edge(DFDEdge(source="handler", target="db", label="write"), dedupe=True)
+        assert len(dfd.edges) == 2
+        assert dfd.has_edge(edge)
+    
+    def test_dfd_node_index_tracks_list_changes(self):
+        """Test node lookup after direct edits to the nodes list"""
+        dfd = DFD(level="service")
+        dfd.add_node(DFDNode(id="first", label="First", type=NodeType.SERVICE))
+        assert dfd.get_node_by_id("first") is not None
+        
+        dfd.nodes.append(DFDNode(id="second", label="Second", type=NodeType.SERVICE))
+        assert dfd.get_node_by_id("second") is not None
+        
+        dfd.nodes = [DFDNode(id="third", label="Third", type=NodeType.SERVICE)]
+        assert dfd.get_node_by_id("first") is None
+        assert dfd.get_node_by_id("third") is not None
+    
     def test_dfd_cross_boundary_edges(self):
         """Test cross-boundary edge detection"""
         dfd = DFD(level="service")
@@ -81,7 +157,8 @@ class TestDFDModels:
                        trust_boundary=TrustBoundary.INTERNET)
         node2 = DFDNode(id="internal", label="Internal", type=NodeType.SERVICE,
                        trust_boundary=TrustBoundary.INTERNAL)
-        dfd.nodes.extend([node1, node2])
+        dfd.add_node(node1)
+        dfd.add_node(node2)
         
         # Create edge between them
         edge = DFDEdge(source="external", target="internal", label="request")
@@ -90,171 +167,189 @@ class TestDFDModels:
         cross_boundary = dfd.get_cross_boundary_edges()
         assert len(cross_boundary) == 1
         assert cross_boundary[0].source == "external"
+    
+    def test_dfd_memoized_results_invalidate(self):
+        """Test memoized statistics and cross-boundary edges refresh on mutation"""
+        dfd = DFD(level="service")
+        dfd.add_node(DFDNode(id="external", label="External", type=NodeType.EXTERNAL,
+                             trust_boundary=TrustBoundary.INTERNET))
+        dfd.add_node(DFDNode(id="internal", label="Internal", type=NodeType.SERVICE,
+                             trust_boundary=TrustBoundary.INTERNAL))
+        
+        assert dfd.get_statistics()['cross_boundary_flows'] == 0
+        assert dfd.get_statistics() == dfd.get_statistics()
+        
+        dfd.add_edge(DFDEdge(source="external", target="internal", label="request"))
+        assert len(dfd.get_cross_boundary_edges()) == 1
+        assert dfd.get_statistics()['total_edges'] == 1
+        
+        # Direct list edits are detected as well
+        dfd.edges.append(DFDEdge(source="internal", target="external", label="response"))
+        assert len(dfd.get_cross_boundary_edges()) == 2
+        
+        # Swapping a node in place needs an explicit invalidation
+        dfd.nodes[0] = replace(dfd.nodes[0], trust_boundary=TrustBoundary.INTERNAL)
+        dfd.invalidate_caches()
+        assert dfd.get_cross_boundary_edges() == []
+    
+    def test_generation_result_builds_levels_lazily(self):
+        """Test DFD layers given as builders are generated once, on first access"""
+        calls = []
+        result = DFDGenerationResult()
+        result.code_level = lambda: calls.append("code") or DFD(level="code")
+        assert calls == []
+        
+        assert result.code_level.level == "code"
+        assert result.code_level is result.code_level
+        assert calls == ["code"]
+        assert result.service_level is None
+
+    def test_generation_result_defers_builder_errors(self):
+        """Test a failing layer builder raises on access and totals come from to_dict()"""
+        def fail():
+            raise ValueError("bad flows")
+        
+        result = DFDGenerationResult(metadata={'levels_generated': ['service', 'code']})
+        result.service_level = lambda: DFD(level="service", nodes=[
+            DFDNode(id="api", label="API", type=NodeType.API)
+        ])
+        result.code_level = fail
+        assert 'total_nodes' not in result.metadata
+        
+        with pytest.raises(ValueError, match="bad flows"):
+            result.code_level
+        
+        result.code_level = None
+        assert result.to_dict()['metadata']['total_nodes'] == 1
 
 
 class TestDFDGenerator:
     """Test DFD generator"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_gcp_resources(self):
         """Sample GCP resources for testing"""
-        return [
-            {
-                'id': 'db-1',
-                'full_name': 'google_sql_database_instance.main',
-                'resource_type': 'google_sql_database_instance',
-                'name': 'main-db',
-                'properties': {
-                    'settings': {
-                        'ip_configuration': {
-                            'ipv4_enabled': True,
-                            'authorized_networks': [
-                                {'value': '10.0.0.0/8'}
-                            ]
-                        }
-                    },
-                    'encrypted': True
-                }
-            },
-            {
-                'id': 'compute-1',
-                'full_name': 'google_compute_instance.web',
-                'resource_type': 'google_compute_instance',
-                'name': 'web-server',
-                'properties': {
-                    'associate_public_ip_address': True
-                }
-            },
-            {
-                'id': 'storage-1',
-                'full_name': 'google_storage_bucket.data',
-                'resource_type': 'google_storage_bucket',
-                'name': 'data-bucket',
-                'properties': {
-                    'acl': 'private'
-                }
-            }
-        ]
+        return load_fixture("gcp_resources")
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_aws_resources(self):
         """Sample AWS resources for testing"""
-        return [
-            {
-                'id': 'rds-1',
-                'resource_type': 'aws_db_instance',
-                'full_name': 'aws_db_instance.main',
-                'name': 'main-db',
-                'properties': {
-                    'publicly_accessible': False,
-                    'storage_encrypted': True
-                }
-            },
-            {
-                'id': 's3-1',
-                'resource_type': 'aws_s3_bucket',
-                'full_name': 'aws_s3_bucket.data',
-                'name': 'data-bucket',
-                'properties': {
-                    'acl': 'public-read'
-                }
-            },
-            {
-                'id': 'lambda-1',
-                'resource_type': 'aws_lambda_function',
-                'full_name': 'aws_lambda_function.processor',
-                'name': 'data-processor',
-                'properties': {}
-            }
-        ]
+        return load_fixture("aws_resources")
+    
+    @pytest.fixture(scope="module")
+    def gcp_service_dfd(self, sample_gcp_resources, generator):
+        """Service-level DFD built once from the GCP sample"""
+        return generator.generate_service_level_dfd(sample_gcp_resources)
     
-    def test_service_level_dfd_generation(self, sample_gcp_resources):
+    @pytest.fixture(scope="module")
+    def aws_service_dfd(self, sample_aws_resources, generator):
+        """Service-level DFD built once from the AWS sample"""
+        return generator.generate_service_level_dfd(sample_aws_resources)
+    
+    @pytest.fixture(scope="module")
+    def gcp_node_index(self, gcp_service_dfd):
+        """Node index over the GCP service-level DFD"""
+        return index_nodes(gcp_service_dfd)
+    
+    @pytest.fixture(scope="module")
+    def aws_node_index(self, aws_service_dfd):
+        """Node index over the AWS service-level DFD"""
+        return index_nodes(aws_service_dfd)
+    
+    def test_service_level_dfd_generation(self, gcp_service_dfd):
         """Test service-level DFD generation"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_gcp_resources)
-        
-        assert dfd.level == "service"
-        assert len(dfd.nodes) >= 3  # At least the 3 resources
-        assert dfd.metadata['cloud_provider'] == 'gcp'
-        assert dfd.metadata['resource_count'] == 3
+        assert gcp_service_dfd.level == "service"
+        assert len(gcp_service_dfd.nodes) >= 3  # At least the 3 resources
+        assert gcp_service_dfd.metadata['cloud_provider'] == 'gcp'
+        assert gcp_service_dfd.metadata['resource_count'] == 3
     
-    def test_node_type_inference(self, sample_gcp_resources):
+    def test_node_type_inference(self, gcp_node_index):
         """Test node type inference from resources"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_gcp_resources)
+        by_lower_id = gcp_node_index.by_lower_id
         
         # Find database node
-        db_nodes = [n for n in dfd.nodes if 'db' in n.id.lower()]
+        db_nodes = [n for key, n in by_lower_id.items() if 'db' in key]
         assert len(db_nodes) > 0
         assert db_nodes[0].type == NodeType.DATABASE
         
         # Find compute node
-        compute_nodes = [n for n in dfd.nodes if 'compute' in n.id.lower() or 'web' in n.id.lower()]
+        compute_nodes = [n for key, n in by_lower_id.items() if 'compute' in key or 'web' in key]
         assert len(compute_nodes) > 0
         assert compute_nodes[0].type == NodeType.COMPUTE
         
         # Find storage node
-        storage_nodes = [n for n in dfd.nodes if 'storage' in n.id.lower() or 'bucket' in n.id.lower()]
+        storage_nodes = [n for key, n in by_lower_id.items() if 'storage' in key or 'bucket' in key]
         assert len(storage_nodes) > 0
         assert storage_nodes[0].type == NodeType.STORAGE
     
-    def test_trust_boundary_inference(self, sample_gcp_resources):
+    def test_fuzzy_node_type_keyword_priority(self, generator):
+        """Test unmapped resource types fall back to ordered keyword matching"""
+        def infer(resource_type):
+            record = ResourceRecord.from_dict({'resource_type': resource_type}, 'node')
+            return generator._infer_node_type(record)
+        
+        assert infer('custom_sql_vm') == NodeType.DATABASE  # database keywords win over compute
+        assert infer('aws_elasticache_cluster') == NodeType.CACHE
+        assert infer('custom_widget') == NodeType.SERVICE
+    
+    def test_resource_record_flattens_properties(self, sample_gcp_resources):
+        """Test resource dicts are flattened into records once"""
+        record = ResourceRecord.from_dict(sample_gcp_resources[0], 'db-1')
+        
+        assert record.node_id == 'db-1'
+        assert record.label == 'main-db'
+        assert record.type_lower == 'google_sql_database_instance'
+        assert record.ipv4_enabled is True
+        assert record.encrypted is True
+        assert record.authorized_networks == ({'value': '10.0.0.0/8'},)
+    
+    def test_trust_boundary_inference(self, gcp_node_index):
         """Test trust boundary inference"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_gcp_resources)
-        
         # Database with encryption should be in restricted/private zone
-        db_nodes = [n for n in dfd.nodes if n.type == NodeType.DATABASE]
+        db_nodes = gcp_node_index.by_type[NodeType.DATABASE]
         assert len(db_nodes) > 0
         assert db_nodes[0].trust_boundary in [TrustBoundary.RESTRICTED, TrustBoundary.PRIVATE]
         
         # Compute with public IP should be in DMZ
-        compute_nodes = [n for n in dfd.nodes if n.type == NodeType.COMPUTE]
+        compute_nodes = gcp_node_index.by_type[NodeType.COMPUTE]
         assert len(compute_nodes) > 0
         # Note: May be DMZ or internal depending on exact config
         assert compute_nodes[0].trust_boundary is not None
     
-    def test_public_s3_bucket_trust_boundary(self, sample_aws_resources):
+    def test_public_s3_bucket_trust_boundary(self, aws_node_index):
         """Test that public S3 bucket is in internet zone"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_aws_resources)
-        
         # Find S3 bucket node
-        s3_nodes = [n for n in dfd.nodes if 's3' in n.resource_type.lower()]
+        s3_nodes = [
+            n for n in aws_node_index.by_type[NodeType.STORAGE]
+            if 's3' in n.resource_type.lower()
+        ]
         assert len(s3_nodes) > 0
         assert s3_nodes[0].trust_boundary == TrustBoundary.INTERNET
     
-    def test_data_flow_detection(self, sample_gcp_resources):
+    def test_data_flow_detection(self, gcp_service_dfd):
         """Test automatic data flow detection"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_gcp_resources)
-        
         # Should have detected some edges
-        assert len(dfd.edges) > 0
+        assert len(gcp_service_dfd.edges) > 0
         
         # Check for specific patterns (e.g., compute -> database)
         compute_to_db = [
-            e for e in dfd.edges
+            e for e in gcp_service_dfd.edges
             if 'compute' in e.source or 'web' in e.source
         ]
         # May or may not find depending on heuristics
         # assert len(compute_to_db) > 0
     
-    def test_trust_boundary_grouping(self, sample_gcp_resources):
+    def test_trust_boundary_grouping(self, gcp_service_dfd):
         """Test trust boundary grouping"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_gcp_resources)
-        
-        assert len(dfd.trust_boundaries) > 0
+        assert len(gcp_service_dfd.trust_boundaries) > 0
         
         # Each group should have nodes
-        for boundary_group in dfd.trust_boundaries:
+        for boundary_group in gcp_service_dfd.trust_boundaries:
             assert len(boundary_group.node_ids) > 0
             assert boundary_group.name is not None
     
-    def test_component_level_dfd_generation(self, sample_gcp_resources):
+    def test_component_level_dfd_generation(self, sample_gcp_resources, generator):
         """Test component-level DFD generation"""
-        generator = DFDGenerator()
         dfd = generator.generate_component_level_dfd(sample_gcp_resources)
         
         assert dfd.level == "component"
@@ -262,7 +357,7 @@ class TestDFDGenerator:
         # (services expanded into components)
         assert len(dfd.nodes) >= 3
     
-    def test_code_level_dfd_generation(self):
+    def test_code_level_dfd_generation(self, generator):
         """Test code-level DFD generation"""
         code_flows = [
             {
@@ -279,7 +374,6 @@ class TestDFDGenerator:
             }
         ]
         
-        generator = DFDGenerator()
         dfd = generator.generate_code_level_dfd(code_flows)
         
         assert dfd.level == "code"
@@ -299,7 +393,19 @@ class TestDFDGenerator:
         # Should have edges
         assert len(dfd.edges) > 0
     
-    def test_generate_all_levels(self, sample_gcp_resources):
+    def test_code_level_dfd_skips_duplicate_flows(self, generator):
+        """Test repeated calls in code flows produce a single edge"""
+        code_flows = [
+            {'function': 'handler', 'calls': ['save', 'save'], 'data_access': ['db']},
+            {'function': 'handler', 'calls': ['save'], 'data_access': ['db']}
+        ]
+        
+        dfd = generator.generate_code_level_dfd(code_flows)
+        
+        assert len(dfd.edges) == 2
+        assert len(set(dfd.edges)) == len(dfd.edges)
+    
+    def test_generate_all_levels(self, sample_gcp_resources, generator):
         """Test generating all three levels"""
         code_flows = [
             {
@@ -310,7 +416,6 @@ class TestDFDGenerator:
             }
         ]
         
-        generator = DFDGenerator()
         result = generator.generate_all_levels(sample_gcp_resources, code_flows)
         
         assert result.service_level is not None
@@ -324,16 +429,13 @@ class TestDFDGenerator:
         
         assert len(result.metadata['levels_generated']) == 3
     
-    def test_dfd_statistics(self, sample_gcp_resources):
+    def test_dfd_statistics(self, gcp_service_dfd):
         """Test DFD statistics generation"""
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(sample_gcp_resources)
-        
-        stats = dfd.get_statistics()
+        stats = gcp_service_dfd.get_statistics()
         
         assert stats['level'] == 'service'
-        assert stats['total_nodes'] == len(dfd.nodes)
-        assert stats['total_edges'] == len(dfd.edges)
+        assert stats['total_nodes'] == len(gcp_service_dfd.nodes)
+        assert stats['total_edges'] == len(gcp_service_dfd.edges)
         assert 'node_types' in stats
         assert 'trust_boundaries' in stats
 
@@ -341,7 +443,7 @@ class TestDFDGenerator:
 class TestMermaidExporter:
     """Test Mermaid diagram exporter"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def simple_dfd(self):
         """Simple DFD for testing"""
         dfd = DFD(level="service")
@@ -389,10 +491,24 @@ class TestMermaidExporter:
         
         return dfd
     
-    def test_mermaid_export_basic(self, simple_dfd):
+    @pytest.fixture(scope="module")
+    def simple_mermaid(self, simple_dfd, exporter):
+        """Mermaid export of the simple DFD with trust boundaries"""
+        return exporter.export_to_mermaid(simple_dfd, include_trust_boundaries=True)
+    
+    @pytest.fixture(scope="module")
+    def simple_mermaid_tokens(self, simple_mermaid):
+        """Whitespace-separated tokens of the simple Mermaid export"""
+        return frozenset(simple_mermaid.split())
+    
+    @pytest.fixture(scope="module")
+    def simple_mermaid_no_tb(self, simple_dfd, exporter):
+        """Mermaid export of the simple DFD without trust boundaries"""
+        return exporter.export_to_mermaid(simple_dfd, include_trust_boundaries=False)
+    
+    def test_mermaid_export_basic(self, simple_mermaid):
         """Test basic Mermaid export"""
-        exporter = MermaidExporter()
-        mermaid = exporter.export_to_mermaid(simple_dfd)
+        mermaid = simple_mermaid
         
         assert 'flowchart TB' in mermaid
         assert 'Payment API' in mermaid
@@ -400,10 +516,9 @@ class TestMermaidExporter:
         assert 'queries' in mermaid
         assert '🔒' in mermaid  # Encryption indicator
     
-    def test_mermaid_node_shapes(self, simple_dfd):
+    def test_mermaid_node_shapes(self, simple_mermaid):
         """Test Mermaid node shape mapping"""
-        exporter = MermaidExporter()
-        mermaid = exporter.export_to_mermaid(simple_dfd)
+        mermaid = simple_mermaid
         
         # API should use hexagon {{}}
         assert '{{' in mermaid and '}}' in mermaid
@@ -411,47 +526,71 @@ class TestMermaidExporter:
         # Database should use cylindrical [()]
         assert '[(' in mermaid and ')]' in mermaid
     
-    def test_mermaid_subgraphs(self, simple_dfd):
+    def test_mermaid_subgraphs(self, simple_mermaid, simple_mermaid_tokens):
         """Test Mermaid subgraph generation for trust boundaries"""
-        exporter = MermaidExporter()
-        mermaid = exporter.export_to_mermaid(simple_dfd, include_trust_boundaries=True)
+        mermaid = simple_mermaid
         
-        assert 'subgraph' in mermaid
+        assert 'subgraph' in simple_mermaid_tokens
         assert 'DMZ_Zone' in mermaid or 'DMZ Zone' in mermaid
         assert 'Restricted_Zone' in mermaid or 'Restricted Zone' in mermaid
-        assert 'end' in mermaid
+        assert 'end' in simple_mermaid_tokens
     
-    def test_mermaid_without_subgraphs(self, simple_dfd):
+    def test_mermaid_without_subgraphs(self, simple_mermaid_no_tb):
         """Test Mermaid export without trust boundary subgraphs"""
-        exporter = MermaidExporter()
-        mermaid = exporter.export_to_mermaid(simple_dfd, include_trust_boundaries=False)
+        mermaid = simple_mermaid_no_tb
         
         assert 'flowchart TB' in mermaid
         assert 'Payment API' in mermaid
         # Should still have nodes but no subgraphs
         assert 'subgraph' not in mermaid
     
-    def test_mermaid_styles(self, simple_dfd):
+    def test_mermaid_styles(self, simple_mermaid, simple_mermaid_tokens):
         """Test Mermaid style application"""
-        exporter = MermaidExporter()
-        mermaid = exporter.export_to_mermaid(simple_dfd)
-        
         # Should have style definitions
-        assert 'style' in mermaid
+        assert 'style' in simple_mermaid_tokens
         # Should apply colors based on trust boundaries
-        assert 'fill:' in mermaid
+        assert 'fill:' in simple_mermaid
     
-    def test_mermaid_data_classification_export(self, simple_dfd):
+    def test_mermaid_export_cached_until_dfd_changes(self, exporter):
+        """Test repeated exports reuse the cached diagram until the DFD changes"""
+        dfd = DFD(level="service")
+        dfd.add_node(DFDNode(id="api", label="API", type=NodeType.API))
+        
+        first = exporter.export_to_mermaid(dfd)
+        assert exporter.export_to_mermaid(dfd) is first
+        assert 'subgraph' not in exporter.export_to_mermaid(dfd, include_trust_boundaries=False)
+        
+        dfd.add_node(DFDNode(id="db", label="Database", type=NodeType.DATABASE))
+        assert 'Database' in exporter.export_to_mermaid(dfd)
+        
+        dfd.nodes[1] = replace(dfd.nodes[1], label="Orders DB")
+        dfd.invalidate_caches()
+        assert 'Orders DB' in exporter.export_to_mermaid(dfd)
+
+    def test_mermaid_export_invalidated_by_list_reassignment(self, exporter):
+        """Test reassigning a same-length node list drops the cached diagram"""
+        dfd = DFD(level="service")
+        dfd.add_node(DFDNode(id="api", label="API", type=NodeType.API))
+        
+        first = exporter.export_to_mermaid(dfd)
+        stats = dfd.get_statistics()
+        
+        dfd.nodes = [DFDNode(id="queue", label="Queue", type=NodeType.QUEUE)]
+        second = exporter.export_to_mermaid(dfd)
+        assert second is not first
+        assert 'Queue' in second
+        assert 'API' not in second
+        assert dfd.get_statistics() is not stats
+    
+    def test_mermaid_data_classification_export(self, simple_dfd, exporter):
         """Test Mermaid export with data classification"""
-        exporter = MermaidExporter()
         mermaid = exporter.export_to_mermaid_with_data_classification(simple_dfd)
         
         assert 'Data Classification View' in mermaid
         assert 'confidential' in mermaid.lower()
     
-    def test_export_summary(self, simple_dfd):
+    def test_export_summary(self, simple_dfd, exporter):
         """Test DFD summary export"""
-        exporter = MermaidExporter()
         summary = exporter.export_summary(simple_dfd)
         
         assert summary['level'] == 'service'
@@ -463,9 +602,8 @@ class TestMermaidExporter:
         assert 'cross_boundary_flows' in summary['security']
         assert 'high_risk_flows' in summary['security']
     
-    def test_svg_export_template(self, simple_dfd):
+    def test_svg_export_template(self, simple_dfd, exporter):
         """Test SVG export HTML template generation"""
-        exporter = MermaidExporter()
         html = exporter.export_to_svg(simple_dfd)
         
         assert '<!DOCTYPE html>' in html
@@ -496,90 +634,91 @@ class TestMermaidExporter:
         assert 'flowchart TB' in result['code']
 
 
+# Minimal two-resource deployments for the end-to-end workflow tests
+GCP_WORKFLOW_RESOURCES = (
+    {
+        'id': 'api-1',
+        'resource_type': 'google_cloud_run_service',
+        'full_name': 'google_cloud_run_service.api',
+        'name': 'payment-api',
+        'properties': {}
+    },
+    {
+        'id': 'db-1',
+        'resource_type': 'google_sql_database_instance',
+        'full_name': 'google_sql_database_instance.main',
+        'name': 'payment-db',
+        'properties': {
+            'settings': {
+                'ip_configuration': {
+                    'ipv4_enabled': False
+                }
+            },
+            'encrypted': True
+        }
+    },
+)
+
+AWS_WORKFLOW_RESOURCES = (
+    {
+        'id': 'lb-1',
+        'resource_type': 'aws_lb',
+        'full_name': 'aws_lb.public',
+        'name': 'public-lb',
+        'properties': {}
+    },
+    {
+        'id': 'db-1',
+        'resource_type': 'aws_db_instance',
+        'full_name': 'aws_db_instance.private',
+        'name': 'private-db',
+        'properties': {
+            'publicly_accessible': False,
+            'storage_encrypted': True
+        }
+    },
+)
+
+
 class TestIntegration:
     """Integration tests for full DFD workflow"""
     
-    def test_full_workflow_gcp(self):
-        """Test complete workflow from resources to Mermaid"""
-        resources = [
-            {
-                'id': 'api-1',
-                'resource_type': 'google_cloud_run_service',
-                'full_name': 'google_cloud_run_service.api',
-                'name': 'payment-api',
-                'properties': {}
-            },
-            {
-                'id': 'db-1',
-                'resource_type': 'google_sql_database_instance',
-                'full_name': 'google_sql_database_instance.main',
-                'name': 'payment-db',
-                'properties': {
-                    'settings': {
-                        'ip_configuration': {
-                            'ipv4_enabled': False
-                        }
-                    },
-                    'encrypted': True
-                }
-            }
-        ]
-        
+    @pytest.mark.parametrize(
+        "resources, expected_provider, label_keyword",
+        [
+            (GCP_WORKFLOW_RESOURCES, 'gcp', 'payment'),
+            (AWS_WORKFLOW_RESOURCES, 'aws', 'private'),
+        ],
+        ids=["gcp", "aws"]
+    )
+    def test_full_workflow(self, generator, exporter, resources, expected_provider, label_keyword):
+        """Test complete workflow from resources to Mermaid and security summary"""
         # Generate DFD
-        generator = DFDGenerator()
         dfd = generator.generate_service_level_dfd(resources)
         
         # Verify DFD structure
         assert len(dfd.nodes) >= 2
-        assert dfd.metadata['cloud_provider'] == 'gcp'
+        assert dfd.metadata['cloud_provider'] == expected_provider
         
         # Export to Mermaid
-        exporter = MermaidExporter()
         mermaid = exporter.export_to_mermaid(dfd)
         
         assert 'flowchart TB' in mermaid
-        assert 'payment' in mermaid.lower()
+        assert label_keyword in mermaid.lower()
         
         # Get statistics
         stats = dfd.get_statistics()
         assert stats['total_nodes'] >= 2
-    
-    def test_cross_boundary_detection(self):
-        """Test detection of cross-boundary data flows"""
-        resources = [
-            {
-                'id': 'lb-1',
-                'resource_type': 'aws_lb',
-                'full_name': 'aws_lb.public',
-                'name': 'public-lb',
-                'properties': {}
-            },
-            {
-                'id': 'db-1',
-                'resource_type': 'aws_db_instance',
-                'full_name': 'aws_db_instance.private',
-                'name': 'private-db',
-                'properties': {
-                    'publicly_accessible': False,
-                    'storage_encrypted': True
-                }
-            }
-        ]
-        
-        generator = DFDGenerator()
-        dfd = generator.generate_service_level_dfd(resources)
         
         # Check for cross-boundary flows
+        # (may or may not detect depending on heuristics)
         cross_boundary = dfd.get_cross_boundary_edges()
-        # May or may not detect depending on heuristics
         
         # Get security summary
-        exporter = MermaidExporter()
         summary = exporter.export_summary(dfd)
         
         assert 'security' in summary
-        assert summary['security']['cross_boundary_flows'] >= 0
-
+        assert summary['security']['cross_boundary_flows'] == len(cross_boundary)
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
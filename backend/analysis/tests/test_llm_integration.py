@@ -4,13 +4,17 @@ Tests for LLM Integration
 Unit tests for LLM client, threat generator, caching, and prompt templates.
 """
 
+import asyncio
 import pytest
+import threading
 import time
-from unittest.mock import Mock, patch, MagicMock
+from concurrent.futures import Future
+from unittest.mock import patch
 from llm.llm_client import LLMClient, LLMProvider, LLMError, RateLimitError
-from llm.threat_generator import ThreatGenerator
+from llm.threat_generator import ThreatGenerator, PrewarmedResult
 from llm.prompt_templates import PromptTemplates, get_system_prompt
 from utils.cache import ResponseCache, get_cache
+from tests.fakes import FakeAnthropic, FakeOpenAI
 
 
 class TestResponseCache:
@@ -48,15 +52,16 @@ class TestResponseCache:
     
     def test_cache_expiration(self):
         """Test cache entry expiration"""
-        cache = ResponseCache(ttl=1)  # 1 second TTL
+        clock = [0.0]
+        cache = ResponseCache(ttl=1, time_fn=lambda: clock[0])  # 1 second TTL
         
         cache.set("prompt", "response")
         
         # Should be cached
         assert cache.get("prompt") == "response"
         
-        # Wait for expiration
-        time.sleep(1.1)
+        # Advance past expiration
+        clock[0] = 1.1
         
         # Should be expired
         assert cache.get("prompt") is None
@@ -73,6 +78,105 @@ class TestResponseCache:
         assert cache.get("prompt2") == "response2"
         assert cache.get("prompt3") == "response3"
     
+    def test_cache_get_default(self):
+        """Test a sentinel default distinguishes misses from empty responses"""
+        cache = ResponseCache()
+        missing = object()
+        
+        cache.set("empty", "")
+        
+        assert cache.get("empty", default=missing) == ""
+        assert cache.get("nonexistent", default=missing) is missing
+        assert cache.get("nonexistent") is None
+    
+    def test_cache_hash_algo(self):
+        """Test cache keys can use any hashlib algorithm"""
+        cache = ResponseCache(hash_algo='sha256')
+        cache.set("prompt", "response", system_prompt="System")
+        
+        assert cache.get("prompt", system_prompt="System") == "response"
+        assert len(ResponseCache(hash_algo='blake2b')._generate_key("prompt")) == 32  # 128-bit
+        
+        # The default picks xxh3 when xxhash is installed, BLAKE2b otherwise
+        assert ResponseCache().hash_algo in ('xxh3_128', 'blake2b')
+        
+        with pytest.raises(ValueError):
+            ResponseCache(hash_algo='not-a-hash')
+    
+    def test_cache_value_aware_eviction(self):
+        """Test eviction prefers cheap, unused entries among the least recent"""
+        cache = ResponseCache(max_size=10, eviction_window=0.5)
+        
+        cache.set("expensive", "x" * 4000)
+        cache.set("cheap", "y")
+        for i in range(8):
+            cache.set(f"prompt{i}", f"response{i}")
+        
+        cache.set("new", "response")  # LRU order would evict "expensive"
+        
+        assert cache.get("expensive") is not None
+        assert cache.get("cheap") is None
+        assert cache.get("new") == "response"
+    
+    def test_cache_evicts_expired_before_lru(self):
+        """Test a full cache reclaims expired entries before live LRU ones"""
+        clock = [1000.0]
+        cache = ResponseCache(max_size=2, ttl=60, time_fn=lambda: clock[0])
+        
+        cache.set("old", "response1")
+        clock[0] = 1050.0
+        cache.set("recent", "response2")
+        cache.get("old")  # "recent" is now least recently used
+        
+        clock[0] = 1070.0
+        cache.set("new", "response3")  # "old" has expired
+        
+        assert cache.get("recent") == "response2"
+        assert cache.get("new") == "response3"
+        assert cache.get("old") is None
+    
+    def test_cache_admission_filter(self):
+        """Test a full cache does not admit one-off prompts over hot entries"""
+        cache = ResponseCache(max_size=2, eviction_window=0)
+        
+        cache.set("hot1", "response1")
+        cache.set("hot2", "response2")
+        for _ in range(3):
+            cache.get("hot1")
+            cache.get("hot2")
+        
+        assert cache.get("oneshot") is None
+        cache.set("oneshot", "response3")
+        
+        assert cache.get("hot1") == "response1"
+        assert cache.get("hot2") == "response2"
+        assert cache.get("oneshot") is None
+        assert cache.get_statistics()['rejected'] == 1
+        
+        # Without the filter the least recently used entry is evicted
+        unfiltered = ResponseCache(max_size=1, admission_filter=False)
+        unfiltered.set("hot", "response1")
+        unfiltered.get("hot")
+        unfiltered.set("oneshot", "response2")
+        assert unfiltered.get("oneshot") == "response2"
+    
+    def test_cache_persistent(self, tmp_path):
+        """Test a persistent cache serves responses after a restart"""
+        db_path = str(tmp_path / "cache.sqlite3")
+        
+        cache = ResponseCache(persistent=True, db_path=db_path)
+        cache.set("prompt", "response", system_prompt="System")
+        cache.close()
+        
+        restarted = ResponseCache(persistent=True, db_path=db_path)
+        assert restarted.get("prompt", system_prompt="System") == "response"
+        assert restarted.hits == 1
+        assert len(restarted.cache) == 1  # Promoted into memory
+        
+        restarted.clear()
+        restarted.close()
+        assert ResponseCache(persistent=True, db_path=db_path).get("prompt", system_prompt="System") is None
+    
     def test_cache_statistics(self):
         """Test cache statistics"""
         cache = ResponseCache(max_size=10)
@@ -115,6 +219,22 @@ class TestResponseCache:
         # Different system prompts should have different cache keys
         assert cache.get(prompt, system_prompt="System 1") == response1
         assert cache.get(prompt, system_prompt="System 2") == response2
+        
+        # The prompt/system prompt boundary is part of the key
+        assert cache._generate_key("c", "ab") != cache._generate_key("bc", "a")
+    
+    def test_cache_mget(self):
+        """Test batched lookup of several prompts"""
+        cache = ResponseCache()
+        
+        cache.set("prompt1", "response1", system_prompt="System")
+        cache.set("prompt2", "response2")
+        
+        found = cache.mget([("prompt1", "System"), ("prompt2", None), ("prompt3", None)])
+        
+        assert found == {("prompt1", "System"): "response1", ("prompt2", None): "response2"}
+        assert cache.hits == 2
+        assert cache.misses == 1
 
 
 class TestPromptTemplates:
@@ -181,70 +301,67 @@ class TestPromptTemplates:
 class TestLLMClient:
     """Test LLM client"""
     
-    @patch('anthropic.Anthropic')
-    def test_call_claude_success(self, mock_anthropic):
+    @pytest.fixture
+    def fake_claude(self):
+        """Fake Anthropic client returning a threat description"""
+        return FakeAnthropic(text="Generated threat description")
+    
+    @pytest.fixture
+    def fake_openai(self):
+        """Fake OpenAI client returning a remediation"""
+        return FakeOpenAI(content="Generated remediation")
+    
+    def test_call_claude_success(self, fake_claude):
         """Test successful Claude API call"""
-        # Mock Claude response
-        mock_response = Mock()
-        mock_response.content = [Mock(text="Generated threat description")]
-        mock_response.usage = Mock(input_tokens=100, output_tokens=50)
-        
-        mock_client = Mock()
-        mock_client.messages.create.return_value = mock_response
-        mock_anthropic.return_value = mock_client
-        
         client = LLMClient(claude_api_key="test_key")
-        client.claude_client = mock_client
+        client.claude_client = fake_claude
         
         result = client.call_claude("Test prompt")
         
         assert result == "Generated threat description"
         assert client.request_count == 1
+        assert fake_claude.calls[0]['messages'] == [{"role": "user", "content": "Test prompt"}]
     
-    @patch('openai.chat.completions.create')
-    def test_call_openai_success(self, mock_create):
+    def test_call_openai_success(self, fake_openai):
         """Test successful OpenAI API call"""
-        # Mock OpenAI response
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=Mock(content="Generated remediation"))]
-        mock_response.usage = Mock(total_tokens=150)
-        mock_create.return_value = mock_response
-        
         client = LLMClient(openai_api_key="test_key")
-        client.openai_client = Mock()
-        client.openai_client.chat = Mock()
-        client.openai_client.chat.completions = Mock()
-        client.openai_client.chat.completions.create = mock_create
+        client.openai_client = fake_openai
         
         result = client.call_openai("Test prompt")
         
         assert result == "Generated remediation"
         assert client.request_count == 1
     
-    @patch('anthropic.Anthropic')
-    def test_fallback_to_openai(self, mock_anthropic):
+    def test_fallback_to_openai(self):
         """Test fallback from Claude to OpenAI"""
-        # Mock Claude failure
-        mock_client = Mock()
-        mock_client.messages.create.side_effect = Exception("Claude unavailable")
-        mock_anthropic.return_value = mock_client
-        
-        # Mock OpenAI success
-        mock_openai_response = Mock()
-        mock_openai_response.choices = [Mock(message=Mock(content="Fallback response"))]
-        mock_openai_response.usage = Mock(total_tokens=100)
-        
         client = LLMClient(claude_api_key="test_key", openai_api_key="test_key2")
-        client.claude_client = mock_client
-        client.openai_client = Mock()
-        client.openai_client.chat = Mock()
-        client.openai_client.chat.completions = Mock()
-        client.openai_client.chat.completions.create = Mock(return_value=mock_openai_response)
+        client.claude_client = FakeAnthropic(error=Exception("Claude unavailable"))
+        client.openai_client = FakeOpenAI(content="Fallback response", total_tokens=100)
         
         result = client.generate("Test prompt", enable_fallback=True)
         
         assert result == "Fallback response"
     
+    def test_generate_stream(self, fake_claude):
+        """Test streaming yields chunks that join to the full response"""
+        client = LLMClient(claude_api_key="test_key")
+        client.claude_client = fake_claude
+        
+        chunks = list(client.generate_stream("Test prompt"))
+        
+        assert len(chunks) > 1
+        assert "".join(chunks) == "Generated threat description"
+        assert client.request_log[-1]['tokens'] == 150
+    
+    def test_generate_stream_fallback(self, fake_openai):
+        """Test streaming falls back when Claude fails before any output"""
+        client = LLMClient(claude_api_key="test_key", openai_api_key="test_key2")
+        client.claude_client = FakeAnthropic(error=Exception("Claude unavailable"))
+        client.openai_client = fake_openai
+        
+        assert "".join(client.generate_stream("Test prompt")) == "Generated remediation"
+        assert fake_openai.calls[0]['stream'] is True
+    
     def test_statistics(self):
         """Test statistics tracking"""
         client = LLMClient()
@@ -315,6 +432,34 @@ class TestThreatGenerator:
         assert len(remediation) > 0
         assert mock_generate.called
     
+    def test_remediation_prompt_memoized(self):
+        """Test remediation prompts are rendered once per distinct input"""
+        generator = ThreatGenerator()
+        threat = {'name': 'Public Database', 'description': 'Database is publicly accessible'}
+        context = {
+            'cloud_provider': 'gcp',
+            'service_type': 'google_sql_database_instance',
+            'resource_name': 'main-db',
+            'current_config': {'publicly_accessible': True}
+        }
+        
+        first = generator._build_remediation_prompt(threat, context)
+        assert generator._build_remediation_prompt(threat, dict(context)) is first
+        
+        # Nested config values are memoized by their rendered text
+        nested = dict(context, current_config={'authorized_networks': ['0.0.0.0/0']})
+        assert '0.0.0.0/0' in generator._build_remediation_prompt(threat, nested)
+    
+    def test_remediation_prompt_memo_distinguishes_equal_values(self):
+        """Test True and 1 in the config render distinct remediation prompts"""
+        generator = ThreatGenerator()
+        threat = {'name': 'Unencrypted Disk', 'description': 'Disk is not encrypted'}
+        as_int = {'current_config': {'encrypted': 1}}
+        as_bool = {'current_config': {'encrypted': True}}
+        
+        assert 'encrypted: 1' in generator._build_remediation_prompt(threat, as_int)
+        assert 'encrypted: True' in generator._build_remediation_prompt(threat, as_bool)
+    
     @patch.object(LLMClient, 'generate')
     def test_generate_compliance_explanation(self, mock_generate):
         """Test compliance explanation generation"""
@@ -366,6 +511,153 @@ class TestThreatGenerator:
         
         assert result1 == result2
     
+    @patch.object(LLMClient, 'generate')
+    def test_generation_counts_one_cache_lookup(self, mock_generate):
+        """Test a generated response records exactly one miss in the cache stats"""
+        mock_generate.return_value = "Generated response"
+        
+        cache = ResponseCache()
+        generator = ThreatGenerator(cache=cache)
+        
+        threat = {'name': 'Test Threat', 'description': 'Test description'}
+        context = {'cloud_provider': 'aws', 'service_type': 's3_bucket'}
+        
+        generator.generate_remediation(threat, context)
+        generator.generate_remediation(threat, context)
+        
+        stats = cache.get_statistics()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+    
+    @patch.object(LLMClient, 'generate_stream')
+    def test_generate_remediation_stream(self, mock_stream):
+        """Test streamed remediations are cached once complete"""
+        mock_stream.return_value = iter(["Step 1. ", "Step 2."])
+        
+        generator = ThreatGenerator(cache=ResponseCache())
+        
+        threat = {'name': 'Test Threat', 'description': 'Test description'}
+        context = {'cloud_provider': 'aws', 'service_type': 's3_bucket'}
+        
+        assert list(generator.generate_remediation_stream(threat, context)) == ["Step 1. ", "Step 2."]
+        
+        # Second call is served whole from the cache
+        assert list(generator.generate_remediation_stream(threat, context)) == ["Step 1. Step 2."]
+        assert mock_stream.call_count == 1
+    
+    @patch.object(LLMClient, 'generate')
+    def test_cache_key_ignores_dict_order(self, mock_generate):
+        """Test that equal configs built in different orders share a cache entry"""
+        mock_generate.return_value = "Cached response"
+        
+        generator = ThreatGenerator(cache=ResponseCache())
+        
+        threat = {'name': 'Test Threat', 'description': 'Test description'}
+        context = {
+            'cloud_provider': 'aws',
+            'current_config': {'versioning': False, 'public_access': True}
+        }
+        reordered = {
+            'current_config': {'public_access': True, 'versioning': False},
+            'cloud_provider': 'aws'
+        }
+        
+        generator.generate_remediation(threat, context)
+        generator.generate_remediation(threat, reordered)
+        
+        assert mock_generate.call_count == 1
+    
+    @patch.object(LLMClient, 'generate')
+    def test_concurrent_calls_coalesced(self, mock_generate):
+        """Test that concurrent identical requests share one API call"""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_generate(**kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return "Shared response"
+        
+        mock_generate.side_effect = slow_generate
+        
+        generator = ThreatGenerator(cache=ResponseCache())
+        
+        threat = {'name': 'Test Threat', 'description': 'Test description'}
+        context = {'cloud_provider': 'aws', 'service_type': 's3_bucket'}
+        
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(generator.generate_remediation(threat, context))
+        )
+        second = threading.Thread(
+            target=lambda: results.append(generator.generate_remediation(threat, context))
+        )
+        
+        first.start()
+        assert started.wait(timeout=5)
+        second.start()
+        time.sleep(0.05)  # Let the second caller join the in-flight request
+        release.set()
+        first.join()
+        second.join()
+        
+        assert results == ["Shared response", "Shared response"]
+        assert mock_generate.call_count == 1
+        assert generator._inflight == {}
+    
+    @patch.object(LLMClient, 'generate')
+    def test_prefetch_serves_generate_calls(self, mock_generate):
+        """Test that prefetched responses are reused by generate_* calls"""
+        mock_generate.return_value = "Prefetched response"
+        
+        generator = ThreatGenerator(cache=ResponseCache())
+        
+        workload = [{
+            'threat': {'name': 'Test Threat', 'description': 'Test description'},
+            'context': {'cloud_provider': 'aws', 'service_type': 's3_bucket'}
+        }]
+        
+        prewarmed = generator.prefetch(workload, ['remediation'])
+        assert len(prewarmed.pending) == 1
+        
+        result = generator.generate_remediation(workload[0]['threat'], workload[0]['context'])
+        
+        assert result == "Prefetched response"
+        assert mock_generate.call_count == 1
+        assert generator.prewarmed is None  # Released once consumed
+        
+        # Second prefetch finds everything in the cache
+        with generator:
+            prewarmed = generator.prefetch(workload, ['remediation'])
+            assert len(prewarmed.hits) == 1
+            assert len(prewarmed.pending) == 0
+        
+        assert generator.prewarmed is None
+        assert generator._executor is None
+    
+    @patch.object(LLMClient, 'generate')
+    def test_prefetch_skipped_without_cache(self, mock_generate):
+        """Test prefetch starts no LLM calls when caching is disabled"""
+        generator = ThreatGenerator(enable_cache=False)
+        workload = [{
+            'threat': {'name': 'Test Threat', 'description': 'Test description'},
+            'context': {'cloud_provider': 'aws', 'service_type': 's3_bucket'}
+        }]
+        
+        prewarmed = generator.prefetch(workload, ['remediation'])
+        
+        assert prewarmed.exhausted
+        assert generator.prewarmed is None
+        assert generator._executor is None
+        assert not mock_generate.called
+    
+    def test_prewarmed_wait_times_out(self):
+        """Test a hung background generation does not block the caller"""
+        prewarmed = PrewarmedResult(pending={("prompt", "system"): Future()})
+        
+        assert prewarmed.get("prompt", "system", timeout=0.01) is None
+        assert prewarmed.exhausted
+    
     def test_get_statistics(self):
         """Test statistics retrieval"""
         generator = ThreatGenerator()
@@ -415,10 +707,10 @@ class TestIntegration:
             'current_config': {'acl': 'public-read'}
         }
         
-        # Generate all three
-        description = generator.generate_threat_description(config, threat_rule, use_cache=False)
-        remediation = generator.generate_remediation(threat, context, use_cache=False)
-        compliance = generator.generate_compliance_explanation(threat, "GDPR", use_cache=False)
+        # Generate all three concurrently
+        description, remediation, compliance = asyncio.run(generator.generate_all_async(
+            config, threat_rule, threat, context, "GDPR", use_cache=False
+        ))
         
         assert len(description) > 0
         assert len(remediation) > 0
@@ -12,8 +12,11 @@ from pathlib import Path
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from parsers.terraform_parser import TerraformParser, TerraformParserError
-from models.terraform import Resource, Variable, Provider
+import hcl2
+
+from parsers import terraform_parser
+from parsers.terraform_parser import TerraformParser, TerraformParserError, _try_fast_parse
+from models.terraform import Resource, Variable, Provider, TerraformConfiguration
 
 
 class TestTerraformParser:
@@ -461,6 +464,48 @@ provider "aws" {
         assert stats['total_resources'] == 1
         assert stats['total_variables'] == 1
     
+    def test_parse_directory_parallel(self, parser, temp_dir):
+        """Test process-pooled directory parsing matches serial parsing"""
+        count = parser.PARALLEL_FILE_THRESHOLD + 2
+        for i in range(count):
+            (temp_dir / f"bucket_{i:03d}.tf").write_text(
+                f'resource "aws_s3_bucket" "b{i}" {{\n  bucket = "bucket-{i}"\n}}\n'
+            )
+        (temp_dir / "broken.tf").write_text("this is not valid HCL {{{")
+        
+        result = parser.parse_directory(str(temp_dir))
+        serial = parser.parse_directory(str(temp_dir), parallel=False)
+        
+        assert [r['name'] for r in result['resources']] == [f"b{i}" for i in range(count)]
+        assert len(result['source_files']) == count
+        assert len(result['parsing_errors']) == 1
+        assert 'broken.tf' in result['parsing_errors'][0]
+        assert result['resources'] == serial['resources']
+        assert result['parsing_errors'] == serial['parsing_errors']
+        
+        # Worker results are cached in this process
+        bucket = temp_dir / "bucket_000.tf"
+        key = terraform_parser._parse_cache_key(bucket.read_text(), str(bucket.resolve()))
+        assert key in terraform_parser._parse_cache
+    
+    def test_parse_directory_recursive(self, parser, temp_dir):
+        """Test recursive directory parsing includes module subdirectories"""
+        (temp_dir / "main.tf").write_text('resource "aws_s3_bucket" "root" {\n  bucket = "root"\n}\n')
+        (temp_dir / "modules" / "storage").mkdir(parents=True)
+        (temp_dir / "modules" / "storage" / "main.tf").write_text(
+            'resource "aws_s3_bucket" "nested" {\n  bucket = "nested"\n}\n'
+        )
+        (temp_dir / ".terraform").mkdir()
+        (temp_dir / ".terraform" / "cached.tf").write_text(
+            'resource "aws_s3_bucket" "cached" {\n  bucket = "cached"\n}\n'
+        )
+        
+        flat = parser.parse_directory(str(temp_dir))
+        nested = parser.parse_directory(str(temp_dir), recursive=True)
+        
+        assert [r['name'] for r in flat['resources']] == ['root']
+        assert [r['name'] for r in nested['resources']] == ['root', 'nested']
+    
     def test_parse_invalid_file(self, parser, temp_dir):
         """Test error handling for invalid HCL"""
         tf_file = temp_dir / "invalid.tf"
@@ -471,6 +516,84 @@ provider "aws" {
         
         assert "parsing error" in str(exc_info.value).lower()
     
+    def test_parse_string(self, parser):
+        """Test parsing HCL2 content held in memory"""
+        tf_content = '''
+resource "aws_s3_bucket" "data" {
+  bucket = "data-bucket"
+}
+'''
+        result = parser.parse_string(tf_content, source_name='inline.tf')
+        
+        assert len(result['resources']) == 1
+        assert result['resources'][0]['location'] == 'inline.tf'
+        assert result['source_files'] == ['inline.tf']
+        
+        with pytest.raises(TerraformParserError) as exc_info:
+            parser.parse_string("this is not valid HCL {{{")
+        
+        assert "parsing error" in str(exc_info.value).lower()
+    
+    def test_fast_parse_matches_hcl2(self):
+        """Test the flat-subset fast path agrees with the full parser"""
+        tf_content = '''
+resource "aws_s3_bucket" "data" {
+  bucket        = "data-bucket"
+  force_destroy = true
+}
+
+resource "aws_instance" "app" {
+  ami           = "ami-12345"
+  instance_type = "t3.micro"
+  cpu_count     = 2
+}
+
+provider "aws" {
+  region = "us-west-2"
+}
+'''
+        assert _try_fast_parse(tf_content) == hcl2.loads(tf_content)
+        
+        # Anything outside the subset falls back to the full parser
+        assert _try_fast_parse('resource "a" "b" {\n  x = var.y\n}\n') is None
+        assert _try_fast_parse('resource "a" "b" {\n  tags = {\n    a = "b"\n  }\n}\n') is None
+        assert _try_fast_parse("this is not valid HCL {{{") is None
+    
+    def test_parse_file_config(self, parser, temp_dir):
+        """Test parsing straight to the configuration model"""
+        tf_file = temp_dir / "bucket.tf"
+        tf_file.write_text('resource "aws_s3_bucket" "data" {\n  bucket = "data-bucket"\n}\n')
+        
+        config = parser.parse_file_config(str(tf_file))
+        
+        assert isinstance(config, TerraformConfiguration)
+        assert config.resources[0].full_name == 'aws_s3_bucket.data'
+        
+        # Identical to parse_file apart from the parse timestamp
+        expected = parser.parse_file(str(tf_file))
+        actual = config.to_dict()
+        expected.pop('parsed_at')
+        actual.pop('parsed_at')
+        assert actual == expected
+    
+    def test_parse_cache_returns_independent_copies(self, parser):
+        """Test repeated parses of identical content reuse the cached result"""
+        tf_content = 'resource "aws_s3_bucket" "data" {\n  bucket = "data-bucket"\n}\n'
+        
+        first = parser.parse_string(tf_content, source_name='cached.tf')
+        second_config = parser._parse_to_config(tf_content, 'cached.tf')
+        second_config.resources.clear()
+        first['resources'][0]['properties']['bucket'] = 'public-bucket'
+        third = parser.parse_string(tf_content, source_name='cached.tf')
+        
+        assert len(third['resources']) == 1
+        assert third['resources'][0]['properties'] == {'bucket': 'data-bucket'}
+        
+        # Results of cache hits are independent of the cache too
+        third['resources'][0]['properties']['acl'] = 'public-read'
+        fourth = parser.parse_string(tf_content, source_name='cached.tf')
+        assert fourth['resources'][0]['properties'] == {'bucket': 'data-bucket'}
+    
     def test_parse_nonexistent_file(self, parser):
         """Test error handling for missing file"""
         with pytest.raises(TerraformParserError) as exc_info:
@@ -546,5 +669,59 @@ resource "azurerm_storage_account" "logs" {
         assert providers.get('azure', 0) >= 1
 
 
+class TestTerraformModels:
+    """Test suite for Terraform data models"""
+    
+    def test_resource_table(self):
+        """Test column-oriented resource view"""
+        config = TerraformConfiguration(resources=[
+            Resource(resource_type='aws_s3_bucket', name='data'),
+            Resource(resource_type='google_storage_bucket', name='backup'),
+            Resource(resource_type='aws_s3_bucket', name='logs'),
+        ])
+        
+        table = config.as_table()
+        
+        assert len(table) == 3
+        assert table.cloud_provider == ['aws', 'gcp', 'aws']
+        assert table.select(['aws_s3_bucket']) == [0, 2]
+        assert table.count_by_provider() == {'aws': 2, 'gcp': 1}
+    
+    def test_to_arrow(self):
+        """Test Arrow export of resources"""
+        pytest.importorskip('pyarrow')
+        
+        config = TerraformConfiguration(resources=[
+            Resource(resource_type='aws_s3_bucket', name='data', properties={'acl': 'private'}),
+            Resource(resource_type='google_storage_bucket', name='backup'),
+        ])
+        
+        table = config.to_arrow()
+        
+        assert table.num_rows == 2
+        assert table.column('cloud_provider').to_pylist() == ['aws', 'gcp']
+        assert json.loads(table.column('properties')[0].as_py()) == {'acl': 'private'}
+    
+    def test_serialize(self):
+        """Test orjson serialization matches to_dict"""
+        config = TerraformConfiguration(resources=[
+            Resource(resource_type='aws_s3_bucket', name='data', properties={'acl': 'private'}),
+        ])
+        
+        assert json.loads(config.serialize()) == config.to_dict()
+    
+    def test_serialize_directory_result(self):
+        """Test a merged directory configuration serializes sets and parsing errors"""
+        config = TerraformConfiguration(
+            resources=[Resource(resource_type='aws_s3_bucket', name='data', properties={'zones': {'a'}})],
+            parsing_errors=['Error parsing broken.tf: invalid HCL']
+        )
+        
+        document = json.loads(config.serialize())
+        assert document['resources'][0]['properties']['zones'] == ['a']
+        assert document['parsing_errors'] == ['Error parsing broken.tf: invalid HCL']
+        assert 'parsing_errors' not in TerraformConfiguration().to_dict()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -5,6 +5,7 @@ Test threat matching against cloud resources
 
 import os
 import sys
+import json
 import pytest
 from pathlib import Path
 
@@ -12,7 +13,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from threatdb.threat_loader import ThreatLoader, load_threat_database
 from threatdb.threat_matcher import ThreatMatcher, match_infrastructure_threats
-from models.threat import Threat, Severity, Likelihood, Condition, LogicGroup, Mitigation
+from models.threat import (
+    Threat, Severity, Likelihood, Condition, LogicGroup, Mitigation, MatchedThreat,
+    CONDITION_OPERATORS
+)
 
 
 class TestThreatLoader:
@@ -44,6 +48,11 @@ class TestThreatLoader:
             assert threat.name == 'Cloud SQL Instance Publicly Accessible'
             assert threat.severity == Severity.HIGH
             assert 'google_sql_database_instance' in threat.resource_types
+            
+            # Tuple-backed fields serialize as lists
+            threat_dict = threat.to_dict()
+            assert threat_dict['resource_types'] == list(threat.resource_types)
+            assert all(type(threat_dict[key]) is list for key in ('tags', 'references', 'attack_vectors'))
     
     def test_get_threats_by_resource_type(self, threat_db_path):
         """Test filtering threats by resource type"""
@@ -165,6 +174,25 @@ class TestThreatMatcher:
         resource['properties']['bucket_name'] = 'my-data-private'
         assert matcher.evaluate_condition(condition, resource) == False
     
+    def test_evaluate_invalid_condition(self, matcher):
+        """Test that invalid regex and unknown operators never match"""
+        resource = {'properties': {'bucket_name': 'my-data-public'}}
+        
+        invalid_regex = Condition(field='properties.bucket_name', operator='regex', value='[')
+        unknown_operator = Condition(field='properties.bucket_name', operator='~=', value='x')
+        
+        assert matcher.evaluate_condition(invalid_regex, resource) == False
+        assert matcher.evaluate_condition(unknown_operator, resource) == False
+    
+    def test_custom_operator_registration(self, matcher, monkeypatch):
+        """Test operators registered in CONDITION_OPERATORS apply to new conditions"""
+        monkeypatch.setitem(CONDITION_OPERATORS, 'startswith', lambda actual, expected: str(actual).startswith(expected))
+        condition = Condition(field='properties.bucket_name', operator='startswith', value='my-')
+        
+        assert matcher.evaluate_condition(condition, {'properties': {'bucket_name': 'my-data'}}) == True
+        assert matcher.evaluate_condition(condition, {'properties': {'bucket_name': 'data'}}) == False
+        assert not hasattr(matcher, 'operators')
+    
     def test_evaluate_exists_condition(self, matcher):
         """Test exists operator"""
         condition = Condition(field='properties.encryption', operator='exists', value=None)
@@ -234,6 +262,29 @@ class TestThreatMatcher:
         matched_conditions = []
         assert matcher._evaluate_logic_group(logic_group, resource, matched_conditions) == False
     
+    def test_nested_logic_group_from_dict(self, matcher):
+        """Test building nested logic groups from dictionaries"""
+        data = {
+            'logic': 'and',
+            'conditions': [{'field': 'properties.public', 'operator': '==', 'value': True}],
+            'groups': [{
+                'logic': 'or',
+                'conditions': [
+                    {'field': 'properties.acl', 'operator': '==', 'value': 'public-read'},
+                    {'field': 'properties.acl', 'operator': '==', 'value': 'public-read-write'}
+                ]
+            }]
+        }
+        
+        logic_group = LogicGroup.from_dict(data)
+        
+        assert len(logic_group.groups) == 1
+        assert len(logic_group.groups[0].conditions) == 2
+        assert logic_group.to_dict()['groups'][0]['logic'] == 'or'
+        
+        resource = {'properties': {'public': True, 'acl': 'public-read-write'}}
+        assert matcher._evaluate_logic_group(logic_group, resource, []) == True
+    
     def test_match_gcp_sql_public_exposure(self):
         """Test matching GCP Cloud SQL public exposure threat"""
         # Load real threat from database
@@ -401,6 +452,110 @@ class TestThreatMatcher:
         # Risk score = severity_score * likelihood_score = 7 * 0.8 = 5.6
         expected_score = 5.6
         assert abs(threat.risk_score - expected_score) < 0.01  # Allow small floating point error
+    
+    def test_risk_score_follows_assignments(self):
+        """Test risk scores and serialized threats stay current after field changes"""
+        threat = Threat(
+            id='TEST-001',
+            name='Test Threat',
+            description='Test',
+            severity=Severity.HIGH,
+            likelihood=Likelihood.LIKELY,
+            category='Test'
+        )
+        matched = MatchedThreat(threat=threat, resource_id='r', resource_type='t', resource_properties={})
+        assert threat.to_dict()['severity'] == 'high'
+        
+        threat.severity = Severity.CRITICAL
+        assert abs(threat.risk_score - 8.0) < 0.01
+        assert threat.to_dict()['severity'] == 'critical'
+        assert abs(threat.to_dict()['risk_score'] - 8.0) < 0.01
+        assert abs(matched.risk_score - 8.0) < 0.01
+        
+        matched.confidence = 0.5
+        assert abs(matched.risk_score - 4.0) < 0.01
+    
+    def test_compiled_threat_matcher(self, matcher):
+        """Test that the compiled predicate agrees with logic group evaluation"""
+        threat = Threat(
+            id='TEST-002',
+            name='Public Bucket',
+            description='Test',
+            severity=Severity.HIGH,
+            likelihood=Likelihood.LIKELY,
+            category='Test',
+            condition_logic=LogicGroup(
+                logic='and',
+                conditions=[Condition(field='properties.bucket_name', operator='regex', value=r'.*-public$')],
+                groups=[LogicGroup(
+                    logic='or',
+                    conditions=[
+                        Condition(field='properties.acl', operator='in', value=['public-read', 'public-read-write']),
+                        Condition(field='properties.versioning', operator='not_exists', value=None)
+                    ]
+                )]
+            )
+        )
+        
+        predicate = threat.compile()
+        
+        resources = [
+            {'properties': {'bucket_name': 'data-public', 'acl': 'public-read', 'versioning': True}},
+            {'properties': {'bucket_name': 'data-public', 'acl': 'private'}},
+            {'properties': {'bucket_name': 'data-public', 'acl': 'private', 'versioning': True}},
+            {'properties': {'bucket_name': 'data-private', 'acl': 'public-read'}},
+        ]
+        
+        for resource in resources:
+            expected = matcher._evaluate_logic_group(threat.condition_logic, resource, [])
+            assert predicate(resource) == expected
+    
+    def test_compiled_matcher_statistics(self, matcher):
+        """Test compiled predicate reuse is counted apart from the cache hit rate"""
+        threat = Threat(
+            id='TEST-003',
+            name='Private Bucket',
+            description='Test',
+            severity=Severity.LOW,
+            likelihood=Likelihood.UNLIKELY,
+            category='Test',
+            condition_logic=LogicGroup(
+                logic='and',
+                conditions=[Condition(field='properties.acl', operator='equals', value='public-read')]
+            )
+        )
+        
+        for _ in range(5):
+            matcher._match_threat_to_resource(threat, {'properties': {'acl': 'private'}})
+        
+        stats = matcher.get_statistics()
+        assert stats['compiled_matcher_hits'] == 4
+        assert stats['cache_hits'] == 0
+        assert stats['cache_hit_rate'] <= 1.0
+    
+    def test_result_serialize(self):
+        """Test JSON serialization of match results"""
+        loader = load_threat_database()
+        threats = loader.load_threats()
+        
+        config = {
+            'resources': [{
+                'resource_type': 'aws_s3_bucket',
+                'full_name': 'aws_s3_bucket.public_data',
+                'cloud_provider': 'aws',
+                'properties': {'acl': 'public-read'}
+            }]
+        }
+        
+        result = match_infrastructure_threats(config, threats)
+        payload = json.loads(result.serialize())
+        
+        assert payload == json.loads(json.dumps(result.to_dict()))
+        assert payload['total_matched'] == len(result.matched_threats)
+        
+        # Matches reference threats serialized once in the 'threats' map
+        for match in payload['matched_threats']:
+            assert match['threat_id'] in payload['threats']
 
 
 class TestConditionOperators:
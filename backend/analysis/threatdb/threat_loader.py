@@ -242,6 +242,9 @@ class ThreatLoader:
             updated_at=data.get('updated_at')
         )
         
+        # Compile conditions once at load time for the matcher
+        threat.compile()
+        
         return threat
     
     def _parse_logic_group(self, data: Dict) -> LogicGroup:
@@ -252,14 +255,7 @@ class ThreatLoader:
             raise ValueError(f"Invalid logic operator: {logic}")
         
         # Parse conditions
-        conditions = []
-        for cond_data in data.get('conditions', []):
-            condition = Condition(
-                field=cond_data['field'],
-                operator=cond_data['operator'],
-                value=cond_data['value']
-            )
-            conditions.append(condition)
+        conditions = [Condition.from_dict(cond_data) for cond_data in data.get('conditions', [])]
         
         # Parse nested groups
         groups = []
@@ -4,10 +4,10 @@ Match infrastructure resources against threat definitions
 """
 
 import os
-import re
 import logging
 import time
-from typing import Dict, List, Any, Optional, Callable
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
 from functools import lru_cache
 
 import sys
@@ -15,7 +15,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from models.threat import (
     Threat, MatchedThreat, ThreatMatchResult,
-    Condition, LogicGroup, ConditionOperator
+    Condition, LogicGroup, ConditionOperator, CONDITION_OPERATORS,
+    resolve_field_path
 )
 
 logger = logging.getLogger(__name__)
@@ -50,26 +51,10 @@ class ThreatMatcher:
         self.stats = {
             'total_evaluations': 0,
             'cache_hits': 0,
+            'compiled_matcher_hits': 0,  # Threats checked with an already compiled predicate
             'evaluation_time_ms': 0.0
         }
         
-        # Operator implementations
-        self.operators: Dict[str, Callable] = {
-            '==': self._op_equals,
-            '!=': self._op_not_equals,
-            'in': self._op_in,
-            'not_in': self._op_not_in,
-            'contains': self._op_contains,
-            'not_contains': self._op_not_contains,
-            'regex': self._op_regex,
-            'exists': self._op_exists,
-            'not_exists': self._op_not_exists,
-            '>': self._op_greater_than,
-            '<': self._op_less_than,
-            '>=': self._op_greater_equal,
-            '<=': self._op_less_equal
-        }
-        
         logger.info("ThreatMatcher initialized")
     
     def match_threats(
@@ -91,6 +76,9 @@ class ThreatMatcher:
         """
         start_time = time.time()
         
+        # One timestamp shared by every match of this run
+        run_timestamp = datetime.now(timezone.utc)
+        
         result = ThreatMatchResult()
         resources = config.get('resources', [])
         
@@ -99,44 +87,34 @@ class ThreatMatcher:
         
         logger.info(f"Matching {len(threats)} threats against {len(resources)} resources")
         
+        # Applicable threats only depend on (resource type, cloud provider),
+        # so the prefilter runs once per distinct pair instead of per resource
+        applicable_by_key: Dict[tuple, List[Threat]] = {}
+        
         # Match each resource against applicable threats
         for resource in resources:
             resource_type = resource.get('resource_type', '')
             resource_id = resource.get('full_name', resource.get('name', 'unknown'))
-            
-            # Get applicable threats for this resource
-            if filter_by_resource_type:
-                applicable_threats = [
-                    t for t in threats
-                    if not t.resource_types or resource_type in t.resource_types
-                ]
-            else:
-                applicable_threats = threats
-            
-            # Check cloud provider filter
             cloud_provider = resource.get('cloud_provider')
-            if cloud_provider:
-                applicable_threats = [
-                    t for t in applicable_threats
-                    if not t.cloud_providers or cloud_provider in t.cloud_providers
-                ]
+            
+            key = (resource_type, cloud_provider)
+            applicable_threats = applicable_by_key.get(key)
+            if applicable_threats is None:
+                applicable_threats = self._filter_applicable_threats(
+                    threats, resource_type, cloud_provider, filter_by_resource_type
+                )
+                applicable_by_key[key] = applicable_threats
             
             logger.debug(f"Checking {len(applicable_threats)} threats for {resource_id}")
             
             # Match threats
             for threat in applicable_threats:
-                matched = self._match_threat_to_resource(threat, resource)
+                matched = self._match_threat_to_resource(threat, resource, run_timestamp)
                 if matched:
                     result.matched_threats.append(matched)
-                    
-                    # Update statistics
-                    severity = threat.severity.value
-                    result.by_severity[severity] = result.by_severity.get(severity, 0) + 1
-                    
-                    category = threat.category
-                    result.by_category[category] = result.by_category.get(category, 0) + 1
-                    
-                    result.by_resource_type[resource_type] = result.by_resource_type.get(resource_type, 0) + 1
+        
+        # Update statistics
+        result.recompute_statistics()
         
         # Sort by risk score
         result.sort_by_risk()
@@ -149,10 +127,48 @@ class ThreatMatcher:
         
         return result
     
+    def _filter_applicable_threats(
+        self,
+        threats: List[Threat],
+        resource_type: str,
+        cloud_provider: Optional[str],
+        filter_by_resource_type: bool = True
+    ) -> List[Threat]:
+        """
+        Select threats that can apply to a resource type and cloud provider
+        
+        Args:
+            threats: List of threat definitions
+            resource_type: Terraform resource type
+            cloud_provider: Cloud provider of the resource (optional)
+            filter_by_resource_type: Filter on threat resource types
+            
+        Returns:
+            Applicable threats, in their original order
+        """
+        # Get applicable threats for this resource
+        if filter_by_resource_type:
+            applicable_threats = [
+                t for t in threats
+                if not t.resource_types or resource_type in t.resource_types
+            ]
+        else:
+            applicable_threats = threats
+        
+        # Check cloud provider filter
+        if cloud_provider:
+            applicable_threats = [
+                t for t in applicable_threats
+                if not t.cloud_providers or cloud_provider in t.cloud_providers
+            ]
+        
+        return applicable_threats
+    
     def _match_threat_to_resource(
         self,
         threat: Threat,
-        resource: Dict[str, Any]
+        resource: Dict[str, Any],
+        matched_at: Optional[datetime] = None
     ) -> Optional[MatchedThreat]:
         """
         Check if a threat matches a resource
@@ -160,6 +176,7 @@ class ThreatMatcher:
         Args:
             threat: Threat definition
             resource: Resource properties
+            matched_at: Match timestamp (defaults to now)
             
         Returns:
             MatchedThreat if conditions match, None otherwise
@@ -168,6 +185,17 @@ class ThreatMatcher:
         if not threat.condition_logic:
             return None
         
+        # Check the compiled predicate first; the logic group is only walked
+        # again on a match, to collect the descriptions of matched conditions
+        if self.enable_caching:
+            if threat._matcher is None:
+                threat.compile()
+            else:
+                self.stats['compiled_matcher_hits'] += 1
+            
+            if not threat._matcher(resource):
+                return None
+        
         # Evaluate conditions
         matched_conditions = []
         match_result = self._evaluate_logic_group(
@@ -186,6 +214,7 @@ class ThreatMatcher:
                 resource_properties=resource.get('properties', {}),
                 matched_conditions=matched_conditions,
                 confidence=1.0,
+                matched_at=matched_at or datetime.now(timezone.utc),
                 location=resource.get('location')
             )
         
@@ -254,8 +283,8 @@ class ThreatMatcher:
         # Get field value from resource (supports dot notation)
         field_value = self._get_nested_value(resource, condition.field)
         
-        # Get operator function
-        operator_func = self.operators.get(condition.operator)
+        # Operator function resolved when the condition was constructed
+        operator_func = condition._eval
         if not operator_func:
             logger.error(f"Unknown operator: {condition.operator}")
             return False
@@ -288,152 +317,30 @@ class ThreatMatcher:
         Returns:
             Value at path, or None if not found
         """
-        keys = path.split('.')
-        current = data
-        
-        for key in keys:
-            if isinstance(current, dict):
-                current = current.get(key)
-                if current is None:
-                    return None
-            elif isinstance(current, list):
-                # Handle list indexing
-                try:
-                    index = int(key)
-                    current = current[index]
-                except (ValueError, IndexError):
-                    return None
-            else:
-                return None
-        
-        return current
-    
-    # Operator implementations
-    
-    def _op_equals(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field equals expected value"""
-        return field_value == expected_value
-    
-    def _op_not_equals(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field does not equal expected value"""
-        return field_value != expected_value
-    
-    def _op_in(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field value is in expected list"""
-        if not isinstance(expected_value, (list, tuple, set)):
-            return False
-        return field_value in expected_value
-    
-    def _op_not_in(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field value is not in expected list"""
-        if not isinstance(expected_value, (list, tuple, set)):
-            return True
-        return field_value not in expected_value
-    
-    def _op_contains(self, field_value: Any, expected_value: Any) -> bool:
-        """
-        Check if field contains expected value
-        
-        - For lists: check if expected value is in list
-        - For dicts: check if expected key-value pair exists
-        - For strings: check if substring exists
-        """
-        if field_value is None:
-            return False
-        
-        if isinstance(field_value, (list, tuple)):
-            # Check if any item in list matches expected value
-            if isinstance(expected_value, dict):
-                # Check if any dict in list contains the key-value pairs
-                return any(
-                    self._dict_contains(item, expected_value)
-                    for item in field_value
-                    if isinstance(item, dict)
-                )
-            else:
-                return expected_value in field_value
-        
-        elif isinstance(field_value, dict):
-            return self._dict_contains(field_value, expected_value)
-        
-        elif isinstance(field_value, str):
-            return str(expected_value) in field_value
-        
-        return False
-    
-    def _dict_contains(self, data: Dict, expected: Any) -> bool:
-        """Check if dict contains expected key-value pairs"""
-        if not isinstance(expected, dict):
-            return False
-        
-        for key, value in expected.items():
-            if key not in data:
-                return False
-            if isinstance(value, dict) and isinstance(data[key], dict):
-                if not self._dict_contains(data[key], value):
-                    return False
-            elif data[key] != value:
-                return False
-        
-        return True
+        return resolve_field_path(data, tuple(path.split('.')))
     
-    def _op_not_contains(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field does not contain expected value"""
-        return not self._op_contains(field_value, expected_value)
+    # Operator implementations (shared with Condition, see models.threat)
     
-    def _op_regex(self, field_value: Any, pattern: str) -> bool:
-        """Check if field matches regex pattern"""
-        if field_value is None:
-            return False
-        
-        try:
-            field_str = str(field_value)
-            return bool(re.match(pattern, field_str))
-        except re.error as e:
-            logger.error(f"Invalid regex pattern '{pattern}': {e}")
-            return False
-    
-    def _op_exists(self, field_value: Any, _: Any) -> bool:
-        """Check if field exists (not None)"""
-        return field_value is not None
-    
-    def _op_not_exists(self, field_value: Any, _: Any) -> bool:
-        """Check if field does not exist (is None)"""
-        return field_value is None
-    
-    def _op_greater_than(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field is greater than expected value"""
-        try:
-            return float(field_value) > float(expected_value)
-        except (TypeError, ValueError):
-            return False
-    
-    def _op_less_than(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field is less than expected value"""
-        try:
-            return float(field_value) < float(expected_value)
-        except (TypeError, ValueError):
-            return False
-    
-    def _op_greater_equal(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field is greater than or equal to expected value"""
-        try:
-            return float(field_value) >= float(expected_value)
-        except (TypeError, ValueError):
-            return False
-    
-    def _op_less_equal(self, field_value: Any, expected_value: Any) -> bool:
-        """Check if field is less than or equal to expected value"""
-        try:
-            return float(field_value) <= float(expected_value)
-        except (TypeError, ValueError):
-            return False
+    _op_equals = staticmethod(CONDITION_OPERATORS['=='])
+    _op_not_equals = staticmethod(CONDITION_OPERATORS['!='])
+    _op_in = staticmethod(CONDITION_OPERATORS['in'])
+    _op_not_in = staticmethod(CONDITION_OPERATORS['not_in'])
+    _op_contains = staticmethod(CONDITION_OPERATORS['contains'])
+    _op_not_contains = staticmethod(CONDITION_OPERATORS['not_contains'])
+    _op_regex = staticmethod(CONDITION_OPERATORS['regex'])
+    _op_exists = staticmethod(CONDITION_OPERATORS['exists'])
+    _op_not_exists = staticmethod(CONDITION_OPERATORS['not_exists'])
+    _op_greater_than = staticmethod(CONDITION_OPERATORS['>'])
+    _op_less_than = staticmethod(CONDITION_OPERATORS['<'])
+    _op_greater_equal = staticmethod(CONDITION_OPERATORS['>='])
+    _op_less_equal = staticmethod(CONDITION_OPERATORS['<='])
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get matching statistics"""
         return {
             'total_evaluations': self.stats['total_evaluations'],
             'cache_hits': self.stats['cache_hits'],
+            'compiled_matcher_hits': self.stats['compiled_matcher_hits'],
             'cache_hit_rate': (
                 self.stats['cache_hits'] / self.stats['total_evaluations']
                 if self.stats['total_evaluations'] > 0
@@ -447,6 +354,7 @@ class ThreatMatcher:
         self.stats = {
             'total_evaluations': 0,
             'cache_hits': 0,
+            'compiled_matcher_hits': 0,
             'evaluation_time_ms': 0.0
         }
 
@@ -1,15 +1,78 @@
 """
 Response Cache
 
-In-memory LRU cache for LLM responses to avoid redundant API calls.
+In-memory LRU cache for LLM responses to avoid redundant API calls,
+optionally backed by a SQLite file so responses survive restarts.
 """
 
 import hashlib
+import heapq
+import sqlite3
 import time
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from collections import OrderedDict
+from itertools import islice
 import threading
 
+try:
+    import xxhash
+except ImportError:  # Optional dependency, only needed for xxh3 cache keys
+    xxhash = None
+
+
+# Default SQLite file for persistent caches, relative to the working directory
+DEFAULT_DB_PATH = '.llm_cache.sqlite3'
+
+
+class _FrequencySketch:
+    """
+    Count-Min sketch of recent key access frequencies (TinyLFU)
+    
+    Four rows of counters indexed by independent 32-bit slices of the key,
+    which is already a uniformly distributed hex digest. Counters are halved
+    every sample_size increments so that old popularity fades.
+    """
+    
+    DEPTH = 4
+    
+    def __init__(self, width: int, sample_size: int):
+        """
+        Initialize sketch
+        
+        Args:
+            width: Minimum counters per row (rounded up to a power of two)
+            sample_size: Increments between agings
+        """
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.sample_size = sample_size
+        self.rows = [[0] * self.width for _ in range(self.DEPTH)]
+        self.additions = 0
+    
+    def _indexes(self, key: str) -> List[int]:
+        """Counter index of key in each row"""
+        h = int(key, 16)
+        mask = self.width - 1
+        return [(h >> (32 * row)) & mask for row in range(self.DEPTH)]
+    
+    def increment(self, key: str):
+        """Count one access to key"""
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += 1
+        
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.rows = [[count >> 1 for count in row] for row in self.rows]
+            self.additions //= 2
+    
+    def estimate(self, key: str) -> int:
+        """Estimated recent access count of key (never an undercount)"""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+    
+    def clear(self):
+        """Reset all counters"""
+        self.rows = [[0] * self.width for _ in range(self.DEPTH)]
+        self.additions = 0
+
 
 class ResponseCache:
     """
@@ -17,24 +80,107 @@ class ResponseCache:
     
     Caches responses based on prompt hash to avoid redundant API calls.
     Thread-safe with automatic expiration.
+    
+    Eviction is value-aware (v-LRU): among the least recently used
+    ``eviction_window`` fraction of entries, the one that is cheapest to
+    regenerate and least hit is dropped, so long remediation responses
+    outlive short ones of similar age.
+    
+    With ``persistent=True`` every response is also written to a SQLite
+    file. Memory misses fall through to the file and promote what they find,
+    so a restarted process recovers its hit rate without calling the LLM.
+    
+    When full, new responses pass a TinyLFU admission filter: a response
+    whose prompt has been requested less often than the eviction victim's
+    is not kept in memory, so bursts of one-off prompts cannot flush hot
+    entries.
     """
     
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
+    # Upper bound on entries scored per eviction, so the scan stays constant
+    # time in very large caches (the window's oldest entries are sampled)
+    MAX_EVICTION_CANDIDATES = 64
+    
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: int = 3600,
+        hash_algo: str = 'auto',
+        eviction_window: float = 0.1,
+        persistent: bool = False,
+        db_path: str = DEFAULT_DB_PATH,
+        time_fn: Callable[[], float] = time.time,
+        admission_filter: bool = True
+    ):
         """
         Initialize response cache
         
         Args:
             max_size: Maximum number of cached responses
             ttl: Time-to-live in seconds (default: 1 hour)
+            hash_algo: Algorithm used for cache keys: 'xxh3_128' (needs the
+                optional xxhash package), 'blake2b' (128-bit), any other
+                hashlib name, or 'auto' for xxh3_128 when available and
+                blake2b otherwise. Keys only bucket prompts, so a
+                non-cryptographic hash is sufficient.
+            eviction_window: See note below
+            persistent: Also store responses in a SQLite file
+            db_path: SQLite file used when persistent is set
+            time_fn: Clock used for timestamps and expiry. Wall-clock time
+                by default, since persisted timestamps must survive restarts;
+                tests can pass a fake clock.
+            admission_filter: Gate insertions into a full cache on access
+                frequency (TinyLFU)
+        
+        Raises:
+            ValueError: If hash_algo is not supported by hashlib
+            ImportError: If hash_algo is 'xxh3_128' and xxhash is not installed
+        
+        Note:
+            eviction_window is the fraction of least recently used entries
+            considered for eviction; 0 gives plain LRU.
         """
         self.max_size = max_size
         self.ttl = ttl
+        self._now = time_fn
+        self.eviction_window = eviction_window
+        if hash_algo == 'auto':
+            hash_algo = 'xxh3_128' if xxhash is not None else 'blake2b'
+        self.hash_algo = hash_algo
+        if hash_algo == 'xxh3_128':
+            if xxhash is None:
+                raise ImportError("xxhash is required for xxh3_128 cache keys (pip install xxhash)")
+        elif hash_algo != 'blake2b':
+            hashlib.new(hash_algo)  # Fail fast on unknown algorithms
         self.cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
         self.lock = threading.Lock()
         
+        # Min-heap of (timestamp, key) so expired entries can be found without
+        # scanning the cache. Entries go stale when a key is rewritten or
+        # removed and are skipped when popped.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        
         # Statistics
         self.hits = 0
         self.misses = 0
+        self.rejected = 0
+        
+        # Access frequencies for admission, aged every 10 * max_size lookups
+        self.admission_filter = admission_filter
+        self._sketch = _FrequencySketch(max_size, 10 * max_size)
+        
+        # Persistent tier. Keys depend on hash_algo, so a file written with
+        # one algorithm simply misses under another.
+        self.persistent = persistent
+        self._db: Optional[sqlite3.Connection] = None
+        if persistent:
+            self._db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "timestamp REAL NOT NULL, cost INTEGER NOT NULL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE timestamp < ?", (self._now() - ttl,))
     
     def _generate_key(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """
@@ -47,41 +193,125 @@ class ResponseCache:
         Returns:
             Cache key (hash string)
         """
-        combined = f"{system_prompt or ''}|||{prompt}"
-        return hashlib.sha256(combined.encode('utf-8')).hexdigest()
+        # NUL separator: prompts are text and never contain it, so pairs such
+        # as ("ab", "c") and ("a", "bc") hash different inputs
+        combined = f"{system_prompt or ''}\0{prompt}".encode('utf-8')
+        if self.hash_algo == 'xxh3_128':
+            return xxhash.xxh3_128_hexdigest(combined)
+        if self.hash_algo == 'blake2b':
+            return hashlib.blake2b(combined, digest_size=16).hexdigest()
+        return hashlib.new(self.hash_algo, combined).hexdigest()
     
-    def get(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+    def get(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        default: Any = None
+    ) -> Optional[str]:
         """
         Get cached response
         
         Args:
             prompt: User prompt
             system_prompt: System prompt (optional)
+            default: Returned on a miss; pass a sentinel to tell a miss
+                apart from a cached empty or None response
         
         Returns:
-            Cached response or None if not found/expired
+            Cached response, or default if not found/expired
         """
         key = self._generate_key(prompt, system_prompt)
         
         with self.lock:
-            if key not in self.cache:
-                self.misses += 1
-                return None
+            self._sketch.increment(key)
             
-            entry = self.cache[key]
-            
-            # Check expiration
-            if time.time() - entry['timestamp'] > self.ttl:
+            # Single lookup instead of a membership test plus an index
+            entry = self.cache.get(key)
+            if entry is None:
+                # Fall back to the persistent tier (promoted entries are live)
+                entry = self._load_persisted(key, self._now())
+                if entry is None:
+                    self.misses += 1
+                    return default
+            elif self._now() - entry['timestamp'] > self.ttl:
+                # Expired
                 del self.cache[key]
                 self.misses += 1
-                return None
+                return default
             
             # Move to end (LRU)
             self.cache.move_to_end(key)
             
+            entry['hits'] += 1
             self.hits += 1
             return entry['response']
     
+    def peek(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """
+        Get a live cached response without recording an access
+        
+        Unlike get, this leaves hit/miss statistics, LRU order and admission
+        frequencies untouched, for internal re-checks of a lookup the caller
+        has already made (and counted) with get.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+        
+        Returns:
+            Cached response, or None if not in memory or expired
+        """
+        key = self._generate_key(prompt, system_prompt)
+        
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None or self._now() - entry['timestamp'] > self.ttl:
+                return None
+            return entry['response']
+    
+    def mget(
+        self,
+        requests: List[Tuple[str, Optional[str]]]
+    ) -> Dict[Tuple[str, Optional[str]], str]:
+        """
+        Get several cached responses in one pass
+        
+        Keys are hashed before taking the lock, and the lock is acquired
+        once for the whole batch instead of once per prompt.
+        
+        Args:
+            requests: List of (prompt, system_prompt) pairs
+        
+        Returns:
+            Dictionary mapping each cached (prompt, system_prompt) pair to
+            its response; misses and expired entries are omitted
+        """
+        keyed = [(request, self._generate_key(*request)) for request in requests]
+        now = self._now()
+        found: Dict[Tuple[str, Optional[str]], str] = {}
+        
+        with self.lock:
+            for request, key in keyed:
+                self._sketch.increment(key)
+                entry = self.cache.get(key)
+                
+                if entry is None:
+                    entry = self._load_persisted(key, now)
+                    if entry is None:
+                        self.misses += 1
+                        continue
+                elif now - entry['timestamp'] > self.ttl:
+                    del self.cache[key]
+                    self.misses += 1
+                    continue
+                
+                self.cache.move_to_end(key)
+                entry['hits'] += 1
+                self.hits += 1
+                found[request] = entry['response']
+        
+        return found
+    
     def set(self, prompt: str, response: str, system_prompt: Optional[str] = None):
         """
         Cache a response
@@ -92,27 +322,159 @@ class ResponseCache:
             system_prompt: System prompt (optional)
         """
         key = self._generate_key(prompt, system_prompt)
+        now = self._now()
+        
+        # Regeneration cost is estimated in tokens (~4 characters each) for
+        # the prompt and response together
+        cost = (len(prompt) + len(response)) // 4
         
         with self.lock:
-            # Remove oldest if at capacity
-            if key not in self.cache and len(self.cache) >= self.max_size:
-                self.cache.popitem(last=False)
-            
-            # Add/update entry
-            self.cache[key] = {
-                'response': response,
-                'timestamp': time.time()
-            }
+            if self._admit(key, now):
+                self._insert(key, response, now, cost)
             
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (key, response, now, cost)
+                )
+    
+    def _admit(self, key: str, now: float) -> bool:
+        """
+        Decide whether a new response enters memory (caller holds the lock)
+        
+        Frees a slot when the cache is full: expired entries go first; else
+        the v-LRU victim is evicted only if the new key has been requested
+        at least as often. Ties admit, so frequency-blind use (set without
+        get) behaves like plain eviction.
+        
+        Returns:
+            False if the response should not be kept in memory
+        """
+        if key in self.cache or len(self.cache) < self.max_size:
+            return True
+        if self._evict_expired(now):
+            return True
+        
+        victim = self._select_victim()
+        if self.admission_filter and self._sketch.estimate(key) < self._sketch.estimate(victim):
+            self.rejected += 1
+            return False
+        
+        del self.cache[victim]
+        return True
+    
+    def _insert(self, key: str, response: str, timestamp: float, cost: int) -> Dict[str, Any]:
+        """
+        Add or replace an in-memory entry (caller holds the lock)
+        
+        Returns:
+            The new entry
+        """
+        # At capacity: reclaim expired entries first, and only evict a
+        # live entry if none had expired
+        if key not in self.cache and len(self.cache) >= self.max_size:
+            if not self._evict_expired(self._now()):
+                del self.cache[self._select_victim()]
+        
+        entry = {
+            'response': response,
+            'timestamp': timestamp,
+            'hits': 0,
+            'cost': cost
+        }
+        self.cache[key] = entry
+        
+        # Move to end (most recently used)
+        self.cache.move_to_end(key)
+        
+        heapq.heappush(self._expiry_heap, (timestamp, key))
+        if len(self._expiry_heap) > 2 * len(self.cache) + 16:
+            self._rebuild_expiry_heap()
+        
+        return entry
+    
+    def _load_persisted(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """
+        Promote a live entry from the SQLite file into memory (caller holds
+        the lock)
+        
+        The entry keeps its original timestamp, so the TTL still runs from
+        when the response was generated.
+        
+        Returns:
+            The promoted entry, or None if not persisted or expired
+        """
+        if self._db is None:
+            return None
+        
+        row = self._db.execute(
+            "SELECT response, timestamp, cost FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        response, timestamp, cost = row
+        if now - timestamp > self.ttl:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        
+        return self._insert(key, response, timestamp, cost)
+    
+    def _evict_expired(self, now: float) -> int:
+        """
+        Drop every expired entry, oldest first (caller holds the lock)
+        
+        Returns:
+            Number of entries removed
+        """
+        heap = self._expiry_heap
+        removed = 0
+        
+        while heap and now - heap[0][0] > self.ttl:
+            timestamp, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # Skip heap records for keys since rewritten or removed
+            if entry is not None and entry['timestamp'] == timestamp:
+                del self.cache[key]
+                removed += 1
+        
+        return removed
+    
+    def _select_victim(self) -> str:
+        """
+        Pick the least valuable of the least recently used entries for
+        eviction (caller holds the lock)
+        
+        Candidates are the oldest eviction_window fraction of entries, at
+        most MAX_EVICTION_CANDIDATES of them; the victim minimizes
+        cost + hits. That ordering matches the v-LRU score
+        log(cost + hits + delta), since log is monotonic.
+        """
+        window = int(len(self.cache) * self.eviction_window)
+        window = max(1, min(window, self.MAX_EVICTION_CANDIDATES))
+        if window == 1:
+            return next(iter(self.cache))
+        
+        candidates = islice(self.cache.items(), window)
+        victim, _ = min(candidates, key=lambda item: item[1]['cost'] + item[1]['hits'])
+        return victim
+    
+    def _rebuild_expiry_heap(self):
+        """Rebuild the expiry heap from live entries (caller holds the lock)"""
+        self._expiry_heap = [(entry['timestamp'], key) for key, entry in self.cache.items()]
+        heapq.heapify(self._expiry_heap)
     
     def clear(self):
-        """Clear all cached responses"""
+        """Clear all cached responses, including persisted ones"""
         with self.lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
             self.cache.clear()
+            self._expiry_heap.clear()
+            self._sketch.clear()
             self.hits = 0
             self.misses = 0
+            self.rejected = 0
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -131,36 +493,46 @@ class ResponseCache:
                 'hits': self.hits,
                 'misses': self.misses,
                 'hit_rate': hit_rate,
-                'ttl': self.ttl
+                'rejected': self.rejected,
+                'ttl': self.ttl,
+                'persistent': self.persistent
             }
     
     def remove_expired(self):
         """Remove all expired entries"""
-        now = time.time()
+        now = self._now()
         
         with self.lock:
-            expired_keys = [
-                key for key, entry in self.cache.items()
-                if now - entry['timestamp'] > self.ttl
-            ]
-            
-            for key in expired_keys:
-                del self.cache[key]
-            
-            return len(expired_keys)
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses WHERE timestamp < ?", (now - self.ttl,))
+            return self._evict_expired(now)
+    
+    def close(self):
+        """Close the SQLite file of a persistent cache"""
+        with self.lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
 
 
 # Global cache instance
 _global_cache: Optional[ResponseCache] = None
 
 
-def get_cache(max_size: int = 1000, ttl: int = 3600) -> ResponseCache:
+def get_cache(
+    max_size: int = 1000,
+    ttl: int = 3600,
+    persistent: bool = False,
+    db_path: str = DEFAULT_DB_PATH
+) -> ResponseCache:
     """
     Get global cache instance
     
     Args:
         max_size: Maximum cache size
         ttl: Time-to-live in seconds
+        persistent: Back the cache with a SQLite file
+        db_path: SQLite file used when persistent is set
     
     Returns:
         ResponseCache instance
@@ -168,6 +540,11 @@ def get_cache(max_size: int = 1000, ttl: int = 3600) -> ResponseCache:
     global _global_cache
     
     if _global_cache is None:
-        _global_cache = ResponseCache(max_size=max_size, ttl=ttl)
+        _global_cache = ResponseCache(
+            max_size=max_size,
+            ttl=ttl,
+            persistent=persistent,
+            db_path=db_path
+        )
     
     return _global_cache
@@ -75,9 +75,12 @@ export interface Threat {
 
 /**
  * Matched threat instance
+ *
+ * The threat definition is not embedded; look it up by threat_id in
+ * ThreatMatchResult.threats (see ThreatMatcherClient.getThreatForMatch).
  */
 export interface MatchedThreat {
-  threat: Threat;
+  threat_id: string;
   resource_id: string;
   resource_type: string;
   resource_properties: Record<string, any>;
@@ -95,6 +98,8 @@ export interface MatchedThreat {
  */
 export interface ThreatMatchResult {
   matched_threats: MatchedThreat[];
+  /** Each matched threat definition once, keyed by threat ID */
+  threats: Record<string, Threat>;
   total_matched: number;
   total_resources_scanned: number;
   total_threats_checked: number;
@@ -182,6 +187,7 @@ export class ThreatMatcherClient {
           options.minSeverity
         );
         result.total_matched = result.matched_threats.length;
+        result.threats = this.pickThreats(result.threats, result.matched_threats);
       }
       
       logger.info('Threat matching completed', {
@@ -350,6 +356,33 @@ else:
     });
   }
 
+  /**
+   * Get the threat definition a match refers to
+   *
+   * @param result - Threat match result the match belongs to
+   * @param match - Matched threat instance
+   * @returns Threat definition, or undefined if not in the result
+   */
+  getThreatForMatch(result: ThreatMatchResult, match: MatchedThreat): Threat | undefined {
+    return result.threats[match.threat_id];
+  }
+
+  /**
+   * Keep only the threat definitions referenced by the given matches
+   */
+  private pickThreats(
+    threats: Record<string, Threat>,
+    matches: MatchedThreat[]
+  ): Record<string, Threat> {
+    const picked: Record<string, Threat> = {};
+
+    for (const match of matches) {
+      picked[match.threat_id] = threats[match.threat_id];
+    }
+
+    return picked;
+  }
+
   /**
    * Filter matched threats by minimum severity
    */